@@ -0,0 +1,209 @@
+# admin_panel/activity.py
+"""
+Buffered, append-only activity log.
+
+Views call record(); it builds an unsaved ActivityLog row, appends it to an
+in-process buffer and to a ring buffer of recent entries, and returns
+without touching the database. recent() reads the newest rows from the
+table on every call and merges in this process's ring, so the feed shows
+every worker's flushed entries plus this worker's not-yet-written ones. A daemon flusher thread writes the buffer
+with bulk_create() (multi-row INSERTs) once it holds ACTIVITY_BATCH_SIZE
+entries or every ACTIVITY_FLUSH_MS milliseconds, whichever comes first.
+
+The buffer is bounded at ACTIVITY_BUFFER_LIMIT entries. When the database
+is slow or down and the buffer fills up, ACTIVITY_OVERFLOW decides:
+
+* 'drop'  (default) the new entry is discarded and counted; requests never wait
+* 'block' the request waits up to ACTIVITY_BLOCK_MS for the flusher to make
+          room, then drops the entry if there is still none
+
+A failed batch is put back at the front of the buffer as far as room
+allows and retried on the next flush. Entries still buffered when the
+process dies are lost; `stats()` reports how many were dropped so far.
+"""
+import atexit
+import logging
+import threading
+from collections import deque
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from .models import ActivityLog
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = getattr(settings, 'ACTIVITY_BATCH_SIZE', 100)
+FLUSH_INTERVAL = getattr(settings, 'ACTIVITY_FLUSH_MS', 500) / 1000
+BUFFER_LIMIT = getattr(settings, 'ACTIVITY_BUFFER_LIMIT', 10000)
+OVERFLOW = getattr(settings, 'ACTIVITY_OVERFLOW', 'drop')
+BLOCK_TIMEOUT = getattr(settings, 'ACTIVITY_BLOCK_MS', 50) / 1000
+RING_SIZE = getattr(settings, 'ACTIVITY_RING_SIZE', 200)
+
+# How each action is drawn in the dashboard feed
+STYLES = {
+    'create': ('plus-circle', 'emerald'),
+    'edit': ('pen', 'blue'),
+    'cancel': ('times-circle', 'amber'),
+    'delete': ('trash-alt', 'red'),
+}
+
+
+class ActivityBuffer:
+    """Bounded write buffer with a background bulk flusher and a ring of recent entries"""
+
+    def __init__(self, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL, limit=BUFFER_LIMIT,
+                 overflow=OVERFLOW, block_timeout=BLOCK_TIMEOUT, ring_size=RING_SIZE):
+        if overflow not in ('drop', 'block'):
+            raise ValueError(f"Unknown activity overflow policy: {overflow}")
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.limit = limit
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self._pending = deque()
+        self._recent = deque(maxlen=ring_size)
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stop = False
+        self.written = 0
+        self.dropped = 0
+        self.failed_flushes = 0
+
+    # ----- writing -----
+
+    def record(self, entry):
+        """Queue one unsaved ActivityLog; returns False if it was dropped"""
+        with self._cond:
+            if len(self._pending) >= self.limit and self.overflow == 'block':
+                self._cond.notify_all()
+                self._cond.wait_for(lambda: len(self._pending) < self.limit, timeout=self.block_timeout)
+            if len(self._pending) >= self.limit:
+                self.dropped += 1
+                return False
+            self._pending.append(entry)
+            self._recent.append(entry)
+            if len(self._pending) >= self.batch_size:
+                self._cond.notify_all()
+        self._ensure_started()
+        return True
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name='activity-flusher', daemon=True)
+                self._thread.start()
+
+    def _loop(self):
+        while not self._stop:
+            with self._cond:
+                self._cond.wait_for(lambda: self._stop or len(self._pending) >= self.batch_size,
+                                    timeout=self.flush_interval)
+            self.flush()
+            close_old_connections()
+
+    def flush(self):
+        """Write everything buffered now, one bulk_create per batch_size entries"""
+        while True:
+            with self._cond:
+                if not self._pending:
+                    return
+                batch = [self._pending.popleft() for _ in range(min(self.batch_size, len(self._pending)))]
+                # Room was made; wake requests waiting under the 'block' policy
+                self._cond.notify_all()
+            try:
+                ActivityLog.objects.bulk_create(batch)
+            except Exception:
+                logger.exception("Writing %d activity entries failed", len(batch))
+                self.failed_flushes += 1
+                self._requeue(batch)
+                return
+            self.written += len(batch)
+
+    def _requeue(self, batch):
+        with self._cond:
+            room = max(self.limit - len(self._pending), 0)
+            self.dropped += max(len(batch) - room, 0)
+            # Oldest first, so the retry keeps the original order
+            self._pending.extendleft(reversed(batch[:room]))
+
+    def stop(self):
+        self._stop = True
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self.flush()
+
+    # ----- reading -----
+
+    def recent(self, limit=20):
+        """Newest-first activity for the feed: the table's tail plus what this process has not written yet"""
+        with self._cond:
+            local = list(self._recent)[-limit:]
+        try:
+            # Re-read every time so entries flushed by other workers show up too
+            rows = list(ActivityLog.objects.order_by('-created_at')[:limit])
+        except Exception:
+            logger.exception("Loading recent activity failed")
+            rows = []
+        # A local entry may already be flushed and read back; keep one copy
+        keys = {_identity(row) for row in rows}
+        entries = rows + [entry for entry in local if _identity(entry) not in keys]
+        entries.sort(key=lambda entry: entry.created_at, reverse=True)
+        return [as_feed_item(entry) for entry in entries[:limit]]
+
+    def stats(self):
+        with self._cond:
+            pending = len(self._pending)
+        return {
+            'pending': pending,
+            'written': self.written,
+            'dropped': self.dropped,
+            'failed_flushes': self.failed_flushes,
+            'overflow': self.overflow,
+        }
+
+
+def _identity(entry):
+    return (entry.created_at, entry.action, entry.object_type, entry.object_id)
+
+
+def as_feed_item(entry):
+    icon, color = STYLES.get(entry.action, ('bell', 'blue'))
+    return {
+        'action': entry.action,
+        'object_type': entry.object_type,
+        'object_id': entry.object_id,
+        'message': entry.message,
+        'actor': entry.actor,
+        'time': entry.created_at,
+        'icon': icon,
+        'color': color,
+    }
+
+
+buffer = ActivityBuffer()
+atexit.register(buffer.stop)
+
+
+def record(request, action, obj, message, object_id=None):
+    """Log a staff action on ``obj`` once it succeeded; pass object_id for deletions (delete() clears pk)"""
+    user = getattr(request, 'user', None)
+    entry = ActivityLog(
+        action=action,
+        object_type=obj._meta.model_name,
+        object_id=str(object_id if object_id is not None else obj.pk or ''),
+        message=message[:255],
+        actor=user.get_username() if user is not None and user.is_authenticated else '',
+    )
+    kept = buffer.record(entry)
+    if not kept:
+        logger.warning("Activity buffer full, dropped: %s", message)
+    return kept
+
+
+def recent(limit=20):
+    return buffer.recent(limit)
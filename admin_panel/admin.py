@@ -1,12 +1,17 @@
 from django.contrib import admin
 from django.contrib.auth.models import Group
 from django.utils.html import format_html
+from django.contrib.admin.views.main import ChangeList
 from .models import (
     User, Event, BookingsEvent, Movie, MovieScreen, TheaterSeat,
     TicketBooking, ComedyShow, BookingComedyShow, LiveConcert,
     LiveConcertTicketBooking, AmusementPark, AmusementTicket,
-    AmusementBooking, AmusementBookingItem, OtherAmusementBooking
+    AmusementBooking, AmusementBookingItem, OtherAmusementBooking, ConcertFare,
+    ActivityLog, EventSeries, SeriesOccurrence,
 )
+from . import fares
+from .admin_mixins import LargeTableAdminMixin
+from .facets import facet_list_filter
 
 # =============================================
 # ⭐ WRITE-ABLE MODELS (managed=True)
@@ -112,12 +117,43 @@ class ComedyShowAdmin(admin.ModelAdmin):
     )
 
 
+class FareChangeList(ChangeList):
+    """Attaches each listed concert's fares, read for the whole page at once from the fare table"""
+
+    def get_results(self, request):
+        super().get_results(request)
+        table = fares.get_fare_table([concert.pk for concert in self.result_list])
+        for concert in self.result_list:
+            concert.fare_breakdown = {fare['tier']: fare for fare in table.get(concert.pk, [])}
+
+
 @admin.register(LiveConcert)
 class LiveConcertAdmin(admin.ModelAdmin):
-    list_display = ('title', 'artist_name', 'date', 'time', 'music_genre', 'available_seats')
-    list_filter = ('music_genre', 'date')
+    list_display = ('title', 'artist_name', 'date', 'time', 'music_genre', 'available_seats', 'normal_fare')
+    list_filter = (
+        facet_list_filter('concerts', 'music_genre'),
+        facet_list_filter('concerts', 'when'),
+        facet_list_filter('concerts', 'month'),
+        facet_list_filter('concerts', 'location'),
+    )
     search_fields = ('title', 'artist_name', 'description', 'location')
-    
+    actions = ['rebuild_fare_table']
+
+    def get_changelist(self, request, **kwargs):
+        return FareChangeList
+
+    def normal_fare(self, obj):
+        fare = getattr(obj, 'fare_breakdown', {}).get('normal')
+        if fare:
+            return f"₹{fare['total_amount']}"
+        return "-"
+    normal_fare.short_description = 'Normal Fare (incl. fees)'
+
+    def rebuild_fare_table(self, request, queryset):
+        count = len(fares.rebuild_fares(queryset.values_list('pk', flat=True)))
+        self.message_user(request, f"Fare table rebuilt for {count} concert(s).")
+    rebuild_fare_table.short_description = 'Rebuild fare table'
+
     fieldsets = (
         ('Concert Details', {
             'fields': ('title', 'description', 'image', 'artist_name', 'music_genre')
@@ -137,10 +173,30 @@ class LiveConcertAdmin(admin.ModelAdmin):
     )
 
 
+@admin.register(ConcertFare)
+class ConcertFareAdmin(admin.ModelAdmin):
+    list_display = ('concert', 'tier', 'base_price', 'gst_amount', 'total_fees', 'total_amount')
+    list_filter = ('tier',)
+    search_fields = ('concert__title', 'concert__artist_name')
+    list_select_related = ('concert',)
+
+    def has_add_permission(self, request):
+        # Rows are derived from LiveConcert prices and rebuilt automatically
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
 @admin.register(AmusementPark)
 class AmusementParkAdmin(admin.ModelAdmin):
     list_display = ('park_name', 'date', 'time', 'location', 'rides_available', 'ticket_price', 'available_seats')
-    list_filter = ('family_friendly', 'date')
+    list_filter = (
+        facet_list_filter('parks', 'family_friendly'),
+        facet_list_filter('parks', 'when'),
+        facet_list_filter('parks', 'month'),
+        facet_list_filter('parks', 'location'),
+    )
     search_fields = ('park_name', 'description', 'location')
     list_editable = ('ticket_price', 'available_seats')
     
@@ -180,11 +236,11 @@ class AmusementTicketAdmin(admin.ModelAdmin):
 
 
 @admin.register(BookingsEvent)
-class BookingsEventAdmin(admin.ModelAdmin):
+class BookingsEventAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ('booking_id', 'customer_name', 'event', 'number_of_tickets', 'total_amount', 'status_display', 'payment_status_display', 'booking_date')
     list_filter = ('status', 'payment_status', 'booking_date')
     search_fields = ('booking_id', 'customer_name', 'customer_email', 'customer_phone', 'event__name')
-    date_hierarchy = 'booking_date'
+    date_drilldown = 'booking_date'
     
     def status_display(self, obj):
         color_map = {
@@ -213,9 +269,10 @@ class BookingsEventAdmin(admin.ModelAdmin):
 
 
 @admin.register(TicketBooking)
-class TicketBookingAdmin(admin.ModelAdmin):
+class TicketBookingAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ('id', 'user', 'movie', 'screen', 'grand_total', 'booked_at')
     list_filter = ('payment_status', 'booked_at')
+    date_drilldown = 'booked_at'
     search_fields = ('user__email', 'movie__title', 'screen__screen_name')
     readonly_fields = ('razorpay_order_id', 'razorpay_payment_id', 'razorpay_signature')
     
@@ -227,9 +284,10 @@ class TicketBookingAdmin(admin.ModelAdmin):
 
 
 @admin.register(BookingComedyShow)
-class BookingComedyShowAdmin(admin.ModelAdmin):
+class BookingComedyShowAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ('booking_id', 'user', 'comedy_show', 'number_of_tickets', 'total_price', 'payment_status_display')
     list_filter = ('payment_status', 'booking_date')
+    date_drilldown = 'booking_date'
     search_fields = ('booking_id', 'user__username', 'comedy_show__title')
     readonly_fields = ('razorpay_order_id', 'razorpay_payment_id', 'razorpay_signature')
     
@@ -241,17 +299,19 @@ class BookingComedyShowAdmin(admin.ModelAdmin):
 
 
 @admin.register(LiveConcertTicketBooking)
-class LiveConcertTicketBookingAdmin(admin.ModelAdmin):
+class LiveConcertTicketBookingAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ('id', 'user', 'concert', 'quantity', 'total_amount', 'payment_status', 'booked_at')
     list_filter = ('payment_status', 'booked_at')
+    date_drilldown = 'booked_at'
     search_fields = ('user__email', 'concert__title')
     readonly_fields = ('razorpay_order_id', 'razorpay_payment_id', 'razorpay_signature')
 
 
 @admin.register(AmusementBooking)
-class AmusementBookingAdmin(admin.ModelAdmin):
+class AmusementBookingAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ('booking_id', 'customer_name', 'amusement_park', 'grand_total', 'payment_status_display', 'created_at')
     list_filter = ('payment_status', 'created_at')
+    date_drilldown = 'created_at'
     search_fields = ('booking_id', 'customer_name', 'customer_email', 'amusement_park__park_name')
     readonly_fields = ('razorpay_order_id', 'razorpay_payment_id', 'razorpay_signature')
     
@@ -263,9 +323,10 @@ class AmusementBookingAdmin(admin.ModelAdmin):
 
 
 @admin.register(AmusementBookingItem)
-class AmusementBookingItemAdmin(admin.ModelAdmin):
+class AmusementBookingItemAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ('id', 'get_booking', 'ticket_type', 'quantity', 'total_with_gst')
     list_filter = ('booking__amusement_park',)
+    extra_select_related = ('booking', 'other_booking')
     search_fields = ('booking__booking_id', 'ticket_type__amusement_park__park_name')
     readonly_fields = ('subtotal', 'gst_amount', 'total_with_gst')
     
@@ -279,9 +340,10 @@ class AmusementBookingItemAdmin(admin.ModelAdmin):
 
 
 @admin.register(OtherAmusementBooking)
-class OtherAmusementBookingAdmin(admin.ModelAdmin):
+class OtherAmusementBookingAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ('booking_id', 'customer_name', 'amusement_park', 'quantity', 'grand_total', 'payment_status_display', 'created_at')
     list_filter = ('payment_status', 'created_at')
+    date_drilldown = 'created_at'
     search_fields = ('booking_id', 'customer_name', 'customer_email', 'amusement_park__park_name')
     readonly_fields = ('razorpay_order_id', 'razorpay_payment_id', 'razorpay_signature')
     
@@ -292,6 +354,40 @@ class OtherAmusementBookingAdmin(admin.ModelAdmin):
     payment_status_display.short_description = 'Payment'
 
 
+@admin.register(ActivityLog)
+class ActivityLogAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+    list_display = ('created_at', 'action', 'object_type', 'object_id', 'message', 'actor')
+    list_filter = ('action', 'object_type')
+    search_fields = ('message', 'actor', 'object_id')
+    date_drilldown = 'created_at'
+
+    # Append-only audit trail
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+class SeriesOccurrenceInline(admin.TabularInline):
+    model = SeriesOccurrence
+    extra = 0
+    readonly_fields = ('object_id', 'date')
+    can_delete = False
+
+
+@admin.register(EventSeries)
+class EventSeriesAdmin(admin.ModelAdmin):
+    list_display = ('title', 'kind', 'rule', 'starts_on', 'created_by', 'created_at')
+    list_filter = ('kind',)
+    search_fields = ('title',)
+    readonly_fields = ('kind', 'rule', 'source_id', 'starts_on', 'created_by', 'created_at')
+    inlines = [SeriesOccurrenceInline]
+
+
 # =============================================
 # ⭐ ADMIN SITE CUSTOMIZATION
 # =============================================
@@ -312,4 +408,4 @@ admin.site._registry = dict(sorted(
         else 1 if x[0].__name__ in ['CustomUser', 'BookingsEvent', 'TicketBooking']
         else 2
     )
-))
\ No newline at end of file
+))
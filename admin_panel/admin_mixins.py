@@ -0,0 +1,145 @@
+# admin_panel/admin_mixins.py
+"""
+Large-table mode for ModelAdmins over the multi-million-row booking tables.
+
+LargeTableAdminMixin swaps the changelist's expensive defaults for cheap ones:
+
+* no second, unfiltered COUNT(*) (show_full_result_count = False)
+* unfiltered counts come from table statistics instead of COUNT(*)
+* deep pages read primary keys only, then fetch just that page's rows
+* list_select_related is derived from the FK columns in list_display
+* date_hierarchy's DISTINCT-date queries are replaced by a fixed
+  date drilldown filter that needs no query to build its choices
+"""
+from datetime import datetime, timedelta
+
+from django.contrib import admin
+from django.core.exceptions import FieldDoesNotExist
+from django.core.paginator import Paginator
+from django.db import connection
+from django.db.models import ForeignKey
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+# Below this many rows an exact COUNT(*) is cheap and preferred
+EXACT_COUNT_THRESHOLD = 10000
+# From this offset on, pages are located with a pk-only scan first
+DEFERRED_JOIN_OFFSET = 1000
+
+
+def estimated_row_count(model):
+    """Row estimate from the database's table statistics, or None if unavailable"""
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'mysql':
+            cursor.execute(
+                "SELECT TABLE_ROWS FROM information_schema.TABLES "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+                [table],
+            )
+        elif connection.vendor == 'postgresql':
+            cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE relname = %s", [table])
+        else:
+            return None
+        row = cursor.fetchone()
+    return int(row[0]) if row and row[0] is not None else None
+
+
+class LargeTablePaginator(Paginator):
+    """Paginator that estimates unfiltered counts and seeks deep pages by primary key"""
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if hasattr(queryset, 'query') and not queryset.query.where:
+            estimate = estimated_row_count(queryset.model)
+            if estimate is not None and estimate > EXACT_COUNT_THRESHOLD:
+                return estimate
+        return super().count
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        top = bottom + self.per_page
+        queryset = self.object_list
+        if bottom < DEFERRED_JOIN_OFFSET or not hasattr(queryset, 'values_list'):
+            return super().page(number)
+
+        # Walking the offset over the pk index is far cheaper than over full rows
+        pks = list(queryset.values_list('pk', flat=True)[bottom:top])
+        rows = {obj.pk: obj for obj in queryset.filter(pk__in=pks).order_by()}
+        return self._get_page([rows[pk] for pk in pks if pk in rows], number, self)
+
+
+def date_drilldown_filter(field_name, months=6):
+    """Build a list filter with fixed date ranges that needs no query to render"""
+
+    class DateDrilldownFilter(admin.SimpleListFilter):
+        title = field_name.replace('_', ' ')
+        parameter_name = f'{field_name}_range'
+
+        def lookups(self, request, model_admin):
+            choices = [('today', 'Today'), ('7d', 'Past 7 days'), ('30d', 'Past 30 days')]
+            month = timezone.localdate().replace(day=1)
+            for _ in range(months):
+                choices.append((month.strftime('%Y-%m'), month.strftime('%B %Y')))
+                month = (month - timedelta(days=1)).replace(day=1)
+            return choices
+
+        def queryset(self, request, queryset):
+            value = self.value()
+            if not value:
+                return queryset
+            if value in ('today', '7d', '30d'):
+                today = timezone.make_aware(datetime.combine(timezone.localdate(), datetime.min.time()))
+                days = 0 if value == 'today' else int(value[:-1])
+                start, end = today - timedelta(days=days), today + timedelta(days=1)
+            else:
+                try:
+                    year, month = (int(part) for part in value.split('-'))
+                    start = timezone.make_aware(datetime(year, month, 1))
+                    # 9999-12 has no following month
+                    end = timezone.make_aware(datetime(year + month // 12, month % 12 + 1, 1))
+                except (ValueError, OverflowError):
+                    return queryset
+            # Plain range predicates keep the date index usable, unlike __date/__month
+            return queryset.filter(**{f'{field_name}__gte': start, f'{field_name}__lt': end})
+
+    return DateDrilldownFilter
+
+
+class LargeTableAdminMixin:
+    """Drop-in changelist settings for very large tables; see module docstring"""
+    show_full_result_count = False
+    paginator = LargeTablePaginator
+    # Field to drill down on instead of date_hierarchy
+    date_drilldown = None
+    # select_related paths that list_display callables need (FK columns are found automatically)
+    extra_select_related = ()
+
+    def __init__(self, model, admin_site):
+        super().__init__(model, admin_site)
+        if not self.list_select_related:
+            self.list_select_related = self.derive_select_related()
+        if self.date_drilldown:
+            self.date_hierarchy = None
+
+    def derive_select_related(self):
+        related = []
+        for name in self.list_display:
+            if not isinstance(name, str):
+                continue
+            try:
+                field = self.model._meta.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            if isinstance(field, ForeignKey):
+                related.append(name)
+        return tuple(dict.fromkeys(related + list(self.extra_select_related)))
+
+    def get_list_filter(self, request):
+        list_filter = list(super().get_list_filter(request))
+        if self.date_drilldown:
+            list_filter = [f for f in list_filter if f != self.date_drilldown]
+            list_filter.append(date_drilldown_filter(self.date_drilldown))
+        return list_filter
@@ -0,0 +1,321 @@
+# admin_panel/analytics.py
+"""
+In-memory columnar analytics cube across all booking verticals.
+
+Booking facts are kept in compact typed arrays, one per column, with the
+string columns (vertical, location, payment state) dictionary-encoded to
+small integers. New rows are appended by per-table high-watermark on the
+primary key, so a refresh only reads what was inserted since the last one.
+Updates to rows already loaded (payment captured, amount corrected) arrive
+from the change capture in changefeed.py and are patched in place.
+
+Group-by/filter/sum queries run in-process. NumPy is used when installed;
+otherwise the same query runs as a plain Python scan over the arrays.
+"""
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from datetime import date, datetime
+
+from django.conf import settings
+from django.utils import timezone
+
+from .bookings import BOOKING_SOURCES, payment_state
+from .changefeed import capture, UPDATE
+
+try:
+    import numpy as np
+except ImportError:  # optional, pure-Python scan is used instead
+    np = None
+
+DIMENSIONS = ('vertical', 'day', 'week', 'location', 'payment')
+ENCODED_DIMENSIONS = ('vertical', 'location', 'payment')
+MEASURES = ('bookings', 'tickets', 'revenue')
+
+LOAD_CHUNK_SIZE = 5000
+
+
+class Dictionary:
+    """Bidirectional value <-> small integer code mapping for a string column"""
+
+    def __init__(self):
+        self.values = []
+        self.codes = {}
+
+    def __len__(self):
+        return len(self.values)
+
+    def encode(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def lookup(self, value):
+        return self.codes.get(value)
+
+    def decode(self, code):
+        return self.values[code]
+
+
+def _day_ordinal(value):
+    if value is None:
+        return 0
+    if isinstance(value, datetime):
+        if timezone.is_aware(value):
+            value = timezone.localtime(value)
+        value = value.date()
+    return value.toordinal()
+
+
+def _week_ordinal(day):
+    # date.fromordinal(1) is a Monday, so this snaps any day back to its Monday
+    return day - (day - 1) % 7
+
+
+class BookingCube:
+    """Columnar store of booking facts with incremental refresh"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.dictionaries = {dim: Dictionary() for dim in ENCODED_DIMENSIONS}
+
+        self.vertical = array('B')
+        self.location = array('I')
+        self.payment = array('B')
+        self.day = array('i')
+        self.tickets = array('I')
+        self.revenue = array('d')
+
+        # Per-vertical sorted pks and their row positions, for in-place updates
+        self._pks = {}
+        self._positions = {}
+        self.watermarks = {}
+        self.refreshed_at = None
+
+    def __len__(self):
+        return len(self.day)
+
+    # ----- loading -----
+
+    def refresh(self):
+        """Append rows inserted since the previous refresh"""
+        with self._lock:
+            loaded = 0
+            for source in BOOKING_SOURCES:
+                loaded += self._load_source(source)
+            self.refreshed_at = timezone.now()
+            return loaded
+
+    def maybe_refresh(self, max_age=None):
+        capture.start()
+        if max_age is None:
+            max_age = getattr(settings, 'ANALYTICS_REFRESH_SECONDS', 60)
+        if self.refreshed_at is None or (timezone.now() - self.refreshed_at).total_seconds() > max_age:
+            self.refresh()
+
+    def _fact_fields(self, source):
+        fields = ['pk', source.date_field, source.location_path, 'payment_status', source.amount_field]
+        if source.tickets_field:
+            fields.append(source.tickets_field)
+        return fields
+
+    def _load_source(self, source):
+        watermark = self.watermarks.get(source.vertical, 0)
+        rows = (
+            source.model.objects
+            .filter(pk__gt=watermark)
+            .order_by('pk')
+            .values_list(*self._fact_fields(source))
+        )
+
+        count = 0
+        for row in rows.iterator(chunk_size=LOAD_CHUNK_SIZE):
+            self._append(source.vertical, row)
+            watermark = row[0]
+            count += 1
+        self.watermarks[source.vertical] = watermark
+        return count
+
+    def _encode(self, vertical, row):
+        pk, booked, location, paid, amount = row[:5]
+        tickets = row[5] if len(row) > 5 else 1
+        return (
+            pk,
+            self.dictionaries['vertical'].encode(vertical),
+            self.dictionaries['location'].encode(location or ''),
+            self.dictionaries['payment'].encode(payment_state(paid)),
+            _day_ordinal(booked),
+            tickets or 0,
+            float(amount or 0),
+        )
+
+    def _append(self, vertical, row):
+        pk, v_code, l_code, p_code, day, tickets, revenue = self._encode(vertical, row)
+        self._pks.setdefault(v_code, array('q')).append(pk)
+        self._positions.setdefault(v_code, array('I')).append(len(self.day))
+        self.vertical.append(v_code)
+        self.location.append(l_code)
+        self.payment.append(p_code)
+        self.day.append(day)
+        self.tickets.append(tickets)
+        self.revenue.append(revenue)
+
+    def apply_changes(self, changes):
+        """Patch rows already in the cube from change-capture UPDATE records"""
+        with self._lock:
+            for change in changes:
+                source = change.source
+                v_code = self.dictionaries['vertical'].lookup(source.vertical)
+                pks = self._pks.get(v_code)
+                if pks is None:
+                    continue
+                index = bisect_left(pks, change.pk)
+                if index == len(pks) or pks[index] != change.pk:
+                    # Not loaded yet; the next refresh reads it
+                    continue
+                position = self._positions[v_code][index]
+                row = change.row
+                self.payment[position] = self.dictionaries['payment'].encode(payment_state(row.get('payment_status')))
+                self.day[position] = _day_ordinal(row.get(source.date_field))
+                self.revenue[position] = float(row.get(source.amount_field) or 0)
+                if source.tickets_field:
+                    self.tickets[position] = row.get(source.tickets_field) or 0
+
+    # ----- querying -----
+
+    def _codes(self, dim, values):
+        dictionary = self.dictionaries[dim]
+        return [code for code in (dictionary.lookup(value) for value in values) if code is not None]
+
+    def query(self, group_by=(), filters=None, start=None, end=None):
+        """
+        Sum bookings, tickets and revenue grouped by any of DIMENSIONS.
+
+        filters maps 'vertical', 'location' or 'payment' to a list of
+        accepted values; start/end are inclusive dates on the booking day.
+        """
+        group_by = list(group_by)
+        unknown = [dim for dim in group_by if dim not in DIMENSIONS]
+        if unknown:
+            raise ValueError(f"Unknown dimension: {', '.join(unknown)}")
+        filters = {dim: values for dim, values in (filters or {}).items() if values}
+        unknown = [dim for dim in filters if dim not in ENCODED_DIMENSIONS]
+        if unknown:
+            raise ValueError(f"Cannot filter on: {', '.join(unknown)}")
+
+        with self._lock:
+            code_filters = {dim: self._codes(dim, values) for dim, values in filters.items()}
+            if any(not codes for codes in code_filters.values()) or not len(self):
+                return []
+            day_range = (
+                start.toordinal() if start else None,
+                end.toordinal() if end else None,
+            )
+            if np is not None:
+                groups = self._query_numpy(group_by, code_filters, day_range)
+            else:
+                groups = self._query_python(group_by, code_filters, day_range)
+
+        return [self._decode_group(group_by, key, totals) for key, totals in groups]
+
+    def _query_numpy(self, group_by, code_filters, day_range):
+        columns = {
+            name: np.frombuffer(getattr(self, name), dtype=getattr(self, name).typecode)
+            for name in ('vertical', 'location', 'payment', 'day', 'tickets', 'revenue')
+        }
+        day = columns['day']
+        mask = np.ones(len(day), dtype=bool)
+        for dim, codes in code_filters.items():
+            mask &= np.isin(columns[dim], codes)
+        if day_range[0] is not None:
+            mask &= day >= day_range[0]
+        if day_range[1] is not None:
+            mask &= day <= day_range[1]
+
+        tickets = columns['tickets'][mask]
+        revenue = columns['revenue'][mask]
+        if not group_by:
+            if not len(tickets):
+                return []
+            return [((), (int(mask.sum()), int(tickets.sum()), float(revenue.sum())))]
+
+        keys = []
+        for dim in group_by:
+            if dim == 'week':
+                column = day[mask]
+                keys.append(column - (column - 1) % 7)
+            else:
+                keys.append(columns[dim][mask].astype(np.int64))
+        if not len(keys[0]):
+            return []
+
+        unique, inverse = np.unique(np.stack(keys, axis=1), axis=0, return_inverse=True)
+        inverse = inverse.ravel()
+        bookings = np.bincount(inverse)
+        ticket_sums = np.bincount(inverse, weights=tickets)
+        revenue_sums = np.bincount(inverse, weights=revenue)
+        return [
+            (tuple(int(v) for v in unique[i]), (int(bookings[i]), int(ticket_sums[i]), float(revenue_sums[i])))
+            for i in range(len(unique))
+        ]
+
+    def _query_python(self, group_by, code_filters, day_range):
+        low, high = day_range
+        accepted = {dim: set(codes) for dim, codes in code_filters.items()}
+        groups = {}
+        columns = zip(self.vertical, self.location, self.payment, self.day, self.tickets, self.revenue)
+        for vertical, location, payment, day, tickets, revenue in columns:
+            row = {'vertical': vertical, 'location': location, 'payment': payment, 'day': day}
+            if any(row[dim] not in codes for dim, codes in accepted.items()):
+                continue
+            if (low is not None and day < low) or (high is not None and day > high):
+                continue
+            row['week'] = _week_ordinal(day)
+            key = tuple(row[dim] for dim in group_by)
+            totals = groups.get(key)
+            if totals is None:
+                groups[key] = [1, tickets, revenue]
+            else:
+                totals[0] += 1
+                totals[1] += tickets
+                totals[2] += revenue
+        return sorted(groups.items())
+
+    def _decode_group(self, group_by, key, totals):
+        result = {}
+        for dim, code in zip(group_by, key):
+            if dim in ('day', 'week'):
+                result[dim] = date.fromordinal(code).isoformat() if code else None
+            else:
+                result[dim] = self.dictionaries[dim].decode(code)
+        bookings, tickets, revenue = totals
+        result.update(bookings=bookings, tickets=tickets, revenue=round(revenue, 2))
+        return result
+
+    def stats(self):
+        with self._lock:
+            return {
+                'rows': len(self),
+                'bytes': sum(
+                    column.itemsize * len(column)
+                    for column in (self.vertical, self.location, self.payment, self.day, self.tickets, self.revenue)
+                ),
+                'watermarks': dict(self.watermarks),
+                'refreshed_at': self.refreshed_at.isoformat() if self.refreshed_at else None,
+                'engine': 'numpy' if np is not None else 'python',
+            }
+
+
+cube = BookingCube()
+capture.subscribe(cube.apply_changes, kinds=[UPDATE])
+
+
+def run_query(**kwargs):
+    """Refresh the shared cube if stale, query it and report the time taken"""
+    cube.maybe_refresh()
+    started = time.perf_counter()
+    rows = cube.query(**kwargs)
+    return rows, (time.perf_counter() - started) * 1000
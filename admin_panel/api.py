@@ -0,0 +1,195 @@
+# admin_panel/api.py
+"""
+Read-only JSON API over the catalog and booking models.
+
+Every endpoint is served straight from .values() projections, so no model
+instances are built. Clients can ask for a subset of columns with
+``fields=a,b``, filter with ``field=value`` / ``field__gte=`` / ``__lte`` /
+``__in``, and page with a keyset cursor (``after=<last id>``, ``limit=``)
+instead of OFFSET so deep pages cost the same as the first one.
+"""
+import datetime
+import json
+from decimal import Decimal
+
+from django.contrib.auth.decorators import login_required
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, Http404
+from django.views.decorators.http import require_GET
+
+from .models import (
+    Event, Movie, MovieScreen, TheaterSeat, ComedyShow, LiveConcert, AmusementPark,
+    AmusementTicket, BookingsEvent, TicketBooking, BookingComedyShow,
+    LiveConcertTicketBooking, AmusementBooking, AmusementBookingItem, OtherAmusementBooking,
+)
+
+try:
+    import orjson
+except ImportError:  # optional, falls back to the stdlib encoder
+    orjson = None
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+FILTER_LOOKUPS = ('gte', 'lte', 'gt', 'lt', 'in')
+
+# Never exposed, whatever fields= asks for
+HIDDEN_FIELDS = {'razorpay_signature', 'password', 'reset_token'}
+
+RESOURCES = {
+    'events': Event,
+    'movies': Movie,
+    'movie-screens': MovieScreen,
+    'theater-seats': TheaterSeat,
+    'comedy-shows': ComedyShow,
+    'concerts': LiveConcert,
+    'amusement-parks': AmusementPark,
+    'amusement-tickets': AmusementTicket,
+    'event-bookings': BookingsEvent,
+    'movie-bookings': TicketBooking,
+    'comedy-bookings': BookingComedyShow,
+    'concert-bookings': LiveConcertTicketBooking,
+    'amusement-bookings': AmusementBooking,
+    'amusement-booking-items': AmusementBookingItem,
+    'other-amusement-bookings': OtherAmusementBooking,
+}
+
+
+class ApiError(Exception):
+    pass
+
+
+def resource_fields(model):
+    """Public column names (FKs as <name>_id) for a model"""
+    return [f.attname for f in model._meta.concrete_fields if f.name not in HIDDEN_FIELDS]
+
+
+def get_model(resource):
+    try:
+        return RESOURCES[resource]
+    except KeyError:
+        raise Http404(f"Unknown resource: {resource}")
+
+
+def _encode_default(value):
+    if isinstance(value, Decimal):
+        # As a string so no precision is lost on money columns
+        return str(value)
+    if isinstance(value, datetime.timedelta):
+        return value.total_seconds()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+class ApiEncoder(DjangoJSONEncoder):
+    """DjangoJSONEncoder with the orjson path's Decimal and timedelta encoding"""
+
+    def default(self, o):
+        try:
+            return _encode_default(o)
+        except TypeError:
+            return super().default(o)
+
+
+def dumps(data):
+    """Serialize to JSON bytes with orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(data, default=_encode_default)
+    return json.dumps(data, cls=ApiEncoder).encode()
+
+
+def json_response(data, status=200):
+    return HttpResponse(dumps(data), content_type='application/json', status=status)
+
+
+def parse_fields(model, params):
+    available = resource_fields(model)
+    requested = [name for item in params.getlist('fields') for name in item.split(',') if name]
+    if not requested:
+        return available
+    unknown = [name for name in requested if name not in available]
+    if unknown:
+        raise ApiError(f"Unknown field(s): {', '.join(unknown)}")
+    # The cursor column is always returned so the client can page
+    return ['id'] + [name for name in requested if name != 'id']
+
+
+def parse_filters(model, params):
+    available = set(resource_fields(model))
+    filters = {}
+    for key, value in params.items():
+        if key in ('fields', 'after', 'limit', 'order'):
+            continue
+        name, _, lookup = key.partition('__')
+        if name not in available or (lookup and lookup not in FILTER_LOOKUPS):
+            raise ApiError(f"Cannot filter on: {key}")
+        filters[key] = value.split(',') if lookup == 'in' else value
+    return filters
+
+
+def parse_limit(params):
+    try:
+        limit = int(params.get('limit', DEFAULT_LIMIT))
+    except ValueError:
+        raise ApiError("limit must be an integer")
+    return max(1, min(limit, MAX_LIMIT))
+
+
+def page(model, params):
+    """Run one keyset page and return (rows, next cursor)"""
+    fields = parse_fields(model, params)
+    filters = parse_filters(model, params)
+    limit = parse_limit(params)
+    descending = params.get('order') == '-id'
+
+    queryset = model.objects.filter(**filters)
+    after = params.get('after')
+    if after:
+        queryset = queryset.filter(pk__lt=after) if descending else queryset.filter(pk__gt=after)
+    queryset = queryset.order_by('-pk' if descending else 'pk').values(*fields)
+
+    rows = list(queryset[:limit + 1])
+    next_cursor = rows[limit - 1]['id'] if len(rows) > limit else None
+    return rows[:limit], next_cursor
+
+
+@login_required(login_url='/admin-panel/login/')
+@require_GET
+def api_list(request, resource):
+    """Keyset-paged, filterable list of one resource"""
+    model = get_model(resource)
+    try:
+        rows, next_cursor = page(model, request.GET)
+    except (ApiError, ValidationError, ValueError) as e:
+        return json_response({'error': str(e)}, status=400)
+
+    next_url = None
+    if next_cursor is not None:
+        params = request.GET.copy()
+        params['after'] = next_cursor
+        next_url = f"{request.path}?{params.urlencode()}"
+    return json_response({'results': rows, 'count': len(rows), 'next': next_url})
+
+
+@login_required(login_url='/admin-panel/login/')
+@require_GET
+def api_detail(request, resource, pk):
+    """One row of one resource"""
+    model = get_model(resource)
+    try:
+        fields = parse_fields(model, request.GET)
+    except ApiError as e:
+        return json_response({'error': str(e)}, status=400)
+    row = model.objects.filter(pk=pk).values(*fields).first()
+    if row is None:
+        return json_response({'error': 'Not found'}, status=404)
+    return json_response(row)
+
+
+@login_required(login_url='/admin-panel/login/')
+@require_GET
+def api_index(request):
+    """List the resources and the fields each one exposes"""
+    return json_response({
+        name: {'url': f"{request.path}{name}/", 'fields': resource_fields(model)}
+        for name, model in RESOURCES.items()
+    })
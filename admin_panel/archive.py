@@ -0,0 +1,226 @@
+# admin_panel/archive.py
+"""
+Archival of old bookings into side tables.
+
+Every booking table gets an archive twin, archive_<table>, with the same
+columns (CREATE TABLE ... LIKE on MySQL). archive_source() copies rows whose
+booking date is older than the horizon, BATCH_SIZE primary keys at a time:
+each batch is one transaction of INSERT INTO archive SELECT ..., with the
+amusement booking items copied alongside their parent. The booking tables
+belong to the public site, so the live rows are only DELETEd as well when
+settings.BOOKING_ARCHIVE_DELETE says its owners have agreed; otherwise rows
+already in the archive are skipped and the run is a copy. A batch either
+moves completely or not at all, and the next run re-selects what is left,
+so an interrupted run simply resumes. Bookings still pending are never
+archived.
+
+Reads go through archived_model(), an unmanaged copy of the booking model
+bound to the archive table, so views can switch a list to archived rows
+with bookings(model, archived=True) or fall back to the archive in
+get_booking() when a detail page's row has moved. Aggregates read
+with_archive(), which adds the archived rows no longer in the live table,
+so totals and old date ranges are the same before and after a run.
+"""
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, models, transaction
+from django.http import Http404
+from django.utils import timezone
+
+from .bookings import BOOKING_SOURCES
+from .models import AmusementBooking, AmusementBookingItem, OtherAmusementBooking
+
+PREFIX = 'archive_'
+HORIZON_DAYS = getattr(settings, 'BOOKING_ARCHIVE_DAYS', 365)
+BATCH_SIZE = 1000
+# Bookings in these states still need attention and stay in the hot table
+KEEP_STATUSES = ('pending',)
+# Remove archived rows from the public site's tables (copy only when off)
+DELETE_LIVE = getattr(settings, 'BOOKING_ARCHIVE_DELETE', False)
+
+# Child rows that must move with their parent booking: model, column holding the parent's pk
+CHILDREN = {
+    AmusementBooking: [(AmusementBookingItem, 'booking_id')],
+    OtherAmusementBooking: [(AmusementBookingItem, 'other_booking_id')],
+}
+
+_archived = {}
+
+
+def archive_table(model):
+    return PREFIX + model._meta.db_table
+
+
+def archived_model(model):
+    """Unmanaged model with ``model``'s fields on its archive table"""
+    if model in _archived:
+        return _archived[model]
+    attrs = {'__module__': __name__}
+    for field in model._meta.concrete_fields:
+        name, _, args, kwargs = field.deconstruct()
+        if field.is_relation:
+            target = field.related_model
+            # Archived items point at archived parents; everything else at the live catalog
+            parents = [parent for parent, children in CHILDREN.items() if any(c[0] is model for c in children)]
+            kwargs['to'] = archived_model(target) if target in parents else target
+            kwargs.update(related_name='+', on_delete=models.DO_NOTHING, db_constraint=False)
+        attrs[name] = type(field)(*args, **kwargs)
+    for name in ('STATUS_CHOICES',):
+        if hasattr(model, name):
+            attrs[name] = getattr(model, name)
+    attrs['Meta'] = type('Meta', (), {
+        'managed': False,
+        'db_table': archive_table(model),
+        'app_label': model._meta.app_label,
+        'verbose_name': f"archived {model._meta.verbose_name}",
+        'verbose_name_plural': f"archived {model._meta.verbose_name_plural}",
+    })
+    _archived[model] = type(f"Archived{model.__name__}", (models.Model,), attrs)
+    return _archived[model]
+
+
+def bookings(model, archived=False):
+    """Default queryset for the live table, or for its archive when ``archived``"""
+    return (archived_model(model) if archived else model).objects.all()
+
+
+def archive_exists(model):
+    return archive_table(model) in connection.introspection.table_names()
+
+
+def with_archive(model, **filters):
+    """Querysets for ``filters`` over the live table plus, once it exists, the archived rows no longer live"""
+    querysets = [model.objects.filter(**filters)]
+    if archive_exists(model):
+        querysets.append(archived_model(model).objects.filter(**filters)
+                         .exclude(pk__in=model.objects.values('pk')))
+    return querysets
+
+
+def get_booking(model, related=(), **lookup):
+    """(booking, archived) from the live table, else the archive; raises Http404 when in neither"""
+    for archived in (False, True):
+        booking = bookings(model, archived).select_related(*related).filter(**lookup).first()
+        if booking is not None:
+            return booking, archived
+    raise Http404(f"No {model._meta.verbose_name} matches the given query.")
+
+
+# ----- moving rows -----
+
+def ensure_tables(source_models=None):
+    """Create missing archive tables for the booking models (and their child tables)"""
+    wanted = []
+    for model in source_models or [source.model for source in BOOKING_SOURCES]:
+        wanted.append(model)
+        wanted.extend(child for child, _ in CHILDREN.get(model, []))
+    existing = set(connection.introspection.table_names())
+    created = []
+    for model in dict.fromkeys(wanted):
+        table = archive_table(model)
+        if table in existing:
+            continue
+        if connection.vendor == 'mysql':
+            with connection.cursor() as cursor:
+                cursor.execute(f"CREATE TABLE {connection.ops.quote_name(table)} "
+                               f"LIKE {connection.ops.quote_name(model._meta.db_table)}")
+        else:
+            with connection.schema_editor() as editor:
+                editor.create_model(archived_model(model))
+        created.append(table)
+    return created
+
+
+def horizon(days=HORIZON_DAYS):
+    return timezone.now() - timedelta(days=days)
+
+
+def candidates(source, before):
+    """Live rows of ``source`` old enough to archive"""
+    rows = source.model.objects.filter(**{f"{source.date_field}__lt": before})
+    if source.status_field:
+        rows = rows.exclude(**{f"{source.status_field}__in": KEEP_STATUSES})
+    return rows
+
+
+def _copy(cursor, model, column, pks):
+    quote = connection.ops.quote_name
+    placeholders = ', '.join(['%s'] * len(pks))
+    columns = ', '.join(quote(field.column) for field in model._meta.concrete_fields)
+    cursor.execute(
+        f"INSERT INTO {quote(archive_table(model))} ({columns}) SELECT {columns} "
+        f"FROM {quote(model._meta.db_table)} WHERE {quote(column)} IN ({placeholders})", pks,
+    )
+    return cursor.rowcount
+
+
+def _delete(cursor, model, column, pks):
+    quote = connection.ops.quote_name
+    placeholders = ', '.join(['%s'] * len(pks))
+    cursor.execute(f"DELETE FROM {quote(model._meta.db_table)} WHERE {quote(column)} IN ({placeholders})", pks)
+    return cursor.rowcount
+
+
+def archive_batch(source, before, after_pk=0, batch_size=BATCH_SIZE, delete=DELETE_LIVE):
+    """Archive the next batch past ``after_pk``; returns (rows archived, last pk or None when done)"""
+    pks = list(candidates(source, before).filter(pk__gt=after_pk)
+               .order_by('pk').values_list('pk', flat=True)[:batch_size])
+    if not pks:
+        return 0, None
+    # Copy-only runs leave their rows in the live table, so they come round again
+    done = set(archived_model(source.model).objects.filter(pk__in=pks).values_list('pk', flat=True))
+    todo = [pk for pk in pks if pk not in done]
+    pk_column = source.model._meta.pk.column
+    children = CHILDREN.get(source.model, [])
+    moved = 0
+    with transaction.atomic(), connection.cursor() as cursor:
+        if todo:
+            for child, column in children:
+                _copy(cursor, child, column, todo)
+            moved = _copy(cursor, source.model, pk_column, todo)
+        if delete:
+            for child, column in children:
+                _delete(cursor, child, column, pks)
+            moved = _delete(cursor, source.model, pk_column, pks)
+    return moved, pks[-1]
+
+
+def archive_source(source, before, batch_size=BATCH_SIZE, max_batches=None, pause=0, progress=None,
+                   delete=DELETE_LIVE):
+    """Archive ``source`` batch by batch; returns rows archived"""
+    total, after_pk, batches = 0, 0, 0
+    while max_batches is None or batches < max_batches:
+        moved, after_pk = archive_batch(source, before, after_pk, batch_size, delete)
+        if after_pk is None:
+            break
+        if not moved:
+            # Already copied by an earlier run; doesn't count towards max_batches
+            continue
+        total += moved
+        batches += 1
+        if progress:
+            progress(source, total)
+        if pause:
+            # Leave room for the public site's writes between batches
+            time.sleep(pause)
+    return total
+
+
+def table_size(model, archived=False):
+    """(rows, bytes) of the live or archive table; bytes is None off MySQL"""
+    table = archive_table(model) if archived else model._meta.db_table
+    if connection.vendor == 'mysql':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT data_length + index_length FROM information_schema.tables "
+                "WHERE table_schema = DATABASE() AND table_name = %s", [table],
+            )
+            row = cursor.fetchone()
+        size = row[0] if row else None
+    else:
+        size = None
+    # information_schema's row estimate is too rough to show a before/after difference
+    rows = (archived_model(model) if archived else model).objects.count()
+    return rows, size
@@ -0,0 +1,125 @@
+# admin_panel/bookings.py
+"""
+One place describing the six booking tables written by the public site.
+
+The booking models disagree on field names (booking_date vs booked_at vs
+created_at, total_amount vs grand_total, boolean vs text payment status),
+so every cross-vertical feature reads them through these descriptions.
+"""
+from dataclasses import dataclass
+
+from django.db.models import Q
+
+from .models import (
+    BookingsEvent, TicketBooking, BookingComedyShow, LiveConcertTicketBooking,
+    AmusementBooking, OtherAmusementBooking,
+)
+
+
+@dataclass(frozen=True)
+class BookingSource:
+    vertical: str
+    label: str
+    model: type
+    date_field: str
+    amount_field: str
+    item_field: str
+    item_name_path: str
+    location_path: str
+    tickets_field: str = None
+    status_field: str = None
+
+    @property
+    def table(self):
+        return self.model._meta.db_table
+
+    @property
+    def item_id_field(self):
+        return f"{self.item_field}_id"
+
+    @property
+    def payment_text(self):
+        """True when payment_status is free text rather than a boolean"""
+        return self.model._meta.get_field('payment_status').get_internal_type() == 'CharField'
+
+
+BOOKING_SOURCES = (
+    BookingSource(
+        vertical='events', label='Events', model=BookingsEvent,
+        date_field='booking_date', amount_field='total_amount', tickets_field='number_of_tickets',
+        item_field='event', item_name_path='event__name', location_path='event__location',
+        status_field='status',
+    ),
+    BookingSource(
+        vertical='movies', label='Movies', model=TicketBooking,
+        date_field='booked_at', amount_field='grand_total',
+        item_field='movie', item_name_path='movie__title', location_path='movie__location',
+    ),
+    BookingSource(
+        vertical='comedy', label='Comedy Shows', model=BookingComedyShow,
+        date_field='booking_date', amount_field='total_price', tickets_field='number_of_tickets',
+        item_field='comedy_show', item_name_path='comedy_show__title', location_path='comedy_show__location',
+    ),
+    BookingSource(
+        vertical='concerts', label='Live Concerts', model=LiveConcertTicketBooking,
+        date_field='booked_at', amount_field='total_amount', tickets_field='quantity',
+        item_field='concert', item_name_path='concert__title', location_path='concert__location',
+    ),
+    BookingSource(
+        vertical='amusement', label='Amusement Parks', model=AmusementBooking,
+        date_field='created_at', amount_field='grand_total',
+        item_field='amusement_park', item_name_path='amusement_park__park_name',
+        location_path='amusement_park__location',
+    ),
+    BookingSource(
+        vertical='amusement_other', label='Other Amusement', model=OtherAmusementBooking,
+        date_field='created_at', amount_field='grand_total', tickets_field='quantity',
+        item_field='amusement_park', item_name_path='amusement_park__park_name',
+        location_path='amusement_park__location',
+    ),
+)
+
+# Free-text payment_status values that mean the money arrived
+PAID_STATES = {'paid', 'success', 'successful', 'captured', 'completed', 'settled'}
+
+SOURCES_BY_VERTICAL = {source.vertical: source for source in BOOKING_SOURCES}
+
+
+def get_source(vertical):
+    try:
+        return SOURCES_BY_VERTICAL[vertical]
+    except KeyError:
+        raise ValueError(f"Unknown vertical: {vertical}")
+
+
+def payment_state(value):
+    """Normalize boolean and free-text payment_status values to a short label"""
+    if value is True:
+        return 'paid'
+    if value is False or value is None:
+        return 'pending'
+    return str(value).strip().lower() or 'pending'
+
+
+def is_paid(value):
+    return payment_state(value) in PAID_STATES
+
+
+def sold_filter(source):
+    """Q for bookings that count as sold: paid and, where the table has a status, not cancelled"""
+    if source.payment_text:
+        sold = Q()
+        for state in sorted(PAID_STATES):
+            sold |= Q(payment_status__iexact=state)
+    else:
+        sold = Q(payment_status=True)
+    if source.status_field:
+        sold &= ~Q(**{source.status_field: 'cancelled'})
+    return sold
+
+
+def is_sold(source, row):
+    """sold_filter() for one row dict, e.g. a change-capture record"""
+    if not is_paid(row.get('payment_status')):
+        return False
+    return source.status_field is None or row.get(source.status_field) != 'cancelled'
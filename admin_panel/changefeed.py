@@ -0,0 +1,297 @@
+# admin_panel/changefeed.py
+"""
+High-watermark change capture for the booking tables written by the public site.
+
+The public project inserts and updates the managed=False booking tables
+behind this admin's back. ChangeCapture rediscovers those changes cheaply
+and publishes them as typed BookingChange records to in-process subscribers:
+
+* inserts:  rows above each table's primary-key high-watermark
+* updates:  the newest ``recent_window`` rows are re-read every poll and
+            diffed row by row; rows whose timestamp moved past the table's
+            timestamp watermark while their id did not are reported too
+* sweep:    every ``sweep_interval`` seconds older rows are compared in
+            fixed id ranges by checksum, and only ranges whose checksum
+            changed are fetched and reported
+
+One capture instance polls for the whole process; subscribers register a
+callback instead of running their own scans.
+"""
+import logging
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+from django.db.models import Max
+
+from .bookings import BOOKING_SOURCES, BookingSource
+
+logger = logging.getLogger(__name__)
+
+INSERT = 'insert'
+UPDATE = 'update'
+
+POLL_INTERVAL = getattr(settings, 'CHANGEFEED_POLL_SECONDS', 2.0)
+RECENT_WINDOW = getattr(settings, 'CHANGEFEED_RECENT_WINDOW', 500)
+SWEEP_INTERVAL = getattr(settings, 'CHANGEFEED_SWEEP_SECONDS', 300)
+SWEEP_CHUNK = getattr(settings, 'CHANGEFEED_SWEEP_CHUNK', 1000)
+MAX_INSERTS_PER_POLL = 5000
+
+
+@dataclass(frozen=True)
+class BookingChange:
+    kind: str
+    source: BookingSource
+    pk: int
+    row: dict
+    # Row as last seen; only known for rows inside the recent window
+    previous: dict = None
+
+    @property
+    def vertical(self):
+        return self.source.vertical
+
+    def changed_fields(self):
+        if self.previous is None:
+            return set(self.row)
+        return {name for name, value in self.row.items() if self.previous.get(name) != value}
+
+
+@dataclass
+class TableState:
+    watermark: int = None
+    time_watermark: object = None
+    recent: dict = field(default_factory=dict)
+    chunk_checksums: dict = field(default_factory=dict)
+    chunk_rows: dict = field(default_factory=dict)
+    last_sweep: float = 0.0
+
+
+def captured_fields(source):
+    return [f.attname for f in source.model._meta.concrete_fields]
+
+
+def row_hash(row):
+    return zlib.crc32(repr(tuple(row.values())).encode())
+
+
+class ChangeCapture:
+    """Polls the booking tables and publishes BookingChange records to subscribers"""
+
+    def __init__(self, sources=BOOKING_SOURCES, recent_window=RECENT_WINDOW,
+                 sweep_interval=SWEEP_INTERVAL, sweep_chunk=SWEEP_CHUNK):
+        self.sources = sources
+        self.recent_window = recent_window
+        self.sweep_interval = sweep_interval
+        self.sweep_chunk = sweep_chunk
+        self._state = {source.vertical: TableState() for source in sources}
+        self._subscribers = []
+        self._lock = threading.Lock()
+        self._poll_lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+
+    # ----- subscriptions -----
+
+    def subscribe(self, callback, verticals=None, kinds=None):
+        """Call callback(changes) for every poll that yields matching changes; returns an unsubscribe function"""
+        entry = (callback, set(verticals) if verticals else None, set(kinds) if kinds else None)
+        with self._lock:
+            self._subscribers.append(entry)
+
+        def unsubscribe():
+            with self._lock:
+                if entry in self._subscribers:
+                    self._subscribers.remove(entry)
+        return unsubscribe
+
+    def publish(self, changes):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback, verticals, kinds in subscribers:
+            selected = [
+                change for change in changes
+                if (verticals is None or change.vertical in verticals)
+                and (kinds is None or change.kind in kinds)
+            ]
+            if not selected:
+                continue
+            try:
+                callback(selected)
+            except Exception:
+                logger.exception("Change feed subscriber %r failed", callback)
+
+    # ----- polling -----
+
+    def poll(self, sweep=None):
+        """Capture changes on every table, publish them and return them"""
+        with self._poll_lock:
+            changes = self._capture(sweep)
+        if changes:
+            self.publish(changes)
+        return changes
+
+    def _capture(self, sweep):
+        now = time.monotonic()
+        changes = []
+        for source in self.sources:
+            state = self._state[source.vertical]
+            if state.watermark is None:
+                self._prime(source, state)
+                continue
+            changes.extend(self._capture_inserts(source, state))
+            changes.extend(self._capture_recent(source, state))
+            changes.extend(self._capture_late_timestamps(source, state))
+            if sweep or (sweep is None and now - state.last_sweep >= self.sweep_interval):
+                changes.extend(self._sweep(source, state))
+                state.last_sweep = now
+        return changes
+
+    def start(self, interval=POLL_INTERVAL):
+        """Run poll() every interval seconds on a daemon thread (idempotent)"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, args=(interval,), name='changefeed', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _loop(self, interval):
+        while not self._stop.wait(interval):
+            try:
+                self.poll()
+            except Exception:
+                logger.exception("Change feed poll failed")
+            finally:
+                close_old_connections()
+
+    def watermarks(self):
+        return {vertical: state.watermark for vertical, state in self._state.items()}
+
+    # ----- capture steps -----
+
+    def _rows(self, source, queryset):
+        return queryset.order_by('pk').values(*captured_fields(source))
+
+    def _prime(self, source, state):
+        """Start from the current end of the table; history is not replayed"""
+        state.watermark = source.model.objects.aggregate(last=Max('pk'))['last'] or 0
+        state.time_watermark = source.model.objects.aggregate(last=Max(source.date_field))['last']
+        floor = state.watermark - self.recent_window
+        state.recent = {
+            row['id']: row for row in self._rows(source, source.model.objects.filter(pk__gt=floor))
+        }
+        state.last_sweep = time.monotonic()
+
+    def _capture_inserts(self, source, state):
+        rows = list(self._rows(source, source.model.objects.filter(pk__gt=state.watermark))[:MAX_INSERTS_PER_POLL])
+        changes = []
+        for row in rows:
+            changes.append(BookingChange(INSERT, source, row['id'], row))
+            state.recent[row['id']] = row
+            stamp = row.get(source.date_field)
+            if stamp is not None and (state.time_watermark is None or stamp > state.time_watermark):
+                state.time_watermark = stamp
+        if rows:
+            state.watermark = rows[-1]['id']
+        return changes
+
+    def _capture_recent(self, source, state):
+        floor = state.watermark - self.recent_window
+        # Inserts were just read, so only rows inserted before this poll are diffed
+        current = self._rows(source, source.model.objects.filter(pk__gt=floor, pk__lte=state.watermark))
+
+        changes = []
+        fresh = {}
+        for row in current:
+            previous = state.recent.get(row['id'])
+            if previous is not None and previous != row:
+                changes.append(BookingChange(UPDATE, source, row['id'], row, previous))
+            fresh[row['id']] = row
+        state.recent = fresh
+        return changes
+
+    def _capture_late_timestamps(self, source, state):
+        """Rows below the recent window whose timestamp moved past the time watermark"""
+        if state.time_watermark is None:
+            return []
+        floor = state.watermark - self.recent_window
+        rows = list(self._rows(source, source.model.objects.filter(
+            pk__lte=floor, **{f'{source.date_field}__gt': state.time_watermark}
+        )))
+        for row in rows:
+            stamp = row[source.date_field]
+            if stamp > state.time_watermark:
+                state.time_watermark = stamp
+        return [BookingChange(UPDATE, source, row['id'], row) for row in rows]
+
+    def _sweep(self, source, state):
+        """Checksum fixed id ranges below the recent window and report rows in ranges that changed"""
+        limit = ((state.watermark - self.recent_window) // self.sweep_chunk) * self.sweep_chunk
+        if limit <= 0:
+            return []
+
+        checksums = self._chunk_checksums(source, limit)
+        changes = []
+        for chunk, checksum in checksums.items():
+            known = state.chunk_checksums.get(chunk)
+            state.chunk_checksums[chunk] = checksum
+            if known is None or known == checksum:
+                continue
+            changes.extend(self._diff_chunk(source, state, chunk))
+
+        # Chunks that disappeared entirely (rows deleted or archived)
+        for chunk in set(state.chunk_checksums) - set(checksums):
+            del state.chunk_checksums[chunk]
+            state.chunk_rows.pop(chunk, None)
+        return changes
+
+    def _diff_chunk(self, source, state, chunk):
+        low = chunk * self.sweep_chunk
+        rows = self._rows(source, source.model.objects.filter(pk__gte=low, pk__lt=low + self.sweep_chunk))
+        known = state.chunk_rows.get(chunk)
+        hashes = {}
+        changes = []
+        for row in rows:
+            hashes[row['id']] = row_hash(row)
+            # Without a per-row baseline every row of the range is reported once
+            if known is None or known.get(row['id']) != hashes[row['id']]:
+                changes.append(BookingChange(UPDATE, source, row['id'], row))
+        state.chunk_rows[chunk] = hashes
+        return changes
+
+    def _chunk_checksums(self, source, limit):
+        if connection.vendor == 'mysql':
+            return self._chunk_checksums_sql(source, limit)
+
+        checksums = {}
+        rows = source.model.objects.filter(pk__lt=limit).order_by('pk').values(*captured_fields(source))
+        for row in rows.iterator(chunk_size=self.sweep_chunk):
+            chunk = row['id'] // self.sweep_chunk
+            count, checksum = checksums.get(chunk, (0, 0))
+            checksums[chunk] = (count + 1, checksum ^ row_hash(row))
+        return checksums
+
+    def _chunk_checksums_sql(self, source, limit):
+        """One GROUP BY per table; MySQL computes every range checksum server-side"""
+        quote = connection.ops.quote_name
+        pk_column = quote(source.model._meta.pk.column)
+        columns = ", ".join(
+            f"COALESCE({quote(f.column)}, 'NULL')" for f in source.model._meta.concrete_fields
+        )
+        sql = (
+            f"SELECT FLOOR({pk_column} / %s) AS chunk, COUNT(*), BIT_XOR(CRC32(CONCAT_WS('|', {columns}))) "
+            f"FROM {quote(source.table)} WHERE {pk_column} < %s GROUP BY chunk"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [self.sweep_chunk, limit])
+            return {int(chunk): (count, checksum) for chunk, count, checksum in cursor.fetchall()}
+
+
+capture = ChangeCapture()
@@ -0,0 +1,114 @@
+# admin_panel/conditional.py
+"""
+Conditional GET support for the catalog list and detail pages.
+
+Each page gets a cheap ETag built from one aggregate query per table
+(max modified_at and row count, or max id for the unmanaged booking
+tables). When the browser's If-None-Match still matches, Django answers
+304 Not Modified before the view runs any of its queries or renders.
+
+Only an ETag is sent. Max-modified alone cannot see deletions, so a bare
+Last-Modified validator would serve stale pages after a delete.
+"""
+import hashlib
+from datetime import date
+from functools import wraps
+
+from django.contrib import messages
+from django.db.models import Count, Max, Sum, Q
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+
+from .models import Event, BookingsEvent, Movie, MovieScreen, ComedyShow, TicketBooking, BookingComedyShow
+
+
+def table_version(queryset):
+    """(max modified_at, row count) for a queryset of a model with modified_at"""
+    version = queryset.aggregate(modified=Max('modified_at'), rows=Count('pk'))
+    return version['modified'], version['rows']
+
+
+def booking_version(queryset):
+    """(max id, row count) for an unmanaged booking table that has no modified column"""
+    version = queryset.aggregate(last=Max('pk'), rows=Count('pk'))
+    return version['last'], version['rows']
+
+
+def make_etag(request, *parts):
+    """Combine data versions with everything else that changes the rendered page"""
+    if request.method not in ('GET', 'HEAD'):
+        return None
+    # Pending flash messages must be rendered, never swallowed by a 304
+    if len(messages.get_messages(request)):
+        return None
+
+    key = '|'.join(str(part) for part in (
+        request.user.pk,
+        request.META.get('CSRF_COOKIE', ''),
+        request.get_full_path(),
+        *parts,
+    ))
+    return hashlib.md5(key.encode()).hexdigest()
+
+
+def conditional_page(etag_func):
+    """Answer 304 when etag_func's ETag matches, and make browsers revalidate every time"""
+    def decorator(view_func):
+        @wraps(view_func)
+        @cache_control(private=True, no_cache=True)
+        @condition(etag_func=etag_func)
+        def _wrapped(request, *args, **kwargs):
+            return view_func(request, *args, **kwargs)
+        return _wrapped
+    return decorator
+
+
+# ========= PER-PAGE ETAGS =========
+
+def events_list_etag(request):
+    # "Upcoming"/"past" counts move at midnight even if no row changes
+    return make_etag(
+        request,
+        date.today(),
+        *table_version(Event.objects.all()),
+        *booking_version(BookingsEvent.objects.all()),
+    )
+
+
+def event_detail_etag(request, event_id):
+    event_version = Event.objects.filter(id=event_id).values_list('modified_at', flat=True).first()
+    bookings = BookingsEvent.objects.filter(event_id=event_id).aggregate(
+        last=Max('pk'),
+        rows=Count('pk'),
+        confirmed=Count('pk', filter=Q(status='confirmed')),
+        revenue=Sum('total_amount'),
+    )
+    return make_etag(request, date.today(), event_id, event_version, *bookings.values())
+
+
+def movie_catalog_etag(request):
+    # The "When" facet (upcoming/past) moves at midnight; available_seats moves with
+    # public-site bookings, which never touch modified_at
+    return make_etag(
+        request,
+        date.today(),
+        *table_version(Movie.objects.all()),
+        *booking_version(TicketBooking.objects.all()),
+    )
+
+
+def comedy_shows_etag(request):
+    return make_etag(
+        request,
+        date.today(),
+        *table_version(ComedyShow.objects.all()),
+        *booking_version(BookingComedyShow.objects.all()),
+    )
+
+
+def movie_screen_etag(request):
+    return make_etag(
+        request,
+        *table_version(MovieScreen.objects.all()),
+        *table_version(Movie.objects.all()),
+    )
@@ -0,0 +1,328 @@
+# admin_panel/facets.py
+"""
+In-memory faceted filtering for the catalog pages.
+
+Each catalog (movies, comedy shows, events, concerts, parks) is loaded once
+with a single values_list() query. Every row gets a bit position, and for
+each facet value the index keeps a Python int with the bits of the rows
+having that value. Filtering is OR within a facet and AND across facets;
+the count shown next to a facet value is the popcount of its bitmap ANDed
+with the selections on every *other* facet, so ticking a value never hides
+its siblings. No GROUP BY is run per facet.
+
+Saves and deletes of a catalog row patch its bits in place (see signals.py)
+and bump a version in the default cache; other processes notice the new
+version and reload on their next request. Writes that bypass signals
+(.update(), the public site, a cache flush losing the version) are caught
+by comparing the table's max modified_at and row count with the ones seen
+at load, at most every WATERMARK_INTERVAL seconds per process. The index
+also reloads when the day changes, since the 'when' facet is relative to
+today.
+"""
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+from django.contrib import admin
+from django.core.cache import cache
+from django.utils import timezone
+
+from .conditional import table_version
+from .models import Movie, ComedyShow, Event, LiveConcert, AmusementPark
+
+VERSION_KEY = 'facets:{}:version'
+# Seconds between checks of a catalog table's modified_at/row-count watermark
+WATERMARK_INTERVAL = 10
+
+
+def _plain(value):
+    if isinstance(value, bool):
+        return 'Yes' if value else 'No'
+    return str(value).strip() if value not in (None, '') else ''
+
+
+def _month(value):
+    return value.strftime('%Y-%m') if value else ''
+
+
+def _when(value):
+    if not value:
+        return ''
+    return 'Upcoming' if value >= timezone.localdate() else 'Past'
+
+
+@dataclass(frozen=True)
+class Facet:
+    name: str
+    label: str
+    field: str
+    key: Callable = _plain
+
+
+DATE_FACETS = (
+    Facet('when', 'When', 'date', _when),
+    Facet('month', 'Month', 'date', _month),
+    Facet('location', 'Location', 'location'),
+)
+
+
+class FacetIndex:
+    """Value -> row bitmap per facet for one catalog model"""
+
+    def __init__(self, name, model, facets):
+        self.name = name
+        self.model = model
+        self.facets = {facet.name: facet for facet in facets}
+        self.fields = list(dict.fromkeys(facet.field for facet in facets))
+        self._lock = threading.RLock()
+        self._reset()
+        self._version = None
+        self._built_on = None
+        self._watermark = None
+        self._checked_at = 0.0
+
+    def _reset(self):
+        self._pks = []
+        self._positions = {}
+        self._keys = []
+        self._live = 0
+        self._bitmaps = {name: {} for name in self.facets}
+
+    # ----- loading and maintenance -----
+
+    def _shared_version(self):
+        return cache.get(VERSION_KEY.format(self.name), 0)
+
+    def _bump_version(self):
+        try:
+            return cache.incr(VERSION_KEY.format(self.name))
+        except ValueError:
+            cache.set(VERSION_KEY.format(self.name), 1, timeout=None)
+            return 1
+
+    def _table_watermark(self):
+        return table_version(self.model.objects.all())
+
+    def _watermark_moved(self):
+        if time.monotonic() - self._checked_at < WATERMARK_INTERVAL:
+            return False
+        self._checked_at = time.monotonic()
+        return self._table_watermark() != self._watermark
+
+    def _stale(self, version):
+        return version != self._version or self._built_on != timezone.localdate()
+
+    def ensure_current(self):
+        version = self._shared_version()
+        # Only the request that finds the watermark moved sees it, so it is not re-checked under the lock
+        moved = not self._stale(version) and self._watermark_moved()
+        if moved or self._stale(version):
+            with self._lock:
+                if moved or self._stale(version):
+                    self.rebuild(version)
+
+    def rebuild(self, version=None):
+        with self._lock:
+            self._reset()
+            # Read before the rows, so a write during the load shows up at the next check
+            self._watermark = self._table_watermark()
+            self._checked_at = time.monotonic()
+            for row in self.model.objects.order_by('pk').values_list('pk', *self.fields).iterator():
+                self._insert(row[0], dict(zip(self.fields, row[1:])))
+            self._version = self._shared_version() if version is None else version
+            self._built_on = timezone.localdate()
+
+    def _row_keys(self, values):
+        return tuple(facet.key(values[facet.field]) for facet in self.facets.values())
+
+    def _insert(self, pk, values):
+        position = len(self._pks)
+        self._pks.append(pk)
+        self._positions[pk] = position
+        keys = self._row_keys(values)
+        self._keys.append(keys)
+        self._set_bits(position, keys)
+
+    def _set_bits(self, position, keys):
+        bit = 1 << position
+        self._live |= bit
+        for name, key in zip(self.facets, keys):
+            bitmaps = self._bitmaps[name]
+            bitmaps[key] = bitmaps.get(key, 0) | bit
+
+    def _clear_bits(self, position):
+        bit = 1 << position
+        self._live &= ~bit
+        for name, key in zip(self.facets, self._keys[position]):
+            bitmaps = self._bitmaps[name]
+            remaining = bitmaps.get(key, 0) & ~bit
+            if remaining:
+                bitmaps[key] = remaining
+            else:
+                bitmaps.pop(key, None)
+
+    def _note_change(self):
+        version = self._bump_version()
+        # Only still current if nobody else changed the catalog since our last load
+        if self._version == version - 1:
+            self._version = version
+            # Our own write moved the watermark; don't reload for it
+            self._watermark = self._table_watermark()
+        else:
+            self._version = -1
+
+    def saved(self, pk):
+        """Patch one row's bits after a save"""
+        # Re-read rather than trust the instance: views assign dates as strings
+        values = self.model.objects.filter(pk=pk).values(*self.fields).first()
+        if values is None:
+            return self.deleted(pk)
+        with self._lock:
+            if self._version is not None:
+                position = self._positions.get(pk)
+                if position is None:
+                    self._insert(pk, values)
+                else:
+                    self._clear_bits(position)
+                    self._keys[position] = self._row_keys(values)
+                    self._set_bits(position, self._keys[position])
+            self._note_change()
+
+    def deleted(self, pk):
+        """Drop one row after a delete; its position stays unused until the next rebuild"""
+        with self._lock:
+            position = self._positions.pop(pk, None)
+            if position is not None:
+                self._clear_bits(position)
+            self._note_change()
+
+    def invalidate(self):
+        """After bulk_create() or update(), which send no signals: every process reloads"""
+        with self._lock:
+            self._bump_version()
+            self._version = -1
+
+    # ----- querying -----
+
+    def parse(self, query):
+        """Selected values per facet from a QueryDict (?genre=Drama&genre=Action&when=Upcoming)"""
+        return {name: query.getlist(name) for name in self.facets if query.getlist(name)}
+
+    def _match(self, name, values):
+        bitmaps = self._bitmaps[name]
+        mask = 0
+        for value in values:
+            mask |= bitmaps.get(value, 0)
+        return mask
+
+    def search(self, selected):
+        """
+        Filter by ``{facet: [values]}``.
+
+        Returns ``(pks, facets)``: pks is None when nothing is selected
+        (everything matches), otherwise the matching primary keys; facets is
+        a list of ``{'name', 'label', 'active', 'values': [{'value', 'count', 'selected'}]}``.
+        """
+        self.ensure_current()
+        with self._lock:
+            masks = {name: self._match(name, values) for name, values in selected.items() if name in self.facets}
+            matched = self._live
+            for mask in masks.values():
+                matched &= mask
+
+            facets = []
+            for name, facet in self.facets.items():
+                others = self._live
+                for other, mask in masks.items():
+                    if other != name:
+                        others &= mask
+                chosen = set(selected.get(name, ()))
+                values = [
+                    {'value': value, 'count': (bitmap & others).bit_count(), 'selected': value in chosen}
+                    for value, bitmap in sorted(self._bitmaps[name].items(), reverse=facet.key is _month)
+                    if value
+                ]
+                facets.append({'name': name, 'label': facet.label, 'values': values, 'active': bool(chosen)})
+
+            if not masks:
+                return None, facets
+            pks = [self._pks[position] for position in _positions(matched)]
+        return pks, facets
+
+    def filter(self, queryset, selected):
+        """Apply a selection to a queryset of this model; returns (queryset, facets)"""
+        pks, facets = self.search(selected)
+        if pks is not None:
+            queryset = queryset.filter(pk__in=pks)
+        return queryset, facets
+
+    def count(self, name, value, selected=None):
+        """Rows with ``value`` for facet ``name`` among those matching the other selections"""
+        self.ensure_current()
+        with self._lock:
+            mask = self._live
+            for other, values in (selected or {}).items():
+                if other != name and other in self.facets:
+                    mask &= self._match(other, values)
+            return (self._bitmaps[name].get(value, 0) & mask).bit_count()
+
+    def values(self, name):
+        self.ensure_current()
+        return sorted(value for value in self._bitmaps[name] if value)
+
+
+def _positions(bitmap):
+    while bitmap:
+        low = bitmap & -bitmap
+        yield low.bit_length() - 1
+        bitmap ^= low
+
+
+INDEXES = {
+    'movies': FacetIndex('movies', Movie, (
+        Facet('language', 'Language', 'language'),
+        Facet('genre', 'Genre', 'genre'),
+        Facet('popularity', 'Popularity', 'popularity'),
+        *DATE_FACETS,
+    )),
+    'comedy': FacetIndex('comedy', ComedyShow, (
+        Facet('comedy_type', 'Type', 'comedy_type'),
+        Facet('popularity', 'Popularity', 'popularity'),
+        *DATE_FACETS,
+    )),
+    'events': FacetIndex('events', Event, DATE_FACETS),
+    'concerts': FacetIndex('concerts', LiveConcert, (
+        Facet('music_genre', 'Genre', 'music_genre'),
+        *DATE_FACETS,
+    )),
+    'parks': FacetIndex('parks', AmusementPark, (
+        Facet('family_friendly', 'Family friendly', 'family_friendly'),
+        *DATE_FACETS,
+    )),
+}
+INDEXES_BY_MODEL = {index.model: index for index in INDEXES.values()}
+
+
+def facet_list_filter(index_name, facet_name):
+    """Admin list filter for one facet, with counts that respect the other facet filters"""
+    index = INDEXES[index_name]
+    facet = index.facets[facet_name]
+
+    class FacetListFilter(admin.SimpleListFilter):
+        title = facet.label.lower()
+        parameter_name = facet_name
+
+        def lookups(self, request, model_admin):
+            selected = {name: [request.GET[name]] for name in index.facets if request.GET.get(name)}
+            _, facets = index.search(selected)
+            values = next(entry['values'] for entry in facets if entry['name'] == facet_name)
+            return [(option['value'], f"{option['value']} ({option['count']})") for option in values]
+
+        def queryset(self, request, queryset):
+            if not self.value():
+                return queryset
+            pks, _ = index.search({facet_name: [self.value()]})
+            return queryset.filter(pk__in=pks)
+
+    return FacetListFilter
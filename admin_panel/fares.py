@@ -0,0 +1,116 @@
+# admin_panel/fares.py
+"""
+Precomputed fare table for LiveConcert ticket tiers.
+
+Each concert gets one ConcertFare row per tier holding the final
+customer-facing breakdown (base price, GST, flat fees, total). Rows are
+rebuilt only when a concert's price or fee fields change (see signals.py,
+and bulk_update_fees() behind `manage.py update_concert_fees`). The
+concert changelist and the concert_fares report read them straight from
+the table, one query per page, so every worker sees the same rows the
+moment a rebuild commits. Reads never write; a concert with no rows yet
+has its breakdown computed in memory until the next rebuild.
+"""
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import LiveConcert, ConcertFare
+
+# Tier code -> LiveConcert price field
+TIER_PRICE_FIELDS = {
+    'vvip': 'vvip_ticket_price',
+    'vip': 'vip_ticket_price',
+    'couples': 'couples_ticket_price',
+    'normal': 'normal_ticket_price',
+}
+FEE_FIELDS = ('gst_percentage', 'province_fee', 'convenience_fee', 'charity_fee')
+
+# Any change to these fields invalidates a concert's fare rows
+FARE_FIELDS = tuple(TIER_PRICE_FIELDS.values()) + FEE_FIELDS
+
+CENT = Decimal('0.01')
+
+
+def _money(value):
+    return Decimal(value or 0).quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def compute_fares(values):
+    """Build the per-tier breakdown from a dict of LiveConcert field values"""
+    gst_rate = Decimal(values['gst_percentage'] or 0) / Decimal(100)
+    total_fees = _money(
+        Decimal(values['province_fee'] or 0)
+        + Decimal(values['convenience_fee'] or 0)
+        + Decimal(values['charity_fee'] or 0)
+    )
+
+    fares = []
+    for tier, field in TIER_PRICE_FIELDS.items():
+        base_price = _money(values[field])
+        gst_amount = _money(base_price * gst_rate)
+        fares.append({
+            'tier': tier,
+            'base_price': base_price,
+            'gst_amount': gst_amount,
+            'total_fees': total_fees,
+            'total_amount': base_price + gst_amount + total_fees,
+        })
+    return fares
+
+
+def rebuild_fares(concert_ids):
+    """Recompute fare rows for many concerts with one read, one delete and one insert"""
+    concert_ids = list(concert_ids)
+    if not concert_ids:
+        return {}
+
+    rows = LiveConcert.objects.filter(pk__in=concert_ids).values('pk', *FARE_FIELDS)
+
+    table = {}
+    fare_objects = []
+    for values in rows:
+        fares = compute_fares(values)
+        table[values['pk']] = fares
+        fare_objects.extend(
+            ConcertFare(concert_id=values['pk'], **fare) for fare in fares
+        )
+
+    with transaction.atomic():
+        ConcertFare.objects.filter(concert_id__in=concert_ids).delete()
+        ConcertFare.objects.bulk_create(fare_objects, batch_size=1000)
+    return table
+
+
+def bulk_update_fees(queryset, **changes):
+    """Apply the same price/fee change to many concerts and recompute their fares set-wise"""
+    unknown = set(changes) - set(FARE_FIELDS)
+    if unknown:
+        raise ValueError(f"Not a fare field: {', '.join(sorted(unknown))}")
+
+    with transaction.atomic():
+        concert_ids = list(queryset.values_list('pk', flat=True))
+        # update() skips auto_now, so bump modified_at explicitly
+        LiveConcert.objects.filter(pk__in=concert_ids).update(modified_at=timezone.now(), **changes)
+        rebuild_fares(concert_ids)
+    return len(concert_ids)
+
+
+def get_fare_table(concert_ids):
+    """Return {concert_id: [tier breakdowns]} from the fare table"""
+    concert_ids = list(concert_ids)
+    rows = ConcertFare.objects.filter(concert_id__in=concert_ids).values(
+        'concert_id', 'tier', 'base_price', 'gst_amount', 'total_fees', 'total_amount'
+    ).order_by('concert_id', 'id')
+    table = {}
+    for row in rows:
+        table.setdefault(row.pop('concert_id'), []).append(row)
+
+    # Concerts created before the fare table existed: compute, but leave the
+    # write to the next rebuild so a read never turns into a delete + insert
+    unbuilt = [pk for pk in concert_ids if pk not in table]
+    if unbuilt:
+        for values in LiveConcert.objects.filter(pk__in=unbuilt).values('pk', *FARE_FIELDS):
+            table[values['pk']] = compute_fares(values)
+    return table
@@ -0,0 +1,159 @@
+# admin_panel/histogram.py
+"""
+Bookings, tickets and revenue per time bucket over any date range.
+
+Each booking table is read with a single GROUP BY on a truncated booking
+date, so a range costs one query per vertical (two once the vertical has an
+archive table) however many buckets it has.
+Buckets with no bookings are filled in here rather than in SQL. Results are
+cached per (vertical, granularity, start, end): ranges that lie entirely in
+the past cannot change and are kept for a day, ranges that include today
+only for a minute.
+"""
+from datetime import datetime, time, timedelta
+
+from django.core.cache import cache
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncHour, TruncDay, TruncWeek, TruncMonth
+from django.utils import timezone
+
+from . import archive
+from .bookings import BOOKING_SOURCES, get_source
+
+GRANULARITIES = {
+    'hour': TruncHour,
+    'day': TruncDay,
+    'week': TruncWeek,
+    'month': TruncMonth,
+}
+# Guard against e.g. a year of hourly buckets
+MAX_BUCKETS = 2000
+CACHE_KEY = 'histogram:{}:{}:{}:{}'
+PAST_TIMEOUT = 24 * 60 * 60
+CURRENT_TIMEOUT = 60
+
+
+def _floor(moment, granularity):
+    if granularity == 'hour':
+        return moment.replace(minute=0, second=0, microsecond=0)
+    moment = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    if granularity == 'week':
+        return moment - timedelta(days=moment.weekday())
+    if granularity == 'month':
+        return moment.replace(day=1)
+    return moment
+
+
+def _next(moment, granularity):
+    if granularity == 'hour':
+        return moment + timedelta(hours=1)
+    if granularity == 'day':
+        return moment + timedelta(days=1)
+    if granularity == 'week':
+        return moment + timedelta(weeks=1)
+    return (moment.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def bucket_starts(start, end, granularity):
+    """Naive local bucket starts covering the dates start..end inclusive"""
+    moment = _floor(datetime.combine(start, time.min), granularity)
+    stop = datetime.combine(end + timedelta(days=1), time.min)
+    buckets = []
+    while moment < stop:
+        buckets.append(moment)
+        moment = _next(moment, granularity)
+    return buckets
+
+
+def bucket_count(start, end, granularity):
+    """Number of buckets bucket_starts() would return, without building them"""
+    if granularity == 'month':
+        return (end.year - start.year) * 12 + end.month - start.month + 1
+    if granularity == 'week':
+        return (end.toordinal() - start.toordinal() + start.weekday()) // 7 + 1
+    days = end.toordinal() - start.toordinal() + 1
+    return days * 24 if granularity == 'hour' else days
+
+
+def validate(start, end, granularity):
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Unknown granularity: {granularity}")
+    if start is None or end is None or start > end:
+        raise ValueError("start and end dates are required and start must not be after end")
+    if bucket_count(start, end, granularity) > MAX_BUCKETS:
+        raise ValueError(f"Too many {granularity} buckets; choose a coarser granularity")
+    try:
+        # Cheap now the count is bounded; the last bucket's end may not exist near date.max
+        bucket_starts(start, end, granularity)
+    except OverflowError:
+        raise ValueError("Dates are out of range")
+
+
+def _query(source, start, end, granularity):
+    """{naive local bucket start: (bookings, tickets, revenue)} from one GROUP BY per table"""
+    aggregates = {'bookings': Count('pk'), 'revenue': Sum(source.amount_field)}
+    if source.tickets_field:
+        aggregates['tickets'] = Sum(source.tickets_field)
+    found = {}
+    # Archived bookings are added in, so ranges before the archive horizon keep their counts
+    for queryset in archive.with_archive(source.model, **{
+        f'{source.date_field}__gte': timezone.make_aware(datetime.combine(start, time.min)),
+        f'{source.date_field}__lt': timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min)),
+    }):
+        rows = (queryset
+                .annotate(bucket=GRANULARITIES[granularity](source.date_field))
+                .values('bucket')
+                .annotate(**aggregates)
+                .order_by('bucket'))
+        for row in rows:
+            bucket = row['bucket']
+            if timezone.is_aware(bucket):
+                bucket = timezone.make_naive(bucket)
+            bucket = _floor(bucket, granularity)
+            # Bookings without a ticket count are one ticket each
+            tickets = (row['tickets'] or 0) if source.tickets_field else row['bookings']
+            bookings, sold, revenue = found.get(bucket, (0, 0, 0.0))
+            found[bucket] = (bookings + row['bookings'], sold + tickets, revenue + float(row['revenue'] or 0))
+    return found
+
+
+def vertical_series(vertical, start, end, granularity):
+    """One vertical's series over the filled bucket list, cached"""
+    key = CACHE_KEY.format(vertical, granularity, start.isoformat(), end.isoformat())
+    series = cache.get(key)
+    if series is not None:
+        return series
+
+    found = _query(get_source(vertical), start, end, granularity)
+    empty = (0, 0, 0.0)
+    values = [found.get(bucket, empty) for bucket in bucket_starts(start, end, granularity)]
+    series = {
+        'bookings': [value[0] for value in values],
+        'tickets': [value[1] for value in values],
+        'revenue': [round(value[2], 2) for value in values],
+    }
+    timeout = PAST_TIMEOUT if end < timezone.localdate() else CURRENT_TIMEOUT
+    cache.set(key, series, timeout=timeout)
+    return series
+
+
+def booking_histogram(start, end, granularity='day', verticals=None):
+    """Per-bucket bookings/tickets/revenue for each vertical plus an all-verticals total"""
+    validate(start, end, granularity)
+    verticals = verticals or [source.vertical for source in BOOKING_SOURCES]
+    buckets = bucket_starts(start, end, granularity)
+
+    series = {vertical: vertical_series(vertical, start, end, granularity) for vertical in verticals}
+    total = {
+        metric: [sum(values[metric][i] for values in series.values()) for i in range(len(buckets))]
+        for metric in ('bookings', 'tickets', 'revenue')
+    }
+    total['revenue'] = [round(value, 2) for value in total['revenue']]
+    return {
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'granularity': granularity,
+        'buckets': [bucket.isoformat() for bucket in buckets],
+        'series': series,
+        'total': total,
+    }
@@ -0,0 +1,256 @@
+# admin_panel/index_advisor.py
+"""
+Index advisor for the unmanaged booking tables.
+
+Django never migrates the managed=False tables, so nobody owns their
+indexes. The advisor takes SQL statements the admin really issues
+(captured by crawling the admin pages, or read from a query log), groups
+them by shape, runs EXPLAIN on one example of each shape and proposes
+composite indexes: equality columns first, then one range or ORDER BY
+column, then any aggregated columns to make the index covering.
+
+Benefit is estimated as rows examined today divided by rows the index
+would leave to read, using per-column distinct counts.
+"""
+import re
+from dataclasses import dataclass, field
+
+from django.db import connection
+
+from .bookings import BOOKING_SOURCES
+from .models import User
+
+# Tables this admin reads but never migrates
+UNMANAGED_TABLES = {source.table for source in BOOKING_SOURCES} | {
+    User._meta.db_table, 'eventapp_amusementbookingitem',
+}
+
+# Classic optimizer guess for how much of a table a range predicate keeps
+RANGE_SELECTIVITY = 0.3
+
+_STRING = re.compile(r"'(?:[^'\\]|\\.)*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+# Literal lists (already turned into ?) and Django's %s placeholder lists alike
+_IN_LIST = re.compile(r"\bIN\s*\((?:\s*(?:\?|%s)\s*,?)+\)", re.IGNORECASE)
+_SPACE = re.compile(r"\s+")
+
+_COLUMN = r"[`\"]?(\w+)[`\"]?\.[`\"]?(\w+)[`\"]?"
+_EQUALITY = re.compile(_COLUMN + r"\s*(?:=|<=>|\bIN\b|\bIS\b)", re.IGNORECASE)
+_RANGE = re.compile(_COLUMN + r"\s*(?:>=|<=|<(?!=)|>(?!=)|\bBETWEEN\b|\bLIKE\b)", re.IGNORECASE)
+_ORDER_BY = re.compile(r"\bORDER BY\b(.*?)(?:\bLIMIT\b|$)", re.IGNORECASE | re.DOTALL)
+_WHERE = re.compile(r"\bWHERE\b(.*?)(?:\bGROUP BY\b|\bORDER BY\b|\bLIMIT\b|$)", re.IGNORECASE | re.DOTALL)
+_AGGREGATE = re.compile(r"\b(?:SUM|AVG|MIN|MAX)\(\s*" + _COLUMN + r"\s*\)", re.IGNORECASE)
+_FROM = re.compile(r"\bFROM\s+[`\"]?(\w+)[`\"]?", re.IGNORECASE)
+
+
+def fingerprint(sql):
+    """Normalize a statement so executions differing only in literals group together"""
+    sql = _STRING.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = _IN_LIST.sub('IN (...)', sql)
+    return _SPACE.sub(' ', sql).strip()
+
+
+@dataclass
+class QueryShape:
+    fingerprint: str
+    example: str
+    table: str
+    count: int = 0
+    equality: list = field(default_factory=list)
+    ranges: list = field(default_factory=list)
+    order_by: list = field(default_factory=list)
+    aggregated: list = field(default_factory=list)
+
+    def candidate_columns(self):
+        columns = list(dict.fromkeys(self.equality))
+        tail = self.ranges[:1] or self.order_by
+        for column in tail:
+            if column not in columns:
+                columns.append(column)
+        return columns
+
+
+@dataclass
+class Recommendation:
+    table: str
+    columns: list
+    covering: list
+    rows_examined: int
+    rows_after: int
+    shapes: list
+    plan: str = ''
+
+    @property
+    def benefit(self):
+        return self.rows_examined / max(self.rows_after, 1)
+
+    @property
+    def name(self):
+        return f"idx_{self.table}_{'_'.join(self.columns + self.covering)}"[:64]
+
+    def ddl(self):
+        quote = connection.ops.quote_name
+        columns = ', '.join(quote(column) for column in self.columns + self.covering)
+        return f"CREATE INDEX {quote(self.name)} ON {quote(self.table)} ({columns});"
+
+
+def parse_shape(sql):
+    """Return a QueryShape for a SELECT that reads an unmanaged table, else None"""
+    if not sql.lstrip().upper().startswith('SELECT'):
+        return None
+    match = _FROM.search(sql)
+    if not match or match.group(1) not in UNMANAGED_TABLES:
+        return None
+    table = match.group(1)
+
+    shape = QueryShape(fingerprint=fingerprint(sql), example=sql, table=table)
+    where = _WHERE.search(sql)
+    if where:
+        clause = where.group(1)
+        shape.equality = [col for tbl, col in _EQUALITY.findall(clause) if tbl == table]
+        shape.ranges = [col for tbl, col in _RANGE.findall(clause) if tbl == table]
+    order = _ORDER_BY.search(sql)
+    if order:
+        shape.order_by = [col for tbl, col in re.findall(_COLUMN, order.group(1)) if tbl == table]
+    shape.aggregated = [col for tbl, col in _AGGREGATE.findall(sql) if tbl == table]
+    return shape
+
+
+def collect_shapes(statements):
+    shapes = {}
+    for sql in statements:
+        shape = parse_shape(sql)
+        if shape is None:
+            continue
+        existing = shapes.setdefault(shape.fingerprint, shape)
+        existing.count += 1
+    return list(shapes.values())
+
+
+def read_query_log(path):
+    """Yield SQL statements from a plain one-per-line file or a MySQL general log"""
+    with open(path, encoding='utf-8', errors='replace') as log:
+        for line in log:
+            line = line.rstrip('\n')
+            if '\tQuery\t' in line:
+                line = line.split('\tQuery\t', 1)[1]
+            if line.strip():
+                yield line.strip()
+
+
+class IndexAdvisor:
+    """Turns query shapes into index recommendations using EXPLAIN and column statistics"""
+
+    def __init__(self, use_stats=True):
+        self.use_stats = use_stats
+        self._row_counts = {}
+        self._distinct = {}
+        self._indexes = {}
+
+    # ----- database statistics -----
+
+    def table_rows(self, table):
+        if table not in self._row_counts:
+            with connection.cursor() as cursor:
+                cursor.execute(f"SELECT COUNT(*) FROM {connection.ops.quote_name(table)}")
+                self._row_counts[table] = cursor.fetchone()[0]
+        return self._row_counts[table]
+
+    def distinct_values(self, table, column):
+        key = (table, column)
+        if key not in self._distinct:
+            quote = connection.ops.quote_name
+            with connection.cursor() as cursor:
+                cursor.execute(f"SELECT COUNT(DISTINCT {quote(column)}) FROM {quote(table)}")
+                self._distinct[key] = cursor.fetchone()[0] or 1
+        return self._distinct[key]
+
+    def existing_indexes(self, table):
+        """Column lists of every index already on the table"""
+        if table not in self._indexes:
+            with connection.cursor() as cursor:
+                constraints = connection.introspection.get_constraints(cursor, table)
+            self._indexes[table] = [
+                info['columns'] for info in constraints.values()
+                if info.get('index') or info.get('unique') or info.get('primary_key')
+            ]
+        return self._indexes[table]
+
+    def is_covered(self, table, columns):
+        return any(index[:len(columns)] == columns for index in self.existing_indexes(table))
+
+    def explain(self, sql):
+        """Return (rows examined, plan text) for one statement"""
+        prefix = 'EXPLAIN QUERY PLAN ' if connection.vendor == 'sqlite' else 'EXPLAIN '
+        with connection.cursor() as cursor:
+            cursor.execute(prefix + sql)
+            names = [column[0].lower() for column in cursor.description]
+            plan = cursor.fetchall()
+        text = '\n'.join(' | '.join(str(value) for value in row) for row in plan)
+        if 'rows' in names:
+            examined = sum(int(row[names.index('rows')] or 0) for row in plan)
+            return examined, text
+        return None, text
+
+    # ----- recommendations -----
+
+    def estimate_rows(self, table, shape, columns):
+        rows = self.table_rows(table)
+        if not self.use_stats:
+            return rows
+        for column in columns:
+            if column in shape.equality:
+                rows /= self.distinct_values(table, column)
+            elif column in shape.ranges:
+                rows *= RANGE_SELECTIVITY
+        return int(rows)
+
+    def advise(self, shapes):
+        recommendations = {}
+        for shape in shapes:
+            columns = shape.candidate_columns()
+            if not columns or self.is_covered(shape.table, columns):
+                continue
+            # Aggregated columns ride along so SUM()/COUNT pages never touch the table rows
+            covering = [col for col in shape.aggregated if col not in columns]
+
+            examined, plan = self.explain(shape.example)
+            if examined is None:
+                examined = self.table_rows(shape.table)
+            rows_after = self.estimate_rows(shape.table, shape, columns)
+            if examined <= rows_after:
+                continue
+
+            key = (shape.table, tuple(columns))
+            recommendation = recommendations.get(key)
+            if recommendation is None:
+                recommendations[key] = Recommendation(
+                    table=shape.table, columns=columns, covering=covering,
+                    rows_examined=examined * shape.count, rows_after=rows_after * shape.count,
+                    shapes=[shape], plan=plan,
+                )
+            else:
+                recommendation.rows_examined += examined * shape.count
+                recommendation.rows_after += rows_after * shape.count
+                recommendation.shapes.append(shape)
+                recommendation.covering = list(dict.fromkeys(recommendation.covering + covering))
+
+        return sorted(recommendations.values(), key=lambda r: r.benefit, reverse=True)
+
+
+def render_sql_script(recommendations):
+    lines = [
+        "-- Index recommendations for unmanaged booking tables",
+        "-- Generated by `manage.py advise_indexes`. Review every statement before applying;",
+        "-- Django will not manage or migrate these indexes.",
+        "",
+    ]
+    for recommendation in recommendations:
+        lines.append(
+            f"-- ~{recommendation.benefit:.0f}x fewer rows read for {len(recommendation.shapes)} query shape(s), e.g.:"
+        )
+        lines.append(f"--   {recommendation.shapes[0].fingerprint[:200]}")
+        lines.append(recommendation.ddl())
+        lines.append("")
+    return '\n'.join(lines)
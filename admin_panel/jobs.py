@@ -0,0 +1,121 @@
+# admin_panel/jobs.py
+"""
+Background report jobs.
+
+submit() records a ReportJob and hands its id to a process pool. Workers
+are started with the 'spawn' method and call django.setup() themselves, so
+each has its own database connections and nothing is shared with the web
+process. The rendered result is stored on the job row; a later request for
+the same report, format and parameters (same params_hash) reuses a queued,
+running or still-fresh finished job instead of running the report again.
+"""
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from .models import ReportJob
+from . import reports
+
+logger = logging.getLogger(__name__)
+
+WORKERS = getattr(settings, 'REPORT_WORKERS', 2)
+# A queued/running job older than this was lost (e.g. the server restarted) and is not reused
+STALE_AFTER = timedelta(seconds=getattr(settings, 'REPORT_STALE_SECONDS', 15 * 60))
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _init_worker(settings_module):
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    import django
+    django.setup()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=WORKERS,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(os.environ.get('DJANGO_SETTINGS_MODULE', 'event_admin.settings'),),
+            )
+        return _executor
+
+
+def params_hash(report_name, params, output_format):
+    payload = json.dumps([report_name, output_format, params], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def find_reusable(report, digest):
+    """A finished job within the report's freshness window, or one still queued/running"""
+    now = timezone.now()
+    finished = ReportJob.objects.filter(
+        params_hash=digest, status='done', finished_at__gte=now - timedelta(seconds=report.freshness),
+    ).order_by('-finished_at').first()
+    if finished:
+        return finished
+    return ReportJob.objects.filter(
+        params_hash=digest, status__in=('queued', 'running'), created_at__gte=now - STALE_AFTER,
+    ).order_by('-created_at').first()
+
+
+def submit(report_name, params, output_format='html', requested_by=''):
+    """Return a job for this request: reused if possible, otherwise newly queued"""
+    report = reports.get_report(report_name)
+    if output_format not in reports.FORMATS:
+        raise ValueError(f"Unknown format: {output_format}")
+    params = report.clean_params(params)
+    digest = params_hash(report_name, params, output_format)
+
+    job = find_reusable(report, digest)
+    if job is not None:
+        return job
+
+    job = ReportJob.objects.create(
+        report=report_name, params=params, output_format=output_format,
+        params_hash=digest, requested_by=requested_by,
+    )
+    # The worker reads the row over its own connection, so it must be committed first
+    transaction.on_commit(lambda: _get_executor().submit(run_job, job.pk).add_done_callback(_log_crash))
+    return job
+
+
+def _log_crash(future):
+    # run_job records its own failures; this only catches a worker that died outright
+    error = future.exception()
+    if error is not None:
+        logger.error("Report worker crashed: %s", error)
+
+
+def run_job(job_id):
+    """Worker entry point: run one job and store its rendered result"""
+    close_old_connections()
+    updated = ReportJob.objects.filter(pk=job_id, status='queued').update(
+        status='running', started_at=timezone.now(),
+    )
+    if not updated:
+        return
+    job = ReportJob.objects.get(pk=job_id)
+    try:
+        data = reports.get_report(job.report).build(job.params)
+        job.result = reports.render_result(data, job.output_format)
+        job.status = 'done'
+    except Exception as e:
+        logger.exception("Report job %s failed", job_id)
+        job.error = str(e)
+        job.status = 'failed'
+    job.finished_at = timezone.now()
+    job.save(update_fields=['result', 'error', 'status', 'finished_at'])
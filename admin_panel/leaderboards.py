@@ -0,0 +1,255 @@
+# admin_panel/leaderboards.py
+"""
+Best-sellers per vertical over rolling windows (today, 7 days, 30 days).
+
+Tickets sold are counted per (board, day) in Space-Saving sketches: each
+sketch monitors at most ``capacity`` items, and a new item arriving at a
+full sketch replaces the smallest counter and inherits its count as the
+error bound. Memory is therefore bounded however many items are sold, and
+any item selling more than 1/capacity of a day's tickets is guaranteed to
+be kept.
+
+Only paid, non-cancelled bookings count. The sketches are filled once by
+rebuild() (one GROUP BY per booking table over the longest window) and then
+kept current from change-capture records: inserts add their tickets, and
+updates that pay for, cancel or otherwise move a booking add or subtract
+the difference. An update whose earlier state is unknown (found by the
+capture's sweep) makes the next request rebuild. The merged, named top-N list for a (board, window) is computed
+when first asked for after a change and served from memory until the next
+one, so a dashboard view costs a dictionary lookup.
+"""
+import threading
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db.models import Count, Max, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from . import archive
+from .bookings import get_source, is_sold, sold_filter
+from .changefeed import capture, INSERT, UPDATE
+
+WINDOWS = {'today': 1, 'week': 7, 'month': 30}
+CAPACITY = getattr(settings, 'LEADERBOARD_CAPACITY', 200)
+DEFAULT_SIZE = 5
+
+
+@dataclass(frozen=True)
+class Board:
+    name: str
+    title: str
+    vertical: str
+    # Field on the booked item shown as the name; items sharing it are summed
+    label_field: str
+
+    @property
+    def source(self):
+        return get_source(self.vertical)
+
+    @property
+    def item_model(self):
+        return self.source.model._meta.get_field(self.source.item_field).related_model
+
+
+BOARDS = {
+    'events': Board('events', 'Events', 'events', 'name'),
+    'movies': Board('movies', 'Movies', 'movies', 'title'),
+    'comedians': Board('comedians', 'Comedians', 'comedy', 'comedian_name'),
+    'artists': Board('artists', 'Concert Artists', 'concerts', 'artist_name'),
+}
+
+
+class SpaceSaving:
+    """Bounded weighted heavy-hitters counter"""
+
+    def __init__(self, capacity=CAPACITY):
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+
+    def __len__(self):
+        return len(self.counts)
+
+    def add(self, key, weight=1):
+        if key in self.counts:
+            self.counts[key] += weight
+            return
+        if len(self.counts) < self.capacity:
+            self.counts[key] = weight
+            self.errors[key] = 0
+            return
+        # Linear scan for the minimum: evictions only happen once a day has more items than capacity
+        victim = min(self.counts, key=self.counts.get)
+        floor = self.counts.pop(victim)
+        del self.errors[victim]
+        self.counts[key] = floor + weight
+        self.errors[key] = floor
+
+    def subtract(self, key, weight):
+        # An evicted item's tickets are only in the error bound of whatever replaced it
+        if key in self.counts:
+            self.counts[key] = max(self.counts[key] - weight, 0)
+
+
+def _day(value):
+    if isinstance(value, datetime):
+        if timezone.is_aware(value):
+            value = timezone.localtime(value)
+        value = value.date()
+    return value
+
+
+class Leaderboards:
+    """Per-board, per-day sketches and the memoized top lists built from them"""
+
+    def __init__(self, boards=BOARDS, capacity=CAPACITY):
+        self.boards = boards
+        self.capacity = capacity
+        self._lock = threading.RLock()
+        self._days = {name: {} for name in boards}
+        self._tops = {}
+        self._labels = {name: {} for name in boards}
+        # Highest pk per vertical included by the last rebuild; older inserts are already counted
+        self._rebuilt_through = {}
+        self.rebuilt_at = None
+        self._stale = False
+        self._unsubscribe = None
+
+    # ----- loading -----
+
+    def ensure_loaded(self):
+        if self._unsubscribe is None:
+            with self._lock:
+                if self._unsubscribe is None:
+                    self._unsubscribe = capture.subscribe(
+                        self.apply_changes, verticals=[board.vertical for board in self.boards.values()],
+                        kinds=[INSERT, UPDATE],
+                    )
+        capture.start()
+        if self.rebuilt_at is None or self._stale:
+            self.rebuild()
+
+    def rebuild(self):
+        """Recount every board from the booking tables"""
+        first_day = timezone.localdate() - timedelta(days=max(WINDOWS.values()) - 1)
+        since = timezone.make_aware(datetime.combine(first_day, time.min))
+        with self._lock:
+            for name, board in self.boards.items():
+                source = board.source
+                through = source.model.objects.aggregate(top=Max('pk'))['top'] or 0
+                weight = Sum(source.tickets_field) if source.tickets_field else Count('pk')
+                days = {}
+                # The archive only matters when its horizon is shorter than the longest window
+                for queryset in archive.with_archive(source.model, **{f'{source.date_field}__gte': since,
+                                                                      'pk__lte': through}):
+                    rows = (queryset
+                            .filter(sold_filter(source))
+                            .annotate(day=TruncDate(source.date_field))
+                            .values('day', source.item_id_field)
+                            .annotate(weight=weight)
+                            .values_list('day', source.item_id_field, 'weight'))
+                    for day, item_id, sold in rows:
+                        if item_id is None:
+                            continue
+                        days.setdefault(day, SpaceSaving(self.capacity)).add(item_id, sold or 0)
+                self._days[name] = days
+                self._rebuilt_through[source.vertical] = through
+            self._tops.clear()
+            self._labels = {name: {} for name in self.boards}
+            self.rebuilt_at = timezone.now()
+            self._stale = False
+
+    def apply_changes(self, changes):
+        """Count new sales and take back cancelled ones; runs on the change capture thread"""
+        oldest = timezone.localdate() - timedelta(days=max(WINDOWS.values()) - 1)
+        with self._lock:
+            for change in changes:
+                if change.kind == INSERT:
+                    if change.pk <= self._rebuilt_through.get(change.vertical, 0):
+                        continue
+                    self._count(change, change.row, 1)
+                elif change.previous is None:
+                    # A sweep found it: whether it was counted before is unknown
+                    day = _day(change.row.get(change.source.date_field))
+                    if day is not None and day >= oldest:
+                        self._stale = True
+                else:
+                    self._count(change, change.previous, -1)
+                    self._count(change, change.row, 1)
+
+    def _count(self, change, row, sign):
+        """Add (sign 1) or take back (sign -1) one booking state's tickets"""
+        source = change.source
+        item_id = row.get(source.item_id_field)
+        day = _day(row.get(source.date_field))
+        if item_id is None or day is None or not is_sold(source, row):
+            return
+        weight = (row.get(source.tickets_field) or 0) if source.tickets_field else 1
+        for name, board in self.boards.items():
+            if board.vertical == change.vertical:
+                sketch = self._days[name].setdefault(day, SpaceSaving(self.capacity))
+                if sign > 0:
+                    sketch.add(item_id, weight)
+                else:
+                    sketch.subtract(item_id, weight)
+                self._tops = {key: top for key, top in self._tops.items() if key[0] != name}
+
+    # ----- serving -----
+
+    def top(self, board_name, window='week', size=DEFAULT_SIZE):
+        """[{'name', 'tickets', 'error'}] best-first for one board and window"""
+        if board_name not in self.boards:
+            raise ValueError(f"Unknown leaderboard: {board_name}")
+        if window not in WINDOWS:
+            raise ValueError(f"Unknown window: {window}")
+        self.ensure_loaded()
+        today = timezone.localdate()
+        key = (board_name, window, size, today)
+        top = self._tops.get(key)
+        if top is None:
+            with self._lock:
+                top = self._tops[key] = self._compute(board_name, window, size, today)
+        return top
+
+    def tops(self, window='week', size=DEFAULT_SIZE):
+        return [
+            {'board': name, 'title': board.title, 'rows': self.top(name, window, size)}
+            for name, board in self.boards.items()
+        ]
+
+    def _compute(self, board_name, window, size, today):
+        first_day = today - timedelta(days=WINDOWS[window] - 1)
+        days = self._days[board_name]
+        # Days that have left the longest window are dropped for good
+        oldest = today - timedelta(days=max(WINDOWS.values()) - 1)
+        for day in [day for day in days if day < oldest]:
+            del days[day]
+
+        counts, errors = {}, {}
+        for day, sketch in days.items():
+            if first_day <= day <= today:
+                for item_id, count in sketch.counts.items():
+                    counts[item_id] = counts.get(item_id, 0) + count
+                    errors[item_id] = errors.get(item_id, 0) + sketch.errors[item_id]
+
+        labels = self._item_labels(board_name, counts)
+        grouped = {}
+        for item_id, count in counts.items():
+            entry = grouped.setdefault(labels.get(item_id) or f"#{item_id}", [0, 0])
+            entry[0] += count
+            entry[1] += errors[item_id]
+        ranked = sorted(grouped.items(), key=lambda entry: entry[1][0], reverse=True)[:size]
+        return [{'name': name, 'tickets': count, 'error': error} for name, (count, error) in ranked]
+
+    def _item_labels(self, board_name, item_ids):
+        board = self.boards[board_name]
+        labels = self._labels[board_name]
+        missing = [item_id for item_id in item_ids if item_id not in labels]
+        if missing:
+            labels.update(board.item_model.objects.filter(pk__in=missing).values_list('pk', board.label_field))
+        return labels
+
+
+leaderboards = Leaderboards()
@@ -0,0 +1,157 @@
+# admin_panel/live_feed.py
+"""
+Live dashboard feed pushed to browsers with Server-Sent Events.
+
+The hub subscribes to the process-wide change capture (changefeed.py),
+turns booking inserts and cancellations into dashboard messages once per
+poll and fans them out to every connected dashboard through per-client
+asyncio queues. The database load stays the same whether one or a hundred
+dashboards are open.
+
+The stream endpoint must be served by an ASGI server, e.g.
+``uvicorn event_admin.asgi:application``. Under WSGI (runserver,
+gunicorn's sync workers) the endpoint answers 400 and the dashboard polls
+the activity and best-seller endpoints instead.
+"""
+import asyncio
+import json
+import threading
+from decimal import Decimal
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .bookings import payment_state
+from .changefeed import capture, INSERT, UPDATE
+
+QUEUE_SIZE = 100
+
+
+def _has_field(model, name):
+    return any(field.name == name for field in model._meta.get_fields())
+
+
+def _row_fields(source):
+    fields = ['pk', source.item_name_path, source.amount_field, source.date_field, 'payment_status']
+    if source.status_field:
+        fields.append(source.status_field)
+    if _has_field(source.model, 'customer_name'):
+        fields.append('customer_name')
+    return fields
+
+
+def booking_message(source, row):
+    """Shape a values() row into the JSON payload the dashboard understands"""
+    return {
+        'vertical': source.vertical,
+        'label': source.label,
+        'id': row['pk'],
+        'item': row.get(source.item_name_path) or '',
+        'customer': row.get('customer_name') or '',
+        'amount': row.get(source.amount_field) or Decimal('0'),
+        'status': row.get(source.status_field) if source.status_field else payment_state(row.get('payment_status')),
+        'date': row.get(source.date_field),
+    }
+
+
+def is_cancellation(change):
+    """A recent booking whose status just became cancelled"""
+    status_field = change.source.status_field
+    return (
+        change.kind == UPDATE
+        and status_field is not None
+        and change.previous is not None
+        and change.row.get(status_field) == 'cancelled'
+        and change.previous.get(status_field) != 'cancelled'
+    )
+
+
+def changes_to_messages(changes):
+    """Build booking, cancellation and stats messages with one lookup query per table"""
+    wanted = {}
+    for change in changes:
+        if change.kind == INSERT:
+            wanted.setdefault(change.source, {})[change.pk] = 'booking'
+        elif is_cancellation(change):
+            wanted.setdefault(change.source, {})[change.pk] = 'cancellation'
+
+    messages = []
+    deltas = {}
+    for source, kinds in wanted.items():
+        rows = source.model.objects.filter(pk__in=kinds).order_by('pk').values(*_row_fields(source))
+        for row in rows:
+            message = booking_message(source, row)
+            kind = kinds[row['pk']]
+            if kind == 'booking':
+                delta = deltas.setdefault(source.vertical, {'bookings': 0, 'revenue': Decimal('0')})
+                delta['bookings'] += 1
+                delta['revenue'] += message['amount']
+            messages.append({'type': kind, 'data': message})
+
+    if deltas:
+        messages.append({'type': 'stats', 'data': {
+            'bookings': sum(delta['bookings'] for delta in deltas.values()),
+            'revenue': sum((delta['revenue'] for delta in deltas.values()), Decimal('0')),
+            'by_vertical': deltas,
+        }})
+    return messages
+
+
+class LiveFeedHub:
+    """Fans change-capture messages out to many SSE clients"""
+
+    def __init__(self, capture=capture):
+        self.capture = capture
+        self._subscribers = {}
+        self._lock = threading.Lock()
+        self._unsubscribe = None
+
+    @property
+    def subscriber_count(self):
+        return len(self._subscribers)
+
+    def subscribe(self):
+        queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        with self._lock:
+            self._subscribers[queue] = asyncio.get_running_loop()
+            if self._unsubscribe is None:
+                self._unsubscribe = self.capture.subscribe(self._on_changes)
+        self.capture.start()
+        return queue
+
+    def unsubscribe(self, queue):
+        with self._lock:
+            self._subscribers.pop(queue, None)
+            if not self._subscribers and self._unsubscribe is not None:
+                self._unsubscribe()
+                self._unsubscribe = None
+
+    def _on_changes(self, changes):
+        # Runs on the change capture thread
+        messages = changes_to_messages(changes)
+        if not messages:
+            return
+        with self._lock:
+            targets = list(self._subscribers.items())
+        for queue, loop in targets:
+            try:
+                loop.call_soon_threadsafe(self._deliver, queue, messages)
+            except RuntimeError:
+                # Event loop already closed; the client is gone
+                self.unsubscribe(queue)
+
+    @staticmethod
+    def _deliver(queue, messages):
+        for message in messages:
+            if queue.full():
+                # A stalled client loses its oldest message rather than blocking everyone
+                queue.get_nowait()
+            queue.put_nowait(message)
+
+
+hub = LiveFeedHub()
+
+
+def format_event(message):
+    """Serialize one hub message as an SSE frame"""
+    data = json.dumps(message['data'], cls=DjangoJSONEncoder)
+    return f"event: {message['type']}\ndata: {data}\n\n"
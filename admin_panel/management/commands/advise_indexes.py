@@ -0,0 +1,96 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse, NoReverseMatch
+
+from admin_panel.bookings import BOOKING_SOURCES
+from admin_panel.index_advisor import (
+    IndexAdvisor, collect_shapes, read_query_log, render_sql_script,
+)
+
+# Pages whose queries hit the booking tables
+CRAWL_URLS = [
+    'admin_dashboard', 'admin_event_bookings', 'event_bookings_list', 'admin_events_list',
+    'movie_bookings_list', 'comedy_bookings', 'event_report', 'analytics_cube',
+]
+
+
+class Command(BaseCommand):
+    help = "Propose indexes for the unmanaged booking tables from the queries the admin issues"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--log', action='append', default=[],
+                            help="Read statements from a query log (one per line or MySQL general log)")
+        parser.add_argument('--crawl', action='store_true',
+                            help="Capture queries by requesting the admin's list pages and booking changelists")
+        parser.add_argument('--user', help="Username to crawl as (defaults to the first superuser)")
+        parser.add_argument('--sql-out', help="Write the proposed DDL to this SQL script for review")
+        parser.add_argument('--no-stats', action='store_true',
+                            help="Skip COUNT(DISTINCT) column statistics when estimating benefit")
+
+    def handle(self, *args, **options):
+        if not options['log'] and not options['crawl']:
+            raise CommandError("Give at least one --log file or --crawl")
+
+        statements = []
+        for path in options['log']:
+            statements.extend(read_query_log(path))
+        if options['crawl']:
+            statements.extend(self.crawl(options['user']))
+
+        shapes = collect_shapes(statements)
+        self.stdout.write(f"{len(statements)} statements, {len(shapes)} query shapes on unmanaged tables")
+
+        recommendations = IndexAdvisor(use_stats=not options['no_stats']).advise(shapes)
+        if not recommendations:
+            self.stdout.write(self.style.SUCCESS("No missing indexes found."))
+            return
+
+        for recommendation in recommendations:
+            columns = ', '.join(recommendation.columns)
+            if recommendation.covering:
+                columns += f" + covering ({', '.join(recommendation.covering)})"
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{recommendation.table} ({columns})"))
+            self.stdout.write(
+                f"  ~{recommendation.benefit:.1f}x fewer rows: {recommendation.rows_examined} -> "
+                f"{recommendation.rows_after} across {len(recommendation.shapes)} shape(s)"
+            )
+            for shape in recommendation.shapes[:3]:
+                self.stdout.write(f"  x{shape.count}  {shape.fingerprint[:160]}")
+            self.stdout.write(f"  {recommendation.ddl()}")
+
+        if options['sql_out']:
+            with open(options['sql_out'], 'w', encoding='utf-8') as script:
+                script.write(render_sql_script(recommendations))
+            self.stdout.write(self.style.SUCCESS(f"DDL written to {options['sql_out']}"))
+
+    def crawl(self, username):
+        User = get_user_model()
+        users = User.objects.filter(username=username) if username else User.objects.filter(is_superuser=True)
+        user = users.first()
+        if user is None:
+            raise CommandError("No user to crawl as; pass --user")
+
+        client = Client(HTTP_HOST='localhost')
+        client.force_login(user)
+
+        paths = []
+        for name in CRAWL_URLS:
+            try:
+                paths.append(reverse(name))
+            except NoReverseMatch:
+                continue
+        for source in BOOKING_SOURCES:
+            opts = source.model._meta
+            changelist = reverse(f'admin:{opts.app_label}_{opts.model_name}_changelist')
+            paths.extend([changelist, changelist + '?o=-1', changelist + '?payment_status__exact=1'])
+
+        statements = []
+        for path in paths:
+            with CaptureQueriesContext(connection) as captured:
+                response = client.get(path)
+            self.stdout.write(f"  {response.status_code} {path} ({len(captured)} queries)")
+            statements.extend(query['sql'] for query in captured.captured_queries)
+        return statements
@@ -0,0 +1,120 @@
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.urls import reverse
+
+from admin_panel import archive
+from admin_panel.bookings import BOOKING_SOURCES, get_source
+
+# List pages timed before and after archiving
+PAGES = ['admin_event_bookings', 'event_bookings_list', 'movie_bookings_list', 'comedy_bookings']
+
+
+class Command(BaseCommand):
+    help = ("Copy bookings older than the horizon into archive_<table> tables in resumable batches, "
+            "removing them from the live tables when BOOKING_ARCHIVE_DELETE is set, "
+            "and report the hot-table size and list-page latency before and after")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=archive.HORIZON_DAYS,
+                            help=f"Archive bookings older than this many days (default {archive.HORIZON_DAYS})")
+        parser.add_argument('--vertical', action='append', default=[],
+                            help="Only these verticals (repeatable; default all)")
+        parser.add_argument('--batch-size', type=int, default=archive.BATCH_SIZE)
+        parser.add_argument('--max-batches', type=int,
+                            help="Stop after this many batches per vertical; run again to continue")
+        parser.add_argument('--pause', type=float, default=0, help="Seconds to sleep between batches")
+        parser.add_argument('--dry-run', action='store_true', help="Count what would move and stop")
+        parser.add_argument('--no-bench', action='store_true', help="Skip the list-page latency measurement")
+        parser.add_argument('--requests', type=int, default=5, help="Requests per page when measuring latency")
+        parser.add_argument('--user', help="Username to measure as (defaults to the first superuser)")
+
+    def handle(self, *args, **options):
+        try:
+            sources = [get_source(vertical) for vertical in options['vertical']] or list(BOOKING_SOURCES)
+        except ValueError as e:
+            raise CommandError(str(e))
+        before = archive.horizon(options['days'])
+        self.stdout.write(f"Archiving bookings older than {before:%Y-%m-%d %H:%M}")
+        if not archive.DELETE_LIVE:
+            self.stdout.write("Copying only: the live rows stay until the public site's owners agree "
+                              "to their removal and BOOKING_ARCHIVE_DELETE is set")
+
+        if options['dry_run']:
+            for source in sources:
+                self.stdout.write(f"  {source.label:<18}{archive.candidates(source, before).count():>10} to archive")
+            return
+
+        created = archive.ensure_tables([source.model for source in sources])
+        for table in created:
+            self.stdout.write(f"  created {table}")
+
+        client = None if options['no_bench'] else self.client(options['user'])
+        sizes_before = {source.vertical: archive.table_size(source.model) for source in sources}
+        latency_before = self.latency(client, options['requests']) if client else {}
+
+        moved = {}
+        for source in sources:
+            started = time.perf_counter()
+            moved[source.vertical] = archive.archive_source(
+                source, before, batch_size=options['batch_size'], max_batches=options['max_batches'],
+                pause=options['pause'], progress=self.progress,
+            )
+            self.stdout.write(f"  {source.label:<18}{moved[source.vertical]:>10} archived in "
+                              f"{time.perf_counter() - started:.1f}s")
+
+        self.stdout.write(f"\n{'table':<40}{'rows before':>13}{'rows after':>12}{'MB before':>11}{'MB after':>10}")
+        for source in sources:
+            rows_before, bytes_before = sizes_before[source.vertical]
+            rows_after, bytes_after = archive.table_size(source.model)
+            self.stdout.write(
+                f"{source.table:<40}{rows_before:>13}{rows_after:>12}"
+                f"{_megabytes(bytes_before):>11}{_megabytes(bytes_after):>10}"
+            )
+        self.stdout.write("(MySQL only reports the smaller size after ANALYZE or OPTIMIZE TABLE)")
+
+        if client:
+            latency_after = self.latency(client, options['requests'])
+            self.stdout.write(f"\n{'page':<28}{'before ms':>11}{'after ms':>10}")
+            for name, ms in latency_before.items():
+                self.stdout.write(f"{name:<28}{ms:>11.1f}{latency_after[name]:>10.1f}")
+
+        if archive.DELETE_LIVE and options['max_batches'] and any(archive.candidates(source, before).exists() for source in sources):
+            self.stdout.write("More bookings are due; run the command again to continue.")
+
+    def progress(self, source, total):
+        self.stdout.write(f"    {source.vertical}: {total} rows", ending='\r')
+        self.stdout.flush()
+
+    def client(self, username):
+        User = get_user_model()
+        users = User.objects.filter(username=username) if username else User.objects.filter(is_superuser=True)
+        user = users.first()
+        if user is None:
+            raise CommandError("No user to measure as; pass --user or --no-bench")
+        client = Client(HTTP_HOST='localhost')
+        client.force_login(user)
+        return client
+
+    def latency(self, client, count):
+        """Median milliseconds per list page"""
+        results = {}
+        for name in PAGES:
+            url = reverse(name)
+            client.get(url)
+            timings = []
+            for _ in range(count):
+                started = time.perf_counter()
+                response = client.get(url)
+                if getattr(response, 'streaming', False):
+                    b''.join(response.streaming_content)
+                timings.append((time.perf_counter() - started) * 1000)
+            results[name] = statistics.median(timings)
+        return results
+
+
+def _megabytes(size):
+    return '-' if size is None else f"{size / 1_048_576:.1f}"
@@ -0,0 +1,55 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.urls import reverse
+
+# (API resource, equivalent HTML list page)
+PAIRS = [
+    ('event-bookings', 'admin_event_bookings'),
+    ('movie-bookings', 'movie_bookings_list'),
+    ('comedy-bookings', 'comedy_bookings'),
+    ('events', 'admin_events_list'),
+    ('movies', 'movies'),
+]
+
+
+class Command(BaseCommand):
+    help = "Compare JSON API throughput against rendering the equivalent HTML list pages"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=50, help="Requests per endpoint")
+        parser.add_argument('--limit', type=int, default=500, help="Rows per API page")
+        parser.add_argument('--user', help="Username to run as (defaults to the first superuser)")
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        users = User.objects.filter(username=options['user']) if options['user'] else User.objects.filter(is_superuser=True)
+        user = users.first()
+        if user is None:
+            raise CommandError("No user to run as; pass --user")
+
+        client = Client(HTTP_HOST='localhost')
+        client.force_login(user)
+        count = options['requests']
+
+        self.stdout.write(f"{'endpoint':<28}{'API req/s':>12}{'HTML req/s':>12}{'speedup':>10}")
+        for resource, page_name in PAIRS:
+            api_url = f"{reverse('api_list', args=[resource])}?limit={options['limit']}"
+            api_rate = self.measure(client, api_url, count)
+            html_rate = self.measure(client, reverse(page_name), count)
+            speedup = api_rate / html_rate if html_rate else 0
+            self.stdout.write(f"{resource:<28}{api_rate:>12.1f}{html_rate:>12.1f}{speedup:>9.1f}x")
+
+    def measure(self, client, url, count):
+        # One warm-up request so template and query compilation are not timed
+        client.get(url)
+        started = time.perf_counter()
+        for _ in range(count):
+            response = client.get(url)
+            if response.status_code != 200:
+                raise CommandError(f"{url} returned {response.status_code}")
+            if getattr(response, 'streaming', False):
+                b''.join(response.streaming_content)
+        return count / (time.perf_counter() - started)
@@ -0,0 +1,97 @@
+import random
+import statistics
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from admin_panel.seat_holds import BACKENDS, SeatHoldManager, HoldConflict
+
+
+class Command(BaseCommand):
+    help = "Benchmark seat hold throughput and contention with many concurrent holders"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--backend', choices=[*BACKENDS, 'all'], default='all')
+        parser.add_argument('--holders', type=int, default=64, help="Concurrent holder threads")
+        parser.add_argument('--seats', type=int, default=200, help="Seats on the simulated screen")
+        parser.add_argument('--per-hold', type=int, default=4, help="Seats requested per hold")
+        parser.add_argument('--seconds', type=float, default=5.0, help="Duration per backend")
+        parser.add_argument('--ttl', type=int, default=2, help="Hold TTL; holds are released before it runs out")
+        parser.add_argument('--hold-ms', type=float, default=1.0, help="How long each successful hold is kept")
+
+    def handle(self, *args, **options):
+        if options['per_hold'] > options['seats']:
+            raise CommandError("--per-hold cannot exceed --seats")
+        names = list(BACKENDS) if options['backend'] == 'all' else [options['backend']]
+
+        self.stdout.write(
+            f"{'backend':<10}{'holds/s':>10}{'attempts/s':>12}{'conflict %':>12}{'p50 ms':>9}{'p99 ms':>9}"
+        )
+        for name in names:
+            result = self.run(SeatHoldManager(BACKENDS[name](), ttl=options['ttl']), options)
+            if result['overlaps']:
+                raise CommandError(f"{name}: {result['overlaps']} seats were held by two holders at once")
+            self.stdout.write(
+                f"{name:<10}{result['holds'] / result['elapsed']:>10.0f}"
+                f"{result['attempts'] / result['elapsed']:>12.0f}"
+                f"{100 * result['conflicts'] / max(result['attempts'], 1):>11.1f}%"
+                f"{result['p50']:>9.3f}{result['p99']:>9.3f}"
+            )
+
+    def run(self, manager, options):
+        # Screen id far outside real ids so the cache backend never collides with live holds
+        screen_id = 10 ** 9 + random.randint(0, 10 ** 6)
+        seat_ids = list(range(1, options['seats'] + 1))
+        owners = {}
+        owners_lock = threading.Lock()
+        stats = {'holds': 0, 'attempts': 0, 'conflicts': 0, 'overlaps': 0}
+        latencies = []
+        stats_lock = threading.Lock()
+        deadline = time.perf_counter() + options['seconds']
+
+        def holder(number):
+            rng = random.Random(number)
+            local = {'holds': 0, 'attempts': 0, 'conflicts': 0, 'overlaps': 0}
+            timings = []
+            while time.perf_counter() < deadline:
+                wanted = rng.sample(seat_ids, options['per_hold'])
+                started = time.perf_counter()
+                try:
+                    hold = manager.hold(screen_id, wanted, holder=f"bench-{number}", check_status=False)
+                except HoldConflict:
+                    local['conflicts'] += 1
+                    hold = None
+                timings.append((time.perf_counter() - started) * 1000)
+                local['attempts'] += 1
+                if hold is None:
+                    continue
+
+                local['holds'] += 1
+                # Independent bookkeeping: a seat must never have two live owners
+                with owners_lock:
+                    local['overlaps'] += sum(1 for seat in hold.seat_ids if seat in owners)
+                    owners.update((seat, hold.token) for seat in hold.seat_ids)
+                time.sleep(options['hold_ms'] / 1000)
+                with owners_lock:
+                    for seat in hold.seat_ids:
+                        owners.pop(seat, None)
+                manager.release(screen_id, hold.seat_ids, hold.token)
+
+            with stats_lock:
+                for key, value in local.items():
+                    stats[key] += value
+                latencies.extend(timings)
+
+        threads = [threading.Thread(target=holder, args=(n,)) for n in range(options['holders'])]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        latencies.sort()
+        stats['elapsed'] = time.perf_counter() - started
+        stats['p50'] = statistics.median(latencies) if latencies else 0
+        stats['p99'] = latencies[int(len(latencies) * 0.99) - 1] if latencies else 0
+        return stats
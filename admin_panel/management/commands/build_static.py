@@ -0,0 +1,60 @@
+import json
+import os
+import shutil
+import subprocess
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = "Compile Tailwind, then collect hashed, minified and precompressed static files into STATIC_ROOT"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--skip-css', action='store_true',
+                            help="Keep the existing static/css/output.css instead of running `npm run build`")
+        parser.add_argument('--clear', action='store_true',
+                            help="Empty STATIC_ROOT first so files from old builds do not linger")
+
+    def handle(self, *args, **options):
+        if not options['skip_css']:
+            self.build_css()
+        call_command('collectstatic', interactive=False, clear=options['clear'], verbosity=options['verbosity'])
+        self.summary()
+
+    def build_css(self):
+        npm = shutil.which('npm')
+        if npm is None:
+            raise CommandError("npm was not found; install Node.js or pass --skip-css")
+        self.stdout.write("Compiling Tailwind (npm run build)...")
+        result = subprocess.run([npm, 'run', 'build'], cwd=settings.BASE_DIR, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise CommandError(f"npm run build failed:\n{result.stderr or result.stdout}")
+
+    def summary(self):
+        manifest = os.path.join(settings.STATIC_ROOT, staticfiles_storage.manifest_name)
+        try:
+            with open(manifest) as handle:
+                paths = json.load(handle)['paths']
+        except (OSError, ValueError, KeyError):
+            self.stdout.write(self.style.WARNING(f"No manifest at {manifest}; files were not hashed"))
+            return
+
+        def size(name):
+            path = os.path.join(settings.STATIC_ROOT, name)
+            return os.path.getsize(path) if os.path.isfile(path) else None
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f"{'file':<56} {'raw':>9} {'gzip':>9} {'brotli':>9}"))
+        totals = [0, 0, 0]
+        for name, hashed in sorted(paths.items()):
+            if not name.endswith(('.css', '.js')):
+                continue
+            sizes = [size(hashed), size(hashed + '.gz'), size(hashed + '.br')]
+            for i, value in enumerate(sizes):
+                totals[i] += value if value is not None else sizes[0] or 0
+            cells = ' '.join(f"{value if value is not None else '-':>9}" for value in sizes)
+            self.stdout.write(f"{hashed:<56} {cells}")
+        self.stdout.write(f"{'total CSS/JS bytes':<56} {' '.join(f'{value:>9}' for value in totals)}")
+        self.stdout.write(self.style.SUCCESS(f"{len(paths)} files hashed into {settings.STATIC_ROOT}"))
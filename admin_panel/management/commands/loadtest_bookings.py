@@ -0,0 +1,305 @@
+import multiprocessing
+import os
+import random
+import statistics
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+from django.db.models import Sum
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from admin_panel.models import Event, BookingsEvent, ComedyShow, BookingComedyShow
+
+OPERATIONS = ('book_event', 'book_comedy', 'cancel', 'edit')
+DEFAULT_MIX = 'book_event=5,book_comedy=3,cancel=1,edit=1'
+FIXTURE_PREFIX = 'Load test'
+
+
+def parse_mix(value):
+    """'book_event=5,cancel=1' -> {'book_event': 5, 'cancel': 1}"""
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise CommandError(f"Unknown operation in --mix: {name} (choose from {', '.join(OPERATIONS)})")
+        try:
+            mix[name] = int(weight or 1)
+        except ValueError:
+            raise CommandError(f"Weight for {name} must be an integer")
+    if not any(mix.values()):
+        raise CommandError("--mix has no operations with a positive weight")
+    return mix
+
+
+# ----- traffic -----
+# Module-level so process workers (spawned, not forked) can import and run them
+
+def _pick_booking(event_id, statuses):
+    return (BookingsEvent.objects.filter(event_id=event_id, status__in=statuses)
+            .order_by('?').values_list('pk', 'booking_id', 'number_of_tickets').first())
+
+
+def _run_operation(client, name, config, rng):
+    """Send one request; returns (outcome, latency_ms) with outcome 'ok', 'rejected', 'error' or 'skipped'"""
+    if name == 'book_event':
+        url, success = reverse('event_book_add'), reverse('event_bookings_list')
+        data = {
+            'event': config['event_id'],
+            'number_of_tickets': rng.randint(1, config['max_tickets']),
+            'status': 'confirmed',
+            'customer_name': 'Load Test',
+            'customer_email': 'loadtest@example.com',
+        }
+    elif name == 'book_comedy':
+        url, success = reverse('book_comedy_show'), reverse('comedy_bookings')
+        data = {
+            'user_id': config['customer_id'],
+            'show_id': config['show_id'],
+            'tickets': rng.randint(1, config['max_tickets']),
+        }
+    elif name == 'cancel':
+        booking = _pick_booking(config['event_id'], ['confirmed', 'pending'])
+        if booking is None:
+            return 'skipped', 0.0
+        url, success = reverse('event_booking_cancel', args=[booking[1]]), reverse('event_bookings_list')
+        data = {}
+    else:
+        booking = _pick_booking(config['event_id'], ['confirmed', 'pending'])
+        if booking is None:
+            return 'skipped', 0.0
+        url, success = reverse('admin_event_booking_edit', args=[booking[0]]), reverse('admin_event_bookings')
+        data = {
+            'customer_name': 'Load Test (edited)',
+            'customer_email': 'loadtest@example.com',
+            'status': 'confirmed',
+            'payment_status': 'on',
+            'number_of_tickets': rng.randint(1, config['max_tickets']),
+        }
+
+    started = time.perf_counter()
+    try:
+        response = client.post(url, data)
+    except Exception:
+        return 'error', (time.perf_counter() - started) * 1000
+    elapsed = (time.perf_counter() - started) * 1000
+    if response.status_code >= 500:
+        return 'error', elapsed
+    # The views redirect to a list page on success and back to the form (or re-render) otherwise
+    if response.status_code == 302 and response.url == success:
+        return 'ok', elapsed
+    return 'rejected', elapsed
+
+
+def run_worker(config, worker):
+    """Drive traffic until the deadline; returns [(operation, outcome, latency_ms)]"""
+    rng = random.Random(config['seed'] + worker)
+    names, weights = zip(*config['mix'].items())
+    client = Client(HTTP_HOST=config['host'])
+    client.force_login(get_user_model().objects.get(pk=config['staff_id']))
+    samples = []
+    # Each worker times its own window, so process start-up is not counted
+    deadline = time.perf_counter() + config['seconds']
+    try:
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights)[0]
+            outcome, latency = _run_operation(client, name, config, rng)
+            samples.append((name, outcome, latency))
+    finally:
+        close_old_connections()
+    return samples
+
+
+def _init_process(settings_module):
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    import django
+    django.setup()
+
+
+class Command(BaseCommand):
+    help = ("Fire concurrent booking, cancel and edit traffic at the booking views, report throughput and "
+            "latency, then fail if seats were oversold")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=16, help="Concurrent clients")
+        parser.add_argument('--processes', action='store_true',
+                            help="Run clients in separate processes instead of threads")
+        parser.add_argument('--seconds', type=float, default=10.0, help="How long to send traffic")
+        parser.add_argument('--mix', default=DEFAULT_MIX, help=f"Weighted operations (default {DEFAULT_MIX})")
+        parser.add_argument('--seats', type=int, default=100, help="Seats on the load-test event and show")
+        parser.add_argument('--max-tickets', type=int, default=4, help="Most tickets per booking or edit")
+        parser.add_argument('--user', help="Staff username to run as (defaults to the first superuser)")
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--check-all', action='store_true',
+                            help="Check the invariants on every event and show, not just the load-test ones")
+        parser.add_argument('--keep', action='store_true', help="Keep the load-test event, show and bookings")
+        parser.add_argument('--force', action='store_true', help="Run even with DEBUG off")
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options['force']:
+            raise CommandError("This writes bookings to the configured database; run it against a local "
+                               "database with DEBUG on, or pass --force")
+        mix = parse_mix(options['mix'])
+        staff = self.staff_user(options['user'])
+        event, show = self.create_fixtures(options['seats'])
+
+        config = {
+            'mix': mix,
+            'event_id': event.pk,
+            'show_id': show.pk,
+            'staff_id': staff.pk,
+            # BookingComedyShow.user points at auth.User
+            'customer_id': staff.pk,
+            'max_tickets': options['max_tickets'],
+            'host': 'localhost',
+            'seed': options['seed'],
+            'seconds': options['seconds'],
+        }
+        self.stdout.write(
+            f"{options['workers']} {'processes' if options['processes'] else 'threads'} for "
+            f"{options['seconds']:.0f}s against event #{event.pk} and show #{show.pk} ({options['seats']} seats)"
+        )
+
+        try:
+            samples = self.drive(config, options['workers'], options['processes'])
+            self.report(samples, options['seconds'])
+            violations = self.check_invariants(None if options['check_all'] else (event, show))
+        finally:
+            if not options['keep']:
+                self.remove_fixtures(event, show)
+
+        violations += self.never_succeeded(samples)
+        if violations:
+            for violation in violations:
+                self.stderr.write(f"  {violation}")
+            raise CommandError(f"{len(violations)} invariant violation(s)")
+        self.stdout.write(self.style.SUCCESS("Invariants hold: no negative availability, no oversold seats"))
+
+    # ----- setup -----
+
+    def staff_user(self, username):
+        User = get_user_model()
+        users = User.objects.filter(username=username) if username else User.objects.filter(is_superuser=True)
+        user = users.first()
+        if user is None:
+            raise CommandError("No user to run as; pass --user")
+        return user
+
+    def create_fixtures(self, seats):
+        label = f"{FIXTURE_PREFIX} {timezone.now():%Y-%m-%d %H:%M:%S}"
+        when = timezone.localdate() + timedelta(days=30)
+        event = Event.objects.create(
+            name=label, description=label, location='Load test', date=when, time='20:00',
+            total_seats=seats, available_seats=seats, ticket_price=100,
+        )
+        show = ComedyShow.objects.create(
+            title=label, description=label, location='Load test', date=when, time='20:00',
+            comedian_name='Load test', total_seats=seats, available_seats=seats, ticket_price=100,
+        )
+        return event, show
+
+    def remove_fixtures(self, event, show):
+        BookingsEvent.objects.filter(event=event).delete()
+        BookingComedyShow.objects.filter(comedy_show=show).delete()
+        event.delete()
+        show.delete()
+
+    # ----- traffic -----
+
+    def drive(self, config, workers, processes):
+        if processes:
+            context = multiprocessing.get_context('spawn')
+            settings_module = os.environ.get('DJANGO_SETTINGS_MODULE', 'event_admin.settings')
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                     initializer=_init_process, initargs=(settings_module,)) as pool:
+                results = pool.map(run_worker, [config] * workers, range(workers))
+                return [sample for samples in results for sample in samples]
+
+        results = []
+        lock = threading.Lock()
+
+        def thread_main(worker):
+            samples = run_worker(config, worker)
+            with lock:
+                results.extend(samples)
+
+        threads = [threading.Thread(target=thread_main, args=(n,)) for n in range(workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def report(self, samples, elapsed):
+        self.stdout.write(
+            f"\n{'operation':<13}{'requests':>9}{'ok':>7}{'rejected':>10}{'errors':>8}"
+            f"{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+        )
+        for name in (*OPERATIONS, 'total'):
+            rows = [sample for sample in samples if name in ('total', sample[0]) and sample[1] != 'skipped']
+            if not rows:
+                continue
+            latencies = sorted(sample[2] for sample in rows)
+            outcomes = [sample[1] for sample in rows]
+            self.stdout.write(
+                f"{name:<13}{len(rows):>9}{outcomes.count('ok'):>7}{outcomes.count('rejected'):>10}"
+                f"{outcomes.count('error'):>8}{len(rows) / elapsed:>9.1f}"
+                f"{statistics.median(latencies):>9.1f}{_percentile(latencies, 95):>9.1f}"
+                f"{_percentile(latencies, 99):>9.1f}"
+            )
+        skipped = sum(1 for sample in samples if sample[1] == 'skipped')
+        if skipped:
+            self.stdout.write(f"({skipped} cancel/edit attempts skipped: no open booking to act on)")
+
+    # ----- invariants -----
+
+    @staticmethod
+    def never_succeeded(samples):
+        """Operations that were only ever rejected: the invariants say nothing about a path that never ran"""
+        failures = []
+        for name in OPERATIONS:
+            outcomes = [sample[1] for sample in samples if sample[0] == name]
+            if outcomes.count('rejected') and not outcomes.count('ok'):
+                failures.append(f"{name}: all {outcomes.count('rejected')} request(s) were rejected, none succeeded")
+        return failures
+
+    def check_invariants(self, fixtures=None):
+        """Human-readable violations; checks every row when fixtures is None"""
+        events, shows = Event.objects.all(), ComedyShow.objects.all()
+        if fixtures is not None:
+            events, shows = events.filter(pk=fixtures[0].pk), shows.filter(pk=fixtures[1].pk)
+
+        violations = []
+        event_booked = dict(
+            BookingsEvent.objects.filter(event__in=events).exclude(status='cancelled')
+            .values('event_id').annotate(tickets=Sum('number_of_tickets')).values_list('event_id', 'tickets')
+        )
+        for pk, name, total, available in events.values_list('pk', 'name', 'total_seats', 'available_seats'):
+            if available < 0:
+                violations.append(f"Event #{pk} {name!r}: available_seats is {available}")
+            if event_booked.get(pk, 0) > total:
+                violations.append(f"Event #{pk} {name!r}: {event_booked[pk]} tickets booked for {total} seats")
+
+        show_booked = dict(
+            BookingComedyShow.objects.filter(comedy_show__in=shows)
+            .values('comedy_show_id').annotate(tickets=Sum('number_of_tickets'))
+            .values_list('comedy_show_id', 'tickets')
+        )
+        for pk, title, total, available in shows.values_list('pk', 'title', 'total_seats', 'available_seats'):
+            if available < 0:
+                violations.append(f"Comedy show #{pk} {title!r}: available_seats is {available}")
+            if show_booked.get(pk, 0) > total:
+                violations.append(f"Comedy show #{pk} {title!r}: {show_booked[pk]} tickets booked for {total} seats")
+        return violations
+
+
+def _percentile(ordered, percent):
+    return ordered[max(int(len(ordered) * percent / 100) - 1, 0)] if ordered else 0.0
@@ -0,0 +1,161 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Boot the project the way a worker does: settings, apps, then the URLconf
+BOOT = (
+    "import django; django.setup(); "
+    "from django.urls import get_resolver; get_resolver().url_patterns"
+)
+
+# Runs in a fresh interpreter and reports its own timings as JSON on stdout
+FIRST_REQUEST = """
+import json, resource, sys, time
+started = time.perf_counter()
+import django
+django.setup()
+from django.urls import get_resolver
+get_resolver().url_patterns
+ready = time.perf_counter()
+from django.test import Client
+response = Client(HTTP_HOST='localhost').get(sys.argv[1])
+served = time.perf_counter()
+print(json.dumps({
+    'setup_ms': (ready - started) * 1000,
+    'first_request_ms': (served - ready) * 1000,
+    'status': response.status_code,
+    'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+}))
+"""
+
+
+def parse_importtime(stderr):
+    """Return {module: (self_us, cumulative_us, depth)} from ``-X importtime`` output"""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len('import time:'):].split('|')
+            # Nested imports are indented two spaces per level after the leading one
+            depth = (len(name) - len(name.lstrip()) - 1) // 2
+            modules[name.strip()] = (int(self_us), int(cumulative_us), depth)
+        except ValueError:
+            continue
+    return modules
+
+
+def by_package(modules):
+    """Self time summed per top-level package"""
+    totals = defaultdict(int)
+    for name, (self_us, _, _) in modules.items():
+        totals[name.split('.')[0]] += self_us
+    return dict(totals)
+
+
+def total_import_ms(modules):
+    """Wall import time: the cumulative times of the top-level imports"""
+    return sum(cumulative for _, cumulative, depth in modules.values() if depth == 0) / 1000
+
+
+class Command(BaseCommand):
+    help = "Report import-time breakdown and time to first request, compared against a stored baseline"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='/admin-panel/login/', help="Path requested as the first request")
+        parser.add_argument('--runs', type=int, default=3, help="Fresh interpreters to start; medians are reported")
+        parser.add_argument('--top', type=int, default=15, help="Modules and packages to list")
+        parser.add_argument('--baseline', default=str(Path(settings.BASE_DIR) / 'startup_baseline.json'),
+                            help="Baseline JSON file to compare against")
+        parser.add_argument('--save-baseline', action='store_true', help="Store this run as the new baseline")
+
+    def handle(self, *args, **options):
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'event_admin.settings')}
+        runs = max(1, options['runs'])
+
+        modules = self.import_times(env)
+        first_requests = [self.first_request(env, options['url']) for _ in range(runs)]
+        result = {
+            'boot_import_ms': total_import_ms(modules),
+            'module_count': len(modules),
+            'wall_ms': statistics.median(run['wall_ms'] for run in first_requests),
+            'setup_ms': statistics.median(run['setup_ms'] for run in first_requests),
+            'first_request_ms': statistics.median(run['first_request_ms'] for run in first_requests),
+            'max_rss_kb': statistics.median(run['max_rss_kb'] for run in first_requests),
+            'packages': {name: us / 1000 for name, us in by_package(modules).items()},
+        }
+
+        self.report_modules(modules, result['packages'], options['top'])
+        self.stdout.write(self.style.MIGRATE_HEADING("First request"))
+        for key in ('boot_import_ms', 'setup_ms', 'first_request_ms', 'wall_ms', 'max_rss_kb', 'module_count'):
+            self.stdout.write(f"  {key:<18}{result[key]:>12.1f}")
+        if first_requests[0]['status'] >= 400:
+            self.stdout.write(self.style.WARNING(f"  {options['url']} returned {first_requests[0]['status']}"))
+
+        baseline_path = Path(options['baseline'])
+        if options['save_baseline']:
+            baseline_path.write_text(json.dumps(result, indent=2, sort_keys=True))
+            self.stdout.write(self.style.SUCCESS(f"Baseline written to {baseline_path}"))
+        elif baseline_path.exists():
+            self.compare(json.loads(baseline_path.read_text()), result)
+
+    def import_times(self, env):
+        process = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', BOOT],
+            env=env, cwd=settings.BASE_DIR, capture_output=True, text=True,
+        )
+        if process.returncode:
+            raise CommandError(f"Boot failed:\n{process.stderr[-2000:]}")
+        return parse_importtime(process.stderr)
+
+    def first_request(self, env, url):
+        started = time.perf_counter()
+        process = subprocess.run(
+            [sys.executable, '-c', FIRST_REQUEST, url],
+            env=env, cwd=settings.BASE_DIR, capture_output=True, text=True,
+        )
+        wall_ms = (time.perf_counter() - started) * 1000
+        if process.returncode:
+            raise CommandError(f"First request failed:\n{process.stderr[-2000:]}")
+        # The last stdout line is ours; anything printed during boot comes before it
+        run = json.loads(process.stdout.strip().splitlines()[-1])
+        run['wall_ms'] = wall_ms
+        return run
+
+    def report_modules(self, modules, packages, top):
+        self.stdout.write(self.style.MIGRATE_HEADING(f"Slowest modules (of {len(modules)})"))
+        self.stdout.write(f"  {'module':<48}{'self ms':>10}{'cumul. ms':>11}")
+        slowest = sorted(modules.items(), key=lambda item: item[1][1], reverse=True)[:top]
+        for name, (self_us, cumulative_us, _) in slowest:
+            self.stdout.write(f"  {name[:47]:<48}{self_us / 1000:>10.1f}{cumulative_us / 1000:>11.1f}")
+
+        self.stdout.write(self.style.MIGRATE_HEADING("Self time by package"))
+        for name, ms in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]:
+            self.stdout.write(f"  {name:<48}{ms:>10.1f}")
+
+    def compare(self, baseline, result):
+        self.stdout.write(self.style.MIGRATE_HEADING("Against baseline"))
+        for key in ('boot_import_ms', 'setup_ms', 'first_request_ms', 'wall_ms', 'max_rss_kb', 'module_count'):
+            before, after = baseline.get(key), result[key]
+            if not before:
+                continue
+            change = (after - before) / before * 100
+            style = self.style.SUCCESS if change <= 0 else self.style.WARNING
+            self.stdout.write(style(f"  {key:<18}{before:>12.1f} -> {after:>10.1f}  ({change:+.1f}%)"))
+
+        before_packages = baseline.get('packages', {})
+        regressed = [
+            (name, ms - before_packages.get(name, 0))
+            for name, ms in result['packages'].items()
+            if ms - before_packages.get(name, 0) > 5
+        ]
+        for name, delta in sorted(regressed, key=lambda item: item[1], reverse=True):
+            self.stdout.write(self.style.WARNING(f"  {name} imports {delta:.1f} ms slower"))
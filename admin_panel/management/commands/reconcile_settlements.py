@@ -0,0 +1,70 @@
+import csv
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from admin_panel.reconcile import CATEGORIES, SOURCES, Reconciler, read_settlements
+
+
+class Command(BaseCommand):
+    help = ("Match a payment gateway settlement export against the booking tables by razorpay_order_id "
+            "and report missing, amount and status mismatches")
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Settlement file (.csv, .jsonl or a .json array)")
+        parser.add_argument('--format', choices=['csv', 'jsonl', 'json'], help="Defaults to the file extension")
+        parser.add_argument('--order-column', default='order_id')
+        parser.add_argument('--payment-column', default='entity_id')
+        parser.add_argument('--amount-column', default='amount')
+        parser.add_argument('--type-column', default='type', help="Lines of type refund/reversal expect unpaid")
+        parser.add_argument('--paise', action='store_true', help="Amounts in the file are in paise")
+        parser.add_argument('--chunk', type=int, default=5000, help="Settlement lines matched per round")
+        parser.add_argument('--report', help="Write every line that is not 'matched' to this CSV")
+        parser.add_argument('--apply', action='store_true',
+                            help="Set payment_status on status mismatches (amount mismatches are never changed)")
+
+    def handle(self, *args, **options):
+        if options['chunk'] < 1:
+            raise CommandError("--chunk must be at least 1")
+        lines = read_settlements(
+            options['path'], options['format'], order_column=options['order_column'],
+            payment_column=options['payment_column'], amount_column=options['amount_column'],
+            type_column=options['type_column'], paise=options['paise'],
+        )
+        reconciler = Reconciler(apply=options['apply'], chunk=options['chunk'])
+        self.stdout.write(f"Matching against {', '.join(source.label for source in SOURCES)}")
+
+        started = time.perf_counter()
+        report = open(options['report'], 'w', newline='', encoding='utf-8') if options['report'] else None
+        try:
+            writer = csv.writer(report) if report else None
+            if writer:
+                writer.writerow(['line', 'category', 'order_id', 'payment_id', 'settlement_amount', 'refund',
+                                 'vertical', 'booking_id', 'booking_amount', 'booking_status'])
+            for result in reconciler.run(lines):
+                if writer and result.category != 'matched':
+                    line = result.line
+                    writer.writerow([line.number, result.category, line.order_id, line.payment_id, line.amount,
+                                     line.refund, result.vertical, result.booking_id, result.booking_amount,
+                                     result.booking_status])
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Could not read {options['path']}: {e}")
+        finally:
+            if report:
+                report.close()
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(f"\n{reconciler.lines} settlement lines in {elapsed:.1f}s")
+        for category in CATEGORIES:
+            self.stdout.write(f"  {category:<16}{reconciler.counts[category]:>10}")
+        self.stdout.write(f"\n{'vertical':<18}" + ''.join(f"{category:>17}" for category in CATEGORIES[:4]))
+        for vertical, counts in reconciler.by_vertical.items():
+            if any(counts.values()):
+                self.stdout.write(f"{vertical:<18}" + ''.join(f"{counts[category]:>17}" for category in CATEGORIES[:4]))
+
+        if options['apply']:
+            self.stdout.write(self.style.SUCCESS(f"\npayment_status updated on {reconciler.updated} bookings"))
+        elif reconciler.counts['status_mismatch']:
+            self.stdout.write(f"\nRe-run with --apply to correct {reconciler.counts['status_mismatch']} payment statuses")
+        if options['report']:
+            self.stdout.write(f"Unmatched lines written to {options['report']}")
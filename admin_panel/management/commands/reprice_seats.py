@@ -0,0 +1,43 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from admin_panel.models import MovieScreen
+from admin_panel.repricing import reprice
+
+
+class Command(BaseCommand):
+    help = "Re-derive seat types and prices from each screen's row boundaries and prices"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--screen', type=int, action='append', default=[], help="Screen id (repeatable)")
+        parser.add_argument('--movie', type=int, action='append', default=[], help="Every screen of this movie")
+        parser.add_argument('--all', action='store_true', help="Every screen")
+        parser.add_argument('--dry-run', action='store_true', help="List the row changes without writing them")
+
+    def handle(self, *args, **options):
+        if not (options['screen'] or options['movie'] or options['all']):
+            raise CommandError("Give --screen, --movie or --all")
+        screens = MovieScreen.objects.all()
+        if not options['all']:
+            screens = screens.filter(pk__in=options['screen']) | screens.filter(movie_id__in=options['movie'])
+        screens = list(screens)
+        if not screens:
+            raise CommandError("No matching screens")
+
+        started = time.perf_counter()
+        changes, updated = reprice(screens, dry_run=options['dry_run'])
+        elapsed = (time.perf_counter() - started) * 1000
+
+        for change in changes:
+            self.stdout.write(
+                f"screen {change.screen_id} row {change.row:<4} {change.seats:>4} seats  "
+                f"{change.old_type} {change.old_price} -> {change.new_type} {change.new_price}"
+            )
+        seats = sum(change.seats for change in changes)
+        if options['dry_run']:
+            self.stdout.write(f"{seats} seats in {len(changes)} rows would change ({elapsed:.1f} ms)")
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f"{updated} seats repriced across {len(screens)} screens ({elapsed:.1f} ms)"
+            ))
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+
+from admin_panel import querylog
+
+SORT_KEYS = {'total': 'total_ms', 'p95': 'p95_ms', 'max': 'max_ms', 'count': 'count'}
+
+
+class Command(BaseCommand):
+    help = "Show the query fingerprints (or URL names) that cost the most, from the slow-query log files"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=20, help="How many rows to show")
+        parser.add_argument('--sort', choices=list(SORT_KEYS), default='total')
+        parser.add_argument('--by', choices=['fingerprint', 'url'], default='fingerprint')
+        parser.add_argument('--explain', action='store_true', help="Print the captured EXPLAIN plan under each fingerprint")
+        parser.add_argument('--reset', action='store_true', help="Delete the log files after printing")
+
+    def handle(self, *args, **options):
+        fingerprints, urls = querylog.load(include_live=False)
+        rows = fingerprints if options['by'] == 'fingerprint' else urls
+        key = SORT_KEYS[options['sort']]
+        rows.sort(key=lambda row: row[key], reverse=True)
+
+        if not rows:
+            self.stdout.write(f"Nothing logged under {querylog.LOG_DIR} yet.")
+        else:
+            self.stdout.write(f"{'count':>8}{'total ms':>12}{'avg ms':>10}{'p95 ms':>10}{'max ms':>10}  "
+                              f"{options['by']}")
+        for row in rows[:options['top']]:
+            label = row.get('fingerprint') or row.get('url_name')
+            self.stdout.write(
+                f"{row['count']:>8}{row['total_ms']:>12.1f}{row['avg_ms']:>10.2f}{row['p95_ms']:>10.2f}"
+                f"{row['max_ms']:>10.2f}  {label[:160]}"
+            )
+            if options['by'] == 'fingerprint':
+                if row['urls']:
+                    self.stdout.write("    from " + ', '.join(f"{name} x{count}" for name, count in row['urls'][:3]))
+                if options['explain'] and row['plan']:
+                    for line in row['plan'].splitlines():
+                        self.stdout.write(f"    {line}")
+
+        if options['reset']:
+            querylog.clear()
+            self.stdout.write(self.style.SUCCESS("Query log cleared."))
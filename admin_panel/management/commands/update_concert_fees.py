@@ -0,0 +1,52 @@
+import time
+from decimal import Decimal, InvalidOperation
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+from django.utils import timezone
+
+from admin_panel.fares import FARE_FIELDS, bulk_update_fees
+from admin_panel.models import LiveConcert
+
+
+def _amount(value):
+    try:
+        amount = Decimal(value)
+    except InvalidOperation:
+        raise CommandError(f"Not an amount: {value}")
+    if amount < 0:
+        raise CommandError(f"Amounts cannot be negative: {value}")
+    return amount
+
+
+class Command(BaseCommand):
+    help = "Set prices or fees on many concerts at once and recompute their fare rows set-wise"
+
+    def add_arguments(self, parser):
+        for field in FARE_FIELDS:
+            parser.add_argument(f"--{field.replace('_', '-')}", dest=field, type=_amount, metavar='AMOUNT')
+        parser.add_argument('--concert', type=int, action='append', default=[], help="Concert id (repeatable)")
+        parser.add_argument('--upcoming', action='store_true', help="Every concert from today on")
+        parser.add_argument('--all', action='store_true', help="Every concert")
+
+    def handle(self, *args, **options):
+        changes = {field: options[field] for field in FARE_FIELDS if options[field] is not None}
+        if not changes:
+            raise CommandError(f"Give at least one of {', '.join('--' + f.replace('_', '-') for f in FARE_FIELDS)}")
+        if not (options['concert'] or options['upcoming'] or options['all']):
+            raise CommandError("Give --concert, --upcoming or --all")
+
+        concerts = LiveConcert.objects.all()
+        if not options['all']:
+            selected = Q(pk__in=options['concert'])
+            if options['upcoming']:
+                selected |= Q(date__gte=timezone.localdate())
+            concerts = concerts.filter(selected)
+
+        started = time.perf_counter()
+        count = bulk_update_fees(concerts, **changes)
+        elapsed = (time.perf_counter() - started) * 1000
+        if not count:
+            raise CommandError("No matching concerts")
+        fields = ', '.join(f"{field}={value}" for field, value in changes.items())
+        self.stdout.write(self.style.SUCCESS(f"{fields} set on {count} concerts, fares rebuilt ({elapsed:.1f} ms)"))
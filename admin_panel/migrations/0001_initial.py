@@ -0,0 +1,392 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:16
+#
+# The tables below already exist on every database this panel has been
+# pointed at: they are shared with the public site and were created before
+# the app had migrations. On an existing database record this migration as
+# applied without running it, then apply the rest normally:
+#
+#     python manage.py migrate admin_panel 0001 --fake
+#     python manage.py migrate
+#
+# A fresh database needs only `python manage.py migrate`.
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AmusementBooking',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('booking_id', models.CharField(editable=False, max_length=12)),
+                ('customer_name', models.CharField(max_length=200)),
+                ('customer_email', models.EmailField(max_length=254)),
+                ('customer_phone', models.CharField(max_length=15)),
+                ('total_amount', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('total_gst', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('grand_total', models.DecimalField(decimal_places=2, default=2, max_digits=10)),
+                ('created_at', models.DateTimeField()),
+                ('razorpay_order_id', models.CharField(blank=True, max_length=100, null=True)),
+                ('razorpay_payment_id', models.CharField(blank=True, max_length=100, null=True)),
+                ('razorpay_signature', models.CharField(blank=True, max_length=255, null=True)),
+                ('payment_status', models.BooleanField(default=False)),
+            ],
+            options={
+                'verbose_name': 'Amusement Booking',
+                'verbose_name_plural': 'Amusement Bookings',
+                'db_table': 'eventapp_amusementbooking',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='AmusementBookingItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quantity', models.PositiveIntegerField(default=1)),
+                ('base_price', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('discount_percent', models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=5)),
+                ('gst_percent', models.DecimalField(decimal_places=2, default=18.0, editable=False, max_digits=5)),
+                ('subtotal', models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=10)),
+                ('gst_amount', models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=10)),
+                ('total_with_gst', models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=10)),
+            ],
+            options={
+                'verbose_name': 'Amusement Booking Item',
+                'verbose_name_plural': 'Amusement Booking Items',
+                'db_table': 'eventapp_amusementbookingitem',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='BookingComedyShow',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('booking_id', models.CharField(editable=False, max_length=20, unique=True)),
+                ('number_of_tickets', models.PositiveIntegerField(default=1)),
+                ('booking_date', models.DateTimeField()),
+                ('total_price', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('razorpay_order_id', models.CharField(blank=True, max_length=100, null=True)),
+                ('razorpay_payment_id', models.CharField(blank=True, max_length=100, null=True)),
+                ('razorpay_signature', models.CharField(blank=True, max_length=255, null=True)),
+                ('payment_status', models.BooleanField(default=False)),
+            ],
+            options={
+                'verbose_name': 'Booking Comedy Show',
+                'verbose_name_plural': 'Booking Comedy Shows',
+                'db_table': 'eventapp_bookingcomedyshow',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='BookingsEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('booking_date', models.DateTimeField()),
+                ('number_of_tickets', models.PositiveIntegerField(default=1)),
+                ('total_amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('status', models.CharField(choices=[('confirmed', 'Confirmed'), ('pending', 'Pending'), ('cancelled', 'Cancelled'), ('completed', 'Completed')], max_length=20)),
+                ('booking_id', models.CharField(max_length=20, unique=True)),
+                ('customer_name', models.CharField(max_length=200)),
+                ('customer_email', models.EmailField(max_length=254)),
+                ('customer_phone', models.CharField(blank=True, max_length=15, null=True)),
+                ('special_request', models.TextField(blank=True, null=True)),
+                ('payment_status', models.BooleanField(default=False)),
+            ],
+            options={
+                'verbose_name': 'Event Booking',
+                'verbose_name_plural': 'Event Bookings',
+                'db_table': 'eventapp_bookingsevent',
+                'ordering': ['-booking_date'],
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='LiveConcertTicketBooking',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quantity', models.PositiveIntegerField(default=1)),
+                ('base_price', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('gst_amount', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('total_fees', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('total_amount', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('booked_at', models.DateTimeField()),
+                ('payment_status', models.CharField(max_length=20)),
+                ('razorpay_order_id', models.CharField(blank=True, max_length=100, null=True, unique=True)),
+                ('razorpay_payment_id', models.CharField(blank=True, max_length=100, null=True)),
+                ('razorpay_signature', models.CharField(blank=True, max_length=255, null=True)),
+            ],
+            options={
+                'verbose_name': 'Live Concert Ticket Booking',
+                'verbose_name_plural': 'Live Concert Ticket Bookings',
+                'db_table': 'eventapp_liveconcertticketbooking',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='OtherAmusementBooking',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('booking_id', models.CharField(editable=False, max_length=12, unique=True)),
+                ('customer_name', models.CharField(max_length=200)),
+                ('customer_email', models.EmailField(max_length=254)),
+                ('customer_phone', models.CharField(max_length=15)),
+                ('quantity', models.PositiveIntegerField(default=1)),
+                ('base_price', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('gst_percent', models.DecimalField(decimal_places=2, default=18.0, max_digits=5)),
+                ('subtotal', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('gst_amount', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('grand_total', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('created_at', models.DateTimeField()),
+                ('razorpay_order_id', models.CharField(blank=True, max_length=100, null=True)),
+                ('razorpay_payment_id', models.CharField(blank=True, max_length=100, null=True)),
+                ('razorpay_signature', models.CharField(blank=True, max_length=255, null=True)),
+                ('payment_status', models.BooleanField(default=False)),
+            ],
+            options={
+                'verbose_name': 'Other Amusement Booking',
+                'verbose_name_plural': 'Other Amusement Bookings',
+                'db_table': 'eventapp_otheramusementbooking',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='TicketBooking',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_price', models.DecimalField(decimal_places=2, default=0.0, max_digits=10)),
+                ('platform_fee', models.DecimalField(decimal_places=2, default=Decimal('2.00'), max_digits=10)),
+                ('gst_rate', models.DecimalField(decimal_places=2, default=Decimal('18.00'), max_digits=4)),
+                ('gst_amount', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=10)),
+                ('grand_total', models.DecimalField(decimal_places=2, default=0.0, max_digits=10)),
+                ('booked_at', models.DateTimeField()),
+                ('razorpay_order_id', models.CharField(blank=True, max_length=100, null=True, unique=True)),
+                ('razorpay_payment_id', models.CharField(blank=True, max_length=100, null=True)),
+                ('razorpay_signature', models.CharField(blank=True, max_length=255, null=True)),
+                ('payment_status', models.BooleanField(default=False)),
+            ],
+            options={
+                'verbose_name': 'Ticket Booking',
+                'verbose_name_plural': 'Ticket Bookings',
+                'db_table': 'eventapp_ticketbooking',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='User',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('firstname', models.CharField(blank=True, max_length=50, null=True)),
+                ('lastname', models.CharField(blank=True, max_length=50, null=True)),
+                ('email', models.EmailField(max_length=254, unique=True)),
+                ('mobile', models.CharField(max_length=10, unique=True)),
+                ('password', models.CharField(max_length=255)),
+                ('reset_token', models.CharField(blank=True, max_length=100, null=True)),
+                ('reset_token_created_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'User',
+                'verbose_name_plural': 'Users',
+                'db_table': 'eventapp_user',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='AmusementPark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('park_name', models.CharField(max_length=200)),
+                ('description', models.TextField()),
+                ('location', models.CharField(max_length=200)),
+                ('date', models.DateField()),
+                ('time', models.TimeField()),
+                ('rides_available', models.IntegerField()),
+                ('family_friendly', models.BooleanField(default=True)),
+                ('ticket_price', models.DecimalField(decimal_places=2, max_digits=8)),
+                ('available_seats', models.PositiveIntegerField()),
+                ('image', models.ImageField(blank=True, null=True, upload_to='amusement_parks/')),
+            ],
+            options={
+                'verbose_name': 'Amusement Park',
+                'verbose_name_plural': 'Amusement Parks',
+                'db_table': 'eventapp_amusementpark',
+                'managed': True,
+            },
+        ),
+        migrations.CreateModel(
+            name='ComedyShow',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=200)),
+                ('description', models.TextField()),
+                ('location', models.CharField(max_length=200)),
+                ('date', models.DateField()),
+                ('time', models.TimeField()),
+                ('comedian_name', models.CharField(max_length=100)),
+                ('age_limit', models.PositiveIntegerField(default=18)),
+                ('total_seats', models.PositiveIntegerField()),
+                ('ticket_price', models.DecimalField(decimal_places=2, max_digits=8)),
+                ('available_seats', models.PositiveIntegerField()),
+                ('image', models.ImageField(blank=True, null=True, upload_to='comedy/')),
+                ('comedy_type', models.CharField(default='Stand-up', max_length=50)),
+                ('rating', models.DecimalField(decimal_places=1, default=4.5, max_digits=3)),
+                ('duration', models.PositiveIntegerField(default=90)),
+                ('popularity', models.CharField(default='Popular', max_length=20)),
+                ('experience', models.CharField(default='Professional Comedian', max_length=100)),
+            ],
+            options={
+                'verbose_name': 'Comedy Show',
+                'verbose_name_plural': 'Comedy Shows',
+                'db_table': 'eventapp_comedyshow',
+                'managed': True,
+            },
+        ),
+        migrations.CreateModel(
+            name='Event',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200)),
+                ('description', models.TextField()),
+                ('location', models.CharField(max_length=200)),
+                ('date', models.DateField()),
+                ('time', models.TimeField()),
+                ('total_seats', models.PositiveIntegerField()),
+                ('available_seats', models.PositiveIntegerField(default=0)),
+                ('ticket_price', models.DecimalField(decimal_places=2, max_digits=8)),
+                ('image', models.ImageField(blank=True, null=True, upload_to='events/')),
+            ],
+            options={
+                'verbose_name': 'Event',
+                'verbose_name_plural': 'Events',
+                'db_table': 'eventapp_event',
+                'managed': True,
+            },
+        ),
+        migrations.CreateModel(
+            name='LiveConcert',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=200)),
+                ('description', models.TextField()),
+                ('location', models.CharField(max_length=200)),
+                ('date', models.DateField()),
+                ('time', models.TimeField()),
+                ('artist_name', models.CharField(max_length=100)),
+                ('music_genre', models.CharField(max_length=100)),
+                ('vvip_ticket_price', models.DecimalField(decimal_places=2, default=2500, max_digits=8)),
+                ('vip_ticket_price', models.DecimalField(decimal_places=2, default=2000, max_digits=8)),
+                ('couples_ticket_price', models.DecimalField(decimal_places=2, default=1800, max_digits=8)),
+                ('normal_ticket_price', models.DecimalField(decimal_places=2, default=1500, max_digits=8)),
+                ('gst_percentage', models.DecimalField(decimal_places=2, default=18, max_digits=5)),
+                ('gst_amount', models.DecimalField(blank=True, decimal_places=2, max_digits=8, null=True)),
+                ('province_fee', models.DecimalField(decimal_places=2, default=2, max_digits=8)),
+                ('convenience_fee', models.DecimalField(decimal_places=2, default=5, max_digits=8)),
+                ('charity_fee', models.DecimalField(decimal_places=2, default=2, max_digits=8)),
+                ('available_seats', models.PositiveIntegerField()),
+                ('image', models.ImageField(blank=True, null=True, upload_to='concerts/')),
+            ],
+            options={
+                'verbose_name': 'Live Concert',
+                'verbose_name_plural': 'Live Concerts',
+                'db_table': 'eventapp_liveconcert',
+                'managed': True,
+            },
+        ),
+        migrations.CreateModel(
+            name='Movie',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=200)),
+                ('description', models.TextField()),
+                ('location', models.CharField(max_length=200)),
+                ('date', models.DateField()),
+                ('time', models.TimeField()),
+                ('language', models.CharField(max_length=50)),
+                ('duration', models.DurationField()),
+                ('director', models.CharField(blank=True, max_length=100, null=True)),
+                ('cast', models.TextField(blank=True, null=True)),
+                ('genre', models.CharField(max_length=100)),
+                ('ticket_price', models.DecimalField(decimal_places=2, max_digits=8)),
+                ('available_seats', models.PositiveIntegerField()),
+                ('image', models.ImageField(blank=True, null=True, upload_to='movies/')),
+                ('rating', models.DecimalField(decimal_places=1, default=4.0, max_digits=3)),
+                ('popularity', models.CharField(default='Hot', max_length=20)),
+            ],
+            options={
+                'verbose_name': 'Movie',
+                'verbose_name_plural': 'Movies',
+                'db_table': 'eventapp_movie',
+                'managed': True,
+            },
+        ),
+        migrations.CreateModel(
+            name='AmusementTicket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(max_length=20)),
+                ('sub_category', models.CharField(max_length=50)),
+                ('base_price', models.DecimalField(decimal_places=2, max_digits=8)),
+                ('discount_percent', models.PositiveIntegerField(default=0, help_text='Discount %')),
+                ('gst_percent', models.DecimalField(decimal_places=2, default=18.0, max_digits=5)),
+                ('gst_amount', models.DecimalField(decimal_places=2, default=0, max_digits=8)),
+                ('grand_total', models.DecimalField(decimal_places=2, default=0, max_digits=8)),
+                ('age_limit', models.CharField(blank=True, max_length=100, null=True)),
+                ('height_limit', models.CharField(blank=True, max_length=100, null=True)),
+                ('id_proof_required', models.BooleanField(default=False)),
+                ('amusement_park', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='admin_panel.amusementpark')),
+            ],
+            options={
+                'verbose_name': 'Amusement Ticket',
+                'verbose_name_plural': 'Amusement Tickets',
+                'db_table': 'eventapp_amusementticket',
+                'managed': True,
+            },
+        ),
+        migrations.CreateModel(
+            name='MovieScreen',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('screen_name', models.CharField(default='Screen 1', max_length=100)),
+                ('total_rows', models.PositiveIntegerField(default=10)),
+                ('seats_per_row', models.PositiveIntegerField(default=12)),
+                ('premium_price_multiplier', models.DecimalField(decimal_places=2, default=Decimal('750.00'), max_digits=5)),
+                ('executive_price_multiplier', models.DecimalField(decimal_places=2, default=Decimal('500.00'), max_digits=5)),
+                ('normal_price_multiplier', models.DecimalField(decimal_places=2, default=Decimal('350.00'), max_digits=5)),
+                ('premium_rows_end', models.PositiveIntegerField(default=3)),
+                ('executive_rows_end', models.PositiveIntegerField(default=6)),
+                ('movie', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='admin_panel.movie')),
+            ],
+            options={
+                'verbose_name': 'Movie Screen',
+                'verbose_name_plural': 'Movie Screens',
+                'db_table': 'eventapp_moviescreen',
+                'managed': True,
+            },
+        ),
+        migrations.CreateModel(
+            name='TheaterSeat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('row', models.CharField(max_length=2)),
+                ('number', models.PositiveIntegerField()),
+                ('seat_type', models.CharField(default='normal', max_length=20)),
+                ('price', models.DecimalField(decimal_places=2, default=0.0, max_digits=8)),
+                ('status', models.CharField(default='Available', max_length=20)),
+                ('screen', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='admin_panel.moviescreen')),
+            ],
+            options={
+                'verbose_name': 'Theater Seat',
+                'verbose_name_plural': 'Theater Seats',
+                'db_table': 'eventapp_theaterseat',
+                'managed': True,
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:18
+
+from django.db import migrations, models
+
+# Adds modified_at to the catalog tables whose list and detail pages answer
+# conditional GETs (see conditional.py). Existing rows are left NULL until
+# their next save; the row count in each version keeps the ETags honest.
+
+CATALOG_MODELS = ['amusementpark', 'comedyshow', 'event', 'liveconcert', 'movie', 'moviescreen']
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_panel', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name=model_name,
+            name='modified_at',
+            field=models.DateTimeField(auto_now=True, db_index=True, null=True),
+        )
+        for model_name in CATALOG_MODELS
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_panel', '0002_modified_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConcertFare',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tier', models.CharField(choices=[('vvip', 'VVIP'), ('vip', 'VIP'), ('couples', 'Couples'), ('normal', 'Normal')], max_length=20)),
+                ('base_price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('gst_amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('total_fees', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('total_amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('concert', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='fares', to='admin_panel.liveconcert')),
+            ],
+            options={
+                'verbose_name': 'Concert Fare',
+                'verbose_name_plural': 'Concert Fares',
+                'managed': True,
+                'unique_together': {('concert', 'tier')},
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:18
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_panel', '0004_reportjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActivityLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('action', models.CharField(choices=[('create', 'Create'), ('edit', 'Edit'), ('cancel', 'Cancel'), ('delete', 'Delete')], max_length=10)),
+                ('object_type', models.CharField(max_length=50)),
+                ('object_id', models.CharField(blank=True, default='', max_length=64)),
+                ('message', models.CharField(max_length=255)),
+                ('actor', models.CharField(blank=True, default='', max_length=150)),
+                ('created_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Activity Log',
+                'verbose_name_plural': 'Activity Log',
+                'ordering': ['-created_at'],
+                'managed': True,
+            },
+        ),
+    ]
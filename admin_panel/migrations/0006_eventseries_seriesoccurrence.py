@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_panel', '0005_activitylog'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventSeries',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('event', 'Event'), ('comedy', 'Comedy Show'), ('movie', 'Movie')], max_length=10)),
+                ('title', models.CharField(max_length=200)),
+                ('rule', models.CharField(max_length=255)),
+                ('source_id', models.PositiveIntegerField()),
+                ('starts_on', models.DateField()),
+                ('created_by', models.CharField(blank=True, default='', max_length=150)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Event Series',
+                'verbose_name_plural': 'Event Series',
+                'ordering': ['-created_at'],
+                'managed': True,
+            },
+        ),
+        migrations.CreateModel(
+            name='SeriesOccurrence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_id', models.PositiveIntegerField(db_index=True)),
+                ('date', models.DateField()),
+                ('series', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='occurrences', to='admin_panel.eventseries')),
+            ],
+            options={
+                'verbose_name': 'Series Occurrence',
+                'verbose_name_plural': 'Series Occurrences',
+                'ordering': ['date'],
+                'managed': True,
+                'unique_together': {('series', 'object_id')},
+            },
+        ),
+    ]
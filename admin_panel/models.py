@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 from decimal import Decimal
 from django.contrib.auth.models import User
 
@@ -223,6 +224,8 @@ class Event(models.Model):
     ticket_price = models.DecimalField(max_digits=8, decimal_places=2)
     # ⭐ CHANGED: CharField → ImageField (for uploads)
     image = models.ImageField(upload_to='events/', blank=True, null=True)
+    # Bumped on every save; drives ETags for the list/detail pages
+    modified_at = models.DateTimeField(auto_now=True, null=True, db_index=True)
     
     class Meta:
         managed = True  # ⭐ CHANGED: Can create/update
@@ -257,6 +260,7 @@ class Movie(models.Model):
     image = models.ImageField(upload_to='movies/', blank=True, null=True)
     rating = models.DecimalField(max_digits=3, decimal_places=1, default=4.0)
     popularity = models.CharField(max_length=20, default='Hot')
+    modified_at = models.DateTimeField(auto_now=True, null=True, db_index=True)
     
     class Meta:
         managed = True  # ⭐ CHANGED: Can create/update
@@ -278,6 +282,7 @@ class MovieScreen(models.Model):
     normal_price_multiplier = models.DecimalField(max_digits=5, decimal_places=2, default=Decimal('350.00'))
     premium_rows_end = models.PositiveIntegerField(default=3)
     executive_rows_end = models.PositiveIntegerField(default=6)
+    modified_at = models.DateTimeField(auto_now=True, null=True, db_index=True)
 
     class Meta:
         managed = True  # ⭐ CHANGED: Can create/update
@@ -325,6 +330,7 @@ class ComedyShow(models.Model):
     duration = models.PositiveIntegerField(default=90)
     popularity = models.CharField(max_length=20, default='Popular')
     experience = models.CharField(max_length=100, default='Professional Comedian')
+    modified_at = models.DateTimeField(auto_now=True, null=True, db_index=True)
 
     class Meta:
         managed = True  # ⭐ CHANGED: Can create/update
@@ -356,6 +362,7 @@ class LiveConcert(models.Model):
     available_seats = models.PositiveIntegerField()
     # ⭐ CHANGED: CharField → ImageField (for uploads)
     image = models.ImageField(upload_to='concerts/', blank=True, null=True)
+    modified_at = models.DateTimeField(auto_now=True, null=True, db_index=True)
 
     class Meta:
         managed = True  # ⭐ CHANGED: Can create/update
@@ -379,6 +386,7 @@ class AmusementPark(models.Model):
     available_seats = models.PositiveIntegerField()
     # ⭐ CHANGED: CharField → ImageField (for uploads)
     image = models.ImageField(upload_to='amusement_parks/', blank=True, null=True)
+    modified_at = models.DateTimeField(auto_now=True, null=True, db_index=True)
 
     class Meta:
         managed = True  # ⭐ CHANGED: Can create/update
@@ -410,4 +418,136 @@ class AmusementTicket(models.Model):
         verbose_name_plural = 'Amusement Tickets'
 
     def __str__(self):
-        return f"{self.amusement_park.park_name} – {self.category} – {self.sub_category}"
\ No newline at end of file
+        return f"{self.amusement_park.park_name} – {self.category} – {self.sub_category}"
+
+class ConcertFare(models.Model):
+    """Materialized customer-facing price for one LiveConcert ticket tier"""
+    TIER_CHOICES = [
+        ('vvip', 'VVIP'),
+        ('vip', 'VIP'),
+        ('couples', 'Couples'),
+        ('normal', 'Normal'),
+    ]
+
+    concert = models.ForeignKey(LiveConcert, on_delete=models.CASCADE, related_name='fares')
+    tier = models.CharField(max_length=20, choices=TIER_CHOICES)
+    base_price = models.DecimalField(max_digits=10, decimal_places=2)
+    gst_amount = models.DecimalField(max_digits=10, decimal_places=2)
+    total_fees = models.DecimalField(max_digits=10, decimal_places=2)
+    total_amount = models.DecimalField(max_digits=10, decimal_places=2)
+
+    class Meta:
+        managed = True
+        unique_together = ('concert', 'tier')
+        verbose_name = 'Concert Fare'
+        verbose_name_plural = 'Concert Fares'
+
+    def __str__(self):
+        return f"{self.concert_id} – {self.tier} – {self.total_amount}"
+
+
+class ReportJob(models.Model):
+    """One queued or finished report run; finished results are reused by params_hash"""
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+    FORMAT_CHOICES = [
+        ('html', 'HTML'),
+        ('json', 'JSON'),
+        ('csv', 'CSV'),
+    ]
+
+    report = models.CharField(max_length=50)
+    params = models.JSONField(default=dict)
+    output_format = models.CharField(max_length=10, choices=FORMAT_CHOICES, default='html')
+    params_hash = models.CharField(max_length=64, db_index=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    result = models.TextField(blank=True, default='')
+    error = models.TextField(blank=True, default='')
+    requested_by = models.CharField(max_length=150, blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        managed = True
+        ordering = ['-created_at']
+        verbose_name = 'Report Job'
+        verbose_name_plural = 'Report Jobs'
+
+    def __str__(self):
+        return f"{self.report} ({self.output_format}) – {self.status}"
+
+
+class ActivityLog(models.Model):
+    """Append-only audit trail of staff actions; written in batches by activity.py"""
+    ACTION_CHOICES = [
+        ('create', 'Create'),
+        ('edit', 'Edit'),
+        ('cancel', 'Cancel'),
+        ('delete', 'Delete'),
+    ]
+
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    object_type = models.CharField(max_length=50)
+    object_id = models.CharField(max_length=64, blank=True, default='')
+    message = models.CharField(max_length=255)
+    actor = models.CharField(max_length=150, blank=True, default='')
+    # Set when the action happens, not when the batch is written
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        managed = True
+        ordering = ['-created_at']
+        verbose_name = 'Activity Log'
+        verbose_name_plural = 'Activity Log'
+
+    def __str__(self):
+        return f"{self.created_at:%Y-%m-%d %H:%M} {self.action} {self.object_type} {self.object_id}"
+
+
+class EventSeries(models.Model):
+    """A recurrence rule expanded into catalog rows copied from one source row (see series.py)"""
+    KIND_CHOICES = [
+        ('event', 'Event'),
+        ('comedy', 'Comedy Show'),
+        ('movie', 'Movie'),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    title = models.CharField(max_length=200)
+    # RRULE subset, e.g. FREQ=WEEKLY;BYDAY=FR,SA;COUNT=12
+    rule = models.CharField(max_length=255)
+    source_id = models.PositiveIntegerField()
+    starts_on = models.DateField()
+    created_by = models.CharField(max_length=150, blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        managed = True
+        ordering = ['-created_at']
+        verbose_name = 'Event Series'
+        verbose_name_plural = 'Event Series'
+
+    def __str__(self):
+        return f"{self.title} ({self.rule})"
+
+
+class SeriesOccurrence(models.Model):
+    """One catalog row (Event, ComedyShow or Movie, by the series' kind) belonging to a series"""
+    series = models.ForeignKey(EventSeries, on_delete=models.CASCADE, related_name='occurrences')
+    object_id = models.PositiveIntegerField(db_index=True)
+    date = models.DateField()
+
+    class Meta:
+        managed = True
+        ordering = ['date']
+        unique_together = [('series', 'object_id')]
+        verbose_name = 'Series Occurrence'
+        verbose_name_plural = 'Series Occurrences'
+
+    def __str__(self):
+        return f"{self.series.title} on {self.date}"
@@ -0,0 +1,301 @@
+# admin_panel/querylog.py
+"""
+Per-fingerprint and per-URL query timing, with EXPLAIN for slow statements.
+
+SlowQueryMiddleware installs a connection.execute_wrapper() on every
+database connection for the duration of a request. Each statement is
+timed and folded into two aggregates: one keyed by its fingerprint (the
+index advisor's literal-free normalisation) and one keyed by the URL name
+of the request that ran it. Both keep count, total, max and a bounded
+sample of durations for p95.
+
+The first time a fingerprint runs longer than SLOW_QUERY_MS, its
+statement is EXPLAINed once, after the response is built, and the plan is
+stored with the fingerprint.
+
+Every process writes its aggregates to its own JSON file under
+SLOW_QUERY_DIR at most every SLOW_QUERY_DUMP_SECONDS; load() merges all of
+them for the staff page and the slow_queries command.
+"""
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from collections import deque
+from contextlib import ExitStack
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+from django.http import FileResponse
+
+from .index_advisor import fingerprint as normalize
+
+SLOW_QUERY_MS = getattr(settings, 'SLOW_QUERY_MS', 100)
+DUMP_INTERVAL = getattr(settings, 'SLOW_QUERY_DUMP_SECONDS', 30)
+LOG_DIR = Path(getattr(settings, 'SLOW_QUERY_DIR', Path(settings.BASE_DIR) / 'slow_queries'))
+SAMPLES = 200
+MAX_FINGERPRINTS = 2000
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(sql):
+    # Django's SQL carries %s placeholders, so the same text repeats and the cache hits
+    return normalize(sql)
+
+
+class Stat:
+    """count / total / max and a sliding sample of durations (ms)"""
+    __slots__ = ('count', 'total', 'max', 'samples')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = deque(maxlen=SAMPLES)
+
+    def add(self, ms):
+        self.count += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+        self.samples.append(ms)
+
+    def merge(self, data):
+        self.count += data['count']
+        self.total += data['total']
+        self.max = max(self.max, data['max'])
+        self.samples.extend(data['samples'])
+
+    @property
+    def p95(self):
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[max(int(len(ordered) * 0.95) - 1, 0)]
+
+    def as_dict(self):
+        return {'count': self.count, 'total': round(self.total, 3), 'max': round(self.max, 3),
+                'samples': [round(ms, 3) for ms in self.samples]}
+
+    def summary(self):
+        return {'count': self.count, 'total_ms': round(self.total, 1), 'avg_ms': round(self.total / self.count, 2),
+                'p95_ms': round(self.p95, 2), 'max_ms': round(self.max, 2)}
+
+
+class QueryLog:
+    """Aggregates for this process"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clear()
+        self.last_dump = time.monotonic()
+
+    def _clear(self):
+        self.fingerprints = {}
+        self.urls = {}
+        # fingerprint -> {url name: count}
+        self.fingerprint_urls = {}
+        self.examples = {}
+        self.plans = {}
+        self.full = False
+
+    def record(self, url_name, timings):
+        with self._lock:
+            url_stat = self.urls.setdefault(url_name, Stat())
+            for key, sql, ms in timings:
+                stat = self.fingerprints.get(key)
+                if stat is None:
+                    if len(self.fingerprints) >= MAX_FINGERPRINTS:
+                        if not self.full:
+                            self.full = True
+                            logger.warning("Query log holds %d fingerprints; new ones are not recorded "
+                                           "until it is cleared", MAX_FINGERPRINTS)
+                        continue
+                    stat = self.fingerprints[key] = Stat()
+                    self.examples[key] = sql
+                stat.add(ms)
+                url_stat.add(ms)
+                by_url = self.fingerprint_urls.setdefault(key, {})
+                by_url[url_name] = by_url.get(url_name, 0) + 1
+
+    def needs_plan(self, key):
+        return key not in self.plans
+
+    def set_plan(self, key, plan):
+        with self._lock:
+            self.plans[key] = plan
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                'fingerprints': {
+                    key: {**stat.as_dict(), 'example': self.examples.get(key, ''),
+                          'plan': self.plans.get(key), 'urls': self.fingerprint_urls.get(key, {})}
+                    for key, stat in self.fingerprints.items()
+                },
+                'urls': {name: stat.as_dict() for name, stat in self.urls.items()},
+            }
+
+    def reset(self):
+        with self._lock:
+            self._clear()
+
+    # ----- persistence -----
+
+    @property
+    def path(self):
+        return LOG_DIR / f"{socket.gethostname()}-{os.getpid()}.json"
+
+    def maybe_dump(self):
+        if time.monotonic() - self.last_dump >= DUMP_INTERVAL:
+            self.dump()
+
+    def dump(self):
+        self.last_dump = time.monotonic()
+        try:
+            LOG_DIR.mkdir(parents=True, exist_ok=True)
+            temporary = self.path.with_suffix('.tmp')
+            temporary.write_text(json.dumps(self.as_dict()))
+            os.replace(temporary, self.path)
+        except OSError:
+            logger.exception("Could not write the query log to %s", LOG_DIR)
+
+
+log = QueryLog()
+
+
+def load(include_live=True):
+    """Merge every process's file (and this process's live numbers) into fingerprint and URL summaries"""
+    sources = []
+    if LOG_DIR.is_dir():
+        for path in LOG_DIR.glob('*.json'):
+            if include_live and path == log.path:
+                continue
+            try:
+                sources.append(json.loads(path.read_text()))
+            except (OSError, ValueError):
+                continue
+    if include_live:
+        sources.append(log.as_dict())
+
+    fingerprints, urls = {}, {}
+    for data in sources:
+        for key, entry in data['fingerprints'].items():
+            merged = fingerprints.get(key)
+            if merged is None:
+                merged = fingerprints[key] = {'stat': Stat(), 'example': entry['example'], 'plan': None, 'urls': {}}
+            merged['stat'].merge(entry)
+            merged['plan'] = merged['plan'] or entry.get('plan')
+            for name, count in entry.get('urls', {}).items():
+                merged['urls'][name] = merged['urls'].get(name, 0) + count
+        for name, entry in data['urls'].items():
+            urls.setdefault(name, Stat()).merge(entry)
+
+    return (
+        [{'fingerprint': key, **entry['stat'].summary(), 'example': entry['example'], 'plan': entry['plan'],
+          'urls': sorted(entry['urls'].items(), key=lambda item: -item[1])}
+         for key, entry in fingerprints.items()],
+        [{'url_name': name, **stat.summary()} for name, stat in urls.items()],
+    )
+
+
+def clear():
+    """Forget this process's numbers and delete every process's file"""
+    log.reset()
+    if LOG_DIR.is_dir():
+        for path in LOG_DIR.glob('*.json'):
+            path.unlink(missing_ok=True)
+
+
+# ----- capture -----
+
+def explain(connection, sql, params):
+    """EXPLAIN output as text, or None for statements that cannot be explained"""
+    if not sql.lstrip().upper().startswith('SELECT'):
+        return None
+    _local.explaining = True
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN {sql}", params)
+            columns = [column[0] for column in cursor.description or ()]
+            rows = cursor.fetchall()
+    except Exception as e:
+        return f"EXPLAIN failed: {e}"
+    finally:
+        _local.explaining = False
+    lines = [' | '.join(columns)] if columns else []
+    lines.extend(' | '.join('' if value is None else str(value) for value in row) for row in rows)
+    return '\n'.join(lines)
+
+
+class _Recorder:
+    def __init__(self, connection):
+        self.connection = connection
+        self.timings = []
+        self.slow = []
+
+    def __call__(self, execute, sql, params, many, context):
+        if getattr(_local, 'explaining', False):
+            return execute(sql, params, many, context)
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            ms = (time.perf_counter() - started) * 1000
+            key = fingerprint(sql)
+            self.timings.append((key, sql, ms))
+            if ms >= SLOW_QUERY_MS and not many and log.needs_plan(key):
+                self.slow.append((key, sql, params))
+
+
+class SlowQueryMiddleware:
+    """Time every query of a request and attribute it to the request's URL name"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorders = [_Recorder(connection) for connection in connections.all()]
+        with self._recording(recorders):
+            response = self.get_response(request)
+
+        if response.streaming and not isinstance(response, FileResponse):
+            # Streamed list pages run their row queries while the body is being sent
+            response.streaming_content = self._streamed(response.streaming_content, request, recorders)
+        else:
+            self._finish(request, recorders)
+        return response
+
+    @staticmethod
+    def _recording(recorders):
+        stack = ExitStack()
+        for recorder in recorders:
+            stack.enter_context(recorder.connection.execute_wrapper(recorder))
+        return stack
+
+    def _streamed(self, content, request, recorders):
+        try:
+            with self._recording(recorders):
+                yield from content
+        finally:
+            self._finish(request, recorders)
+
+    def _finish(self, request, recorders):
+        match = getattr(request, 'resolver_match', None)
+        url_name = (match.view_name if match else None) or request.path
+        for recorder in recorders:
+            if recorder.timings:
+                log.record(url_name, recorder.timings)
+            # Plans are taken after the response is built, once per fingerprint
+            for key, sql, params in recorder.slow:
+                if log.needs_plan(key):
+                    log.set_plan(key, explain(recorder.connection, sql, params))
+        log.maybe_dump()
@@ -0,0 +1,197 @@
+# admin_panel/reconcile.py
+"""
+Offline reconciliation of payment gateway settlement files against bookings.
+
+read_settlements() streams a settlement export (CSV, JSON Lines or a JSON
+array) one line at a time. Reconciler takes the lines CHUNK at a time,
+builds an order id -> line hash table for the chunk and probes every
+booking table that stores razorpay_order_id with chunked values_list()
+IN lookups, so memory is bounded by the chunk size and not the file size.
+
+Each settlement line lands in exactly one category:
+
+* matched          booking found, amount and payment state agree
+* missing          no booking carries the line's order id
+* amount_mismatch  booking found, amounts differ by more than a paisa
+* status_mismatch  amounts agree but the booking's payment_status does not
+                   say what the settlement says (paid for payments,
+                   not paid for refunds)
+* invalid          the line has no order id or no readable amount
+
+With apply=True, status mismatches are corrected with one update() per
+table per chunk; amount mismatches are only reported.
+"""
+import csv
+import json
+from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+
+from .bookings import BOOKING_SOURCES, is_paid, payment_state
+
+CHUNK = 5000
+LOOKUP_BATCH = 1000
+TOLERANCE = Decimal('0.01')
+
+CATEGORIES = ('matched', 'missing', 'amount_mismatch', 'status_mismatch', 'invalid')
+REFUND_TYPES = {'refund', 'reversal'}
+
+# Only the tables that store the gateway's order id can be reconciled
+SOURCES = tuple(
+    source for source in BOOKING_SOURCES
+    if any(f.name == 'razorpay_order_id' for f in source.model._meta.get_fields())
+)
+
+
+@dataclass
+class SettlementLine:
+    number: int
+    order_id: str
+    payment_id: str
+    amount: Decimal
+    refund: bool
+
+
+@dataclass
+class Result:
+    line: SettlementLine
+    category: str
+    vertical: str = ''
+    booking_id: int = None
+    booking_amount: Decimal = None
+    booking_status: str = ''
+
+
+# ----- reading -----
+
+def _json_array(handle, size=1 << 16):
+    """Objects of a top-level JSON array, decoded incrementally"""
+    decoder = json.JSONDecoder()
+    buffer, started = '', False
+    while True:
+        chunk = handle.read(size)
+        buffer += chunk
+        position = 0
+        while True:
+            while position < len(buffer) and buffer[position] in ' \t\r\n,[':
+                if buffer[position] == '[':
+                    started = True
+                position += 1
+            if position < len(buffer) and buffer[position] == ']':
+                return
+            try:
+                item, position = decoder.raw_decode(buffer, position)
+            except ValueError:
+                break
+            if not started:
+                raise ValueError("Expected a JSON array of settlement lines")
+            yield item
+        buffer = buffer[position:]
+        if not chunk:
+            if buffer.strip():
+                raise ValueError("Settlement file ends in the middle of a JSON value")
+            return
+
+
+def _records(path, fmt):
+    with open(path, newline='', encoding='utf-8-sig') as handle:
+        if fmt == 'csv':
+            yield from csv.DictReader(handle)
+        elif fmt == 'jsonl':
+            for line in handle:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from _json_array(handle)
+
+
+def read_settlements(path, fmt=None, order_column='order_id', payment_column='entity_id',
+                     amount_column='amount', type_column='type', paise=False):
+    """Stream SettlementLines from a CSV, JSON Lines or JSON array export"""
+    fmt = fmt or ('csv' if path.endswith('.csv') else 'jsonl' if path.endswith(('.jsonl', '.ndjson')) else 'json')
+    for number, record in enumerate(_records(path, fmt), start=1):
+        try:
+            amount = Decimal(str(record.get(amount_column, '')).replace(',', '').strip())
+        except InvalidOperation:
+            amount = None
+        if amount is not None and paise:
+            amount = amount / 100
+        yield SettlementLine(
+            number=number,
+            order_id=str(record.get(order_column) or '').strip(),
+            payment_id=str(record.get(payment_column) or '').strip(),
+            amount=amount,
+            refund=str(record.get(type_column) or '').strip().lower() in REFUND_TYPES,
+        )
+
+
+# ----- matching -----
+
+class Reconciler:
+    def __init__(self, apply=False, chunk=CHUNK):
+        self.apply = apply
+        self.chunk = chunk
+        self.counts = {category: 0 for category in CATEGORIES}
+        self.by_vertical = {source.vertical: {category: 0 for category in CATEGORIES} for source in SOURCES}
+        self.updated = 0
+        self.lines = 0
+
+    def run(self, lines):
+        """Yield a Result for every line, one chunk at a time"""
+        batch = []
+        for line in lines:
+            batch.append(line)
+            if len(batch) >= self.chunk:
+                yield from self._reconcile(batch)
+                batch = []
+        if batch:
+            yield from self._reconcile(batch)
+
+    def _reconcile(self, batch):
+        self.lines += len(batch)
+        table = {}
+        results = []
+        for line in batch:
+            if not line.order_id or line.amount is None:
+                results.append(Result(line, 'invalid'))
+            else:
+                table.setdefault(line.order_id, []).append(line)
+
+        found = {}
+        keys = list(table)
+        for source in SOURCES:
+            for start in range(0, len(keys), LOOKUP_BATCH):
+                rows = (source.model.objects
+                        .filter(razorpay_order_id__in=keys[start:start + LOOKUP_BATCH])
+                        .values_list('pk', 'razorpay_order_id', source.amount_field, 'payment_status'))
+                for pk, order_id, amount, status in rows:
+                    found.setdefault(order_id, (source, pk, amount, status))
+
+        fixes = {}
+        for order_id, lines in table.items():
+            if order_id not in found:
+                results.extend(Result(line, 'missing') for line in lines)
+                continue
+            source, pk, amount, status = found[order_id]
+            for line in lines:
+                result = Result(line, 'matched', source.vertical, pk, amount, payment_state(status))
+                if amount is None or abs(amount - line.amount) > TOLERANCE:
+                    result.category = 'amount_mismatch'
+                # A payment and its refund share an order id; only the last line says what the state should be
+                elif line is lines[-1] and is_paid(status) == line.refund:
+                    result.category = 'status_mismatch'
+                    fixes.setdefault((source, not line.refund), []).append(pk)
+                results.append(result)
+
+        if self.apply and fixes:
+            with transaction.atomic():
+                for (source, paid), pks in fixes.items():
+                    value = ('paid' if paid else 'refunded') if source.payment_text else paid
+                    self.updated += source.model.objects.filter(pk__in=pks).update(payment_status=value)
+
+        for result in results:
+            self.counts[result.category] += 1
+            if result.vertical:
+                self.by_vertical[result.vertical][result.category] += 1
+        return results
@@ -0,0 +1,208 @@
+# admin_panel/reports.py
+"""
+Report definitions and their HTML / JSON / CSV renderers.
+
+A report is a function of a params dict returning
+``{'title': ..., 'sections': [{'title', 'columns', 'rows'}]}``. Reports run
+inside the job workers (see jobs.py), never on the request thread, so they
+are free to scan every booking table.
+"""
+import csv
+import io
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Callable
+
+from django.db.models import Count, Sum
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from . import archive, fares, histogram
+from .api import dumps
+from .bookings import BOOKING_SOURCES, get_source, payment_state
+from .models import Event, BookingsEvent, ConcertFare, LiveConcert
+
+FORMATS = {
+    'html': 'text/html; charset=utf-8',
+    'json': 'application/json',
+    'csv': 'text/csv; charset=utf-8',
+}
+
+
+@dataclass(frozen=True)
+class Report:
+    name: str
+    title: str
+    build: Callable[[dict], dict]
+    # Seconds a finished result is served again for the same parameters
+    freshness: int = 300
+    params: tuple = ('start', 'end')
+
+    def clean_params(self, params):
+        """Keep only the parameters this report understands, as strings"""
+        return {key: str(params[key]) for key in self.params if params.get(key)}
+
+
+REPORTS = {}
+
+
+def report(name, title, freshness=300, params=('start', 'end')):
+    def register(build):
+        REPORTS[name] = Report(name=name, title=title, build=build, freshness=freshness, params=params)
+        return build
+    return register
+
+
+def get_report(name):
+    try:
+        return REPORTS[name]
+    except KeyError:
+        raise ValueError(f"Unknown report: {name}")
+
+
+def _date_range(params, default_days=30):
+    end = parse_date(params.get('end', '')) or date.today()
+    start = parse_date(params.get('start', '')) or end - timedelta(days=default_days)
+    return start, end
+
+
+# ----- reports -----
+
+@report('events', 'Event Report')
+def events_report(params):
+    today = date.today()
+    last_week = today - timedelta(days=7)
+    last_month = today - timedelta(days=30)
+
+    events = [
+        ('Total', Event.objects.count()),
+        ('This week', Event.objects.filter(date__gte=last_week).count()),
+        ('This month', Event.objects.filter(date__gte=last_month).count()),
+        ('Upcoming', Event.objects.filter(date__gte=today).count()),
+    ]
+    # Archived bookings still count towards the all-time figures
+    def count(**filters):
+        return sum(queryset.count() for queryset in archive.with_archive(BookingsEvent, **filters))
+
+    revenue = sum(queryset.aggregate(Sum('total_amount'))['total_amount__sum'] or 0
+                  for queryset in archive.with_archive(BookingsEvent))
+    bookings = [
+        ('Total', count()),
+        ('This week', count(booking_date__gte=last_week)),
+        ('This month', count(booking_date__gte=last_month)),
+        ('Revenue', revenue),
+    ]
+    return {
+        'title': 'Event Report',
+        'sections': [
+            {'title': 'Events', 'columns': ['Period', 'Events'], 'rows': events},
+            {'title': 'Bookings', 'columns': ['Period', 'Bookings'], 'rows': bookings},
+        ],
+    }
+
+
+@report('revenue', 'Revenue by Vertical', freshness=600)
+def revenue_report(params):
+    start, end = _date_range(params)
+    totals, by_payment = [], []
+    for source in BOOKING_SOURCES:
+        # A plain datetime range, so an index on the date column can be used; ranges
+        # older than the archive horizon are read from the archive as well
+        querysets = archive.with_archive(source.model, **{
+            f'{source.date_field}__gte': timezone.make_aware(datetime.combine(start, time.min)),
+            f'{source.date_field}__lt': timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min)),
+        })
+        aggregates = {'bookings': Count('pk'), 'revenue': Sum(source.amount_field)}
+        if source.tickets_field:
+            aggregates['tickets'] = Sum(source.tickets_field)
+        bookings = tickets = revenue = 0
+        states = {}
+        for queryset in querysets:
+            row = queryset.aggregate(**aggregates)
+            bookings += row['bookings']
+            tickets += row.get('tickets') or 0
+            revenue += row['revenue'] or 0
+            for status, count, amount in (queryset.values('payment_status')
+                                          .annotate(count=Count('pk'), revenue=Sum(source.amount_field))
+                                          .values_list('payment_status', 'count', 'revenue')):
+                state = states.setdefault(payment_state(status), [0, 0])
+                state[0] += count
+                state[1] += amount or 0
+        totals.append((source.label, bookings, tickets, revenue))
+        by_payment.extend((source.label, state, count, revenue) for state, (count, revenue) in sorted(states.items()))
+
+    return {
+        'title': f'Revenue by Vertical ({start} – {end})',
+        'sections': [
+            {'title': 'Totals', 'columns': ['Vertical', 'Bookings', 'Tickets', 'Revenue'], 'rows': totals},
+            {'title': 'By payment status', 'columns': ['Vertical', 'Payment', 'Bookings', 'Revenue'],
+             'rows': by_payment},
+        ],
+    }
+
+
+@report('bookings_range', 'Bookings over Time', params=('start', 'end', 'granularity', 'vertical'))
+def bookings_range_report(params):
+    start, end = _date_range(params)
+    granularity = params.get('granularity') or 'day'
+    verticals = [vertical for vertical in params.get('vertical', '').split(',') if vertical]
+    data = histogram.booking_histogram(start, end, granularity, verticals)
+
+    labels = [get_source(vertical).label for vertical in data['series']]
+    rows = []
+    for i, bucket in enumerate(data['buckets']):
+        rows.append([bucket]
+                    + [data['series'][vertical]['bookings'][i] for vertical in data['series']]
+                    + [data['total']['bookings'][i], data['total']['tickets'][i], data['total']['revenue'][i]])
+    return {
+        'title': f'Bookings over Time ({start} – {end}, by {granularity})',
+        'sections': [
+            {'title': 'Bookings per bucket',
+             'columns': ['Bucket', *labels, 'Total bookings', 'Tickets', 'Revenue'],
+             'rows': rows},
+        ],
+    }
+
+
+@report('concert_fares', 'Concert Fares')
+def concert_fares_report(params):
+    # Fares matter for concerts still on sale: default to the next 90 days
+    start = parse_date(params.get('start', '')) or date.today()
+    end = parse_date(params.get('end', '')) or start + timedelta(days=90)
+    concerts = list(LiveConcert.objects.filter(date__gte=start, date__lte=end)
+                    .order_by('date', 'pk').values_list('pk', 'title', 'date'))
+    table = fares.get_fare_table([pk for pk, _, _ in concerts])
+
+    tiers = list(fares.TIER_PRICE_FIELDS)
+    labels = dict(ConcertFare.TIER_CHOICES)
+    rows = []
+    for pk, title, when in concerts:
+        by_tier = {fare['tier']: fare for fare in table.get(pk, [])}
+        rows.append([title, when, *(by_tier[tier]['total_amount'] if tier in by_tier else '' for tier in tiers)])
+    return {
+        'title': f'Concert Fares ({start} – {end})',
+        'sections': [
+            {'title': 'Total per ticket, incl. GST and fees',
+             'columns': ['Concert', 'Date', *(labels[tier] for tier in tiers)],
+             'rows': rows},
+        ],
+    }
+
+
+# ----- rendering -----
+
+def render_result(data, output_format):
+    """Serialize a report's data; returns the stored text"""
+    if output_format == 'json':
+        return dumps(data).decode()
+    if output_format == 'csv':
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for section in data['sections']:
+            writer.writerow([section['title']])
+            writer.writerow(section['columns'])
+            writer.writerows(section['rows'])
+            writer.writerow([])
+        return buffer.getvalue()
+    return render_to_string('admin_panel/reports/result.html', {'report': data})
@@ -0,0 +1,132 @@
+# admin_panel/repricing.py
+"""
+Set-based repricing of theater seats.
+
+A screen's seat types and prices follow from its row boundaries and its
+three prices: rows up to premium_rows_end are Premium, rows up to
+executive_rows_end are Executive, the rest are Normal. Seats are created
+that way by admin_movie_screen, but editing the screen used to leave them
+as they were.
+
+reprice() compares every (screen, row) group of seats with what the
+screen now says, using one GROUP BY query, and rewrites the groups that
+differ with a single UPDATE ... SET seat_type = CASE ..., price = CASE ...
+keyed on screen and row label. Nothing is loaded per seat, so the cost does
+not grow with the number of seats in a row. With dry_run the changes are
+only returned.
+"""
+import string
+from dataclasses import dataclass
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Case, CharField, Count, DecimalField, F, Q, Value, When
+
+from . import seatmap
+from .models import TheaterSeat
+
+TIERS = ('Premium', 'Executive', 'Normal')
+
+
+def row_label(row_num):
+    """1 -> 'A', 26 -> 'Z'; rows past 26 are 'Z27', 'Z28', ..."""
+    return string.ascii_uppercase[row_num - 1] if row_num <= 26 else f"Z{row_num}"
+
+
+def row_number(label):
+    """Inverse of row_label(); None for labels it never produces"""
+    if len(label) == 1 and label in string.ascii_uppercase:
+        return string.ascii_uppercase.index(label) + 1
+    if label.startswith('Z') and label[1:].isdigit():
+        return int(label[1:])
+    return None
+
+
+def seat_tier(screen, row_num):
+    """(seat_type, price) for a row of ``screen``"""
+    if row_num <= int(screen.premium_rows_end):
+        return 'Premium', _price(screen.premium_price_multiplier)
+    if row_num <= int(screen.executive_rows_end):
+        return 'Executive', _price(screen.executive_price_multiplier)
+    return 'Normal', _price(screen.normal_price_multiplier)
+
+
+def _price(value):
+    # Views assign the raw POST strings before saving
+    return Decimal(str(value)).quantize(Decimal('0.01'))
+
+
+@dataclass
+class RowChange:
+    screen_id: int
+    row: str
+    seats: int
+    old_type: str
+    old_price: Decimal
+    new_type: str
+    new_price: Decimal
+
+    def as_dict(self):
+        return {
+            'screen': self.screen_id,
+            'row': self.row,
+            'seats': self.seats,
+            'from': [self.old_type, str(self.old_price)],
+            'to': [self.new_type, str(self.new_price)],
+        }
+
+
+def diff(screens):
+    """RowChanges needed to bring the seats of ``screens`` in line with their pricing"""
+    by_id = {screen.pk: screen for screen in screens}
+    groups = (TheaterSeat.objects.filter(screen_id__in=by_id)
+              .values('screen_id', 'row', 'seat_type', 'price')
+              .annotate(seats=Count('id'))
+              .order_by('screen_id', 'row'))
+    changes = []
+    for group in groups:
+        number = row_number(group['row'])
+        if number is None:
+            continue
+        new_type, new_price = seat_tier(by_id[group['screen_id']], number)
+        if group['seat_type'] != new_type or group['price'] != new_price:
+            changes.append(RowChange(
+                group['screen_id'], group['row'], group['seats'],
+                group['seat_type'], group['price'], new_type, new_price,
+            ))
+    return changes
+
+
+def reprice(screens, dry_run=False):
+    """Apply diff(screens) in one UPDATE; returns (changes, seats updated)"""
+    screens = list(screens)
+    with transaction.atomic():
+        changes = diff(screens)
+        if dry_run or not changes:
+            return changes, 0
+
+        # (screen, type, price) -> row labels, so each CASE branch covers a range of rows
+        targets = {}
+        for change in changes:
+            targets.setdefault((change.screen_id, change.new_type, change.new_price), []).append(change.row)
+        conditions = [Q(screen_id=screen_id, row__in=rows) for (screen_id, _, _), rows in targets.items()]
+        where = conditions[0]
+        for condition in conditions[1:]:
+            where |= condition
+
+        updated = TheaterSeat.objects.filter(where).update(
+            seat_type=Case(
+                *[When(condition, then=Value(seat_type))
+                  for condition, (_, seat_type, _) in zip(conditions, targets)],
+                default=F('seat_type'), output_field=CharField(),
+            ),
+            price=Case(
+                *[When(condition, then=Value(price))
+                  for condition, (_, _, price) in zip(conditions, targets)],
+                default=F('price'), output_field=DecimalField(max_digits=8, decimal_places=2),
+            ),
+        )
+        # update() sends no signals; one layout marker per screen sends clients back to the full map
+        for screen_id in {change.screen_id for change in changes}:
+            transaction.on_commit(lambda screen_id=screen_id: seatmap.record_layout_change(screen_id))
+    return changes, updated
@@ -0,0 +1,223 @@
+# admin_panel/seat_holds.py
+"""
+Short-lived seat holds while a cashier completes a movie booking.
+
+A hold covers a set of seats on one screen and is taken all or nothing:
+either every seat is free (never held, released, or past its expiry) and
+all of them become ours, or nothing changes and the conflicting seats are
+reported. Expiry is lazy: an expired hold simply stops counting as taken
+the next time somebody looks, so no background sweep is needed.
+
+Two backends:
+
+* CacheHoldBackend (the default) stores one cache key per seat, created
+  with cache.add() (set-if-absent) and the hold TTL as the key timeout.
+  Shared across workers because the default cache is (settings require
+  REDIS_URL outside DEBUG).
+* LocalHoldBackend keeps holds in a dict guarded by one lock per screen.
+  Only correct when a single process serves the seat pages, so it is
+  refused outside DEBUG.
+"""
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+
+from .models import TheaterSeat
+
+DEFAULT_TTL = getattr(settings, 'SEAT_HOLD_TTL', 300)
+HOLD_KEY = 'seathold:{}:{}'
+
+
+@dataclass(frozen=True)
+class Hold:
+    token: str
+    screen_id: int
+    seat_ids: tuple
+    holder: str
+    expires_at: float  # unix time
+
+    def as_dict(self):
+        return {
+            'token': self.token,
+            'screen': self.screen_id,
+            'seats': list(self.seat_ids),
+            'holder': self.holder,
+            'expires_at': self.expires_at,
+        }
+
+
+class HoldConflict(Exception):
+    """Some of the requested seats are held by someone else"""
+
+    def __init__(self, seat_ids):
+        super().__init__(f"Seats already held: {', '.join(map(str, seat_ids))}")
+        self.seat_ids = seat_ids
+
+
+class LocalHoldBackend:
+    """In-process holds: {screen_id: {seat_id: (token, holder, expires_monotonic)}}"""
+
+    def __init__(self):
+        self._screens = {}
+        self._locks = {}
+        self._sizes = {}
+        self._guard = threading.Lock()
+
+    def _lock(self, screen_id):
+        lock = self._locks.get(screen_id)
+        if lock is None:
+            with self._guard:
+                lock = self._locks.setdefault(screen_id, threading.Lock())
+        return lock
+
+    def acquire(self, screen_id, seat_ids, token, holder, ttl):
+        now = time.monotonic()
+        with self._lock(screen_id):
+            seats = self._screens.setdefault(screen_id, {})
+            taken = [
+                seat_id for seat_id in seat_ids
+                if seat_id in seats and seats[seat_id][2] > now and seats[seat_id][0] != token
+            ]
+            if taken:
+                raise HoldConflict(taken)
+            for seat_id in seat_ids:
+                seats[seat_id] = (token, holder, now + ttl)
+            self._prune(screen_id, seats, now)
+
+    def _prune(self, screen_id, seats, now):
+        # Expired entries are dead weight, not a correctness issue; drop them when the dict has doubled
+        if len(seats) > 2 * self._sizes.get(screen_id, 32):
+            for seat_id in [s for s, entry in seats.items() if entry[2] <= now]:
+                del seats[seat_id]
+            self._sizes[screen_id] = max(len(seats), 32)
+
+    def release(self, screen_id, seat_ids, token):
+        with self._lock(screen_id):
+            seats = self._screens.get(screen_id, {})
+            for seat_id in seat_ids:
+                if seat_id in seats and seats[seat_id][0] == token:
+                    del seats[seat_id]
+
+    def held(self, screen_id, seat_ids):
+        return {seat_id: entry[1] for seat_id, entry in self._live(screen_id, seat_ids).items()}
+
+    def tokens(self, screen_id, seat_ids):
+        return {seat_id: entry[0] for seat_id, entry in self._live(screen_id, seat_ids).items()}
+
+    def _live(self, screen_id, seat_ids):
+        now = time.monotonic()
+        with self._lock(screen_id):
+            seats = self._screens.get(screen_id, {})
+            return {
+                seat_id: seats[seat_id] for seat_id in seat_ids
+                if seat_id in seats and seats[seat_id][2] > now
+            }
+
+
+class CacheHoldBackend:
+    """One cache key per held seat, taken with the atomic cache.add()"""
+
+    def acquire(self, screen_id, seat_ids, token, holder, ttl):
+        added = []
+        # A fixed order means two overlapping requests collide on the same first seat
+        for seat_id in sorted(seat_ids):
+            key = HOLD_KEY.format(screen_id, seat_id)
+            if cache.add(key, (token, holder), timeout=ttl) or self._is_ours(key, token, holder, ttl):
+                added.append(seat_id)
+                continue
+            self.release(screen_id, added, token)
+            raise HoldConflict(list(self.held(screen_id, seat_ids)) or [seat_id])
+
+    @staticmethod
+    def _is_ours(key, token, holder, ttl):
+        # Re-acquiring with the same token extends our own hold
+        if cache.get(key) == (token, holder):
+            cache.set(key, (token, holder), timeout=ttl)
+            return True
+        return False
+
+    def release(self, screen_id, seat_ids, token):
+        keys = [HOLD_KEY.format(screen_id, seat_id) for seat_id in seat_ids]
+        current = cache.get_many(keys)
+        cache.delete_many([key for key, value in current.items() if value[0] == token])
+
+    def held(self, screen_id, seat_ids):
+        return {seat_id: value[1] for seat_id, value in self._live(screen_id, seat_ids).items()}
+
+    def tokens(self, screen_id, seat_ids):
+        return {seat_id: value[0] for seat_id, value in self._live(screen_id, seat_ids).items()}
+
+    @staticmethod
+    def _live(screen_id, seat_ids):
+        keys = {HOLD_KEY.format(screen_id, seat_id): seat_id for seat_id in seat_ids}
+        return {keys[key]: value for key, value in cache.get_many(list(keys)).items()}
+
+
+BACKENDS = {
+    'local': LocalHoldBackend,
+    'cache': CacheHoldBackend,
+}
+
+
+class SeatHoldManager:
+    """Takes, extends and releases all-or-nothing holds on a screen's seats"""
+
+    def __init__(self, backend, ttl=DEFAULT_TTL):
+        self.backend = backend
+        self.ttl = ttl
+
+    def hold(self, screen_id, seat_ids, holder, token=None, ttl=None, check_status=True):
+        """Hold every seat in ``seat_ids`` or raise HoldConflict; pass ``token`` to extend a hold"""
+        seat_ids = tuple(sorted(set(int(seat_id) for seat_id in seat_ids)))
+        if not seat_ids:
+            raise ValueError("No seats given")
+        if check_status:
+            available = set(TheaterSeat.objects.filter(
+                screen_id=screen_id, pk__in=seat_ids, status='Available',
+            ).values_list('pk', flat=True))
+            if len(available) != len(seat_ids):
+                raise HoldConflict([seat_id for seat_id in seat_ids if seat_id not in available])
+
+        ttl = ttl or self.ttl
+        token = token or uuid.uuid4().hex
+        self.backend.acquire(screen_id, seat_ids, token, str(holder), ttl)
+        return Hold(token=token, screen_id=screen_id, seat_ids=seat_ids, holder=str(holder),
+                    expires_at=time.time() + ttl)
+
+    def release(self, screen_id, seat_ids, token):
+        self.backend.release(screen_id, [int(seat_id) for seat_id in seat_ids], token)
+
+    def held_seats(self, screen_id, seat_ids, exclude_token=None):
+        """{seat_id: holder} for the seats in ``seat_ids`` that are currently held (except under ``exclude_token``)"""
+        seat_ids = list(seat_ids)
+        held = self.backend.held(screen_id, seat_ids)
+        if exclude_token:
+            ours = self.backend.tokens(screen_id, seat_ids)
+            held = {seat_id: holder for seat_id, holder in held.items() if ours.get(seat_id) != exclude_token}
+        return held
+
+    def holds_all(self, screen_id, seat_ids, token):
+        """True when every seat in ``seat_ids`` is still held under ``token``"""
+        seat_ids = [int(seat_id) for seat_id in seat_ids]
+        if not seat_ids or not token:
+            return False
+        tokens = self.backend.tokens(screen_id, seat_ids)
+        return all(tokens.get(seat_id) == token for seat_id in seat_ids)
+
+
+def get_manager(name=None):
+    name = name or getattr(settings, 'SEAT_HOLD_BACKEND', 'cache')
+    if name == 'local' and not settings.DEBUG:
+        raise ImproperlyConfigured("The 'local' seat hold backend only works in one process; use 'cache'")
+    try:
+        return SeatHoldManager(BACKENDS[name]())
+    except KeyError:
+        raise ValueError(f"Unknown seat hold backend: {name}")
+
+
+holds = get_manager()
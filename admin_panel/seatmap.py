@@ -0,0 +1,189 @@
+# admin_panel/seatmap.py
+"""
+Cached, versioned seat maps for the seat selection page.
+
+Each screen has a version counter in the cache. The packed layout for a
+version is built from one values_list() query and cached under that
+version, so repeated page loads read no seats at all. Every seat save bumps
+the version and records the seat's new state under the new version number;
+clients holding version N ask for the entries N+1..current and patch their
+copy. Seats being added or removed record a layout marker instead, which
+sends clients back to the full map.
+
+Not every change goes through a save() here: the public site books seats
+directly and bulk edits use .update(). So at most every CHECK_INTERVAL
+seconds per screen, one worker re-reads the seats and records a delta
+for every seat that differs from the state last seen. New bookings picked
+up by the change capture (changefeed.py) trigger that check straight
+away. The versions live in the shared default cache, so every worker
+hands out the same numbers.
+"""
+from django.core.cache import cache
+
+from .changefeed import capture
+from .models import TheaterSeat
+
+VERSION_KEY = 'seatmap:{}:version'
+MAP_KEY = 'seatmap:{}:map:{}'
+DELTA_KEY = 'seatmap:{}:delta:{}'
+SEEN_KEY = 'seatmap:{}:seen'
+CHECKED_KEY = 'seatmap:{}:checked'
+# Entries older than this many versions are gone; such clients get the full map
+MAX_DELTA = 200
+DELTA_TIMEOUT = 60 * 60
+MAP_TIMEOUT = 5 * 60
+CHECK_INTERVAL = 10
+LAYOUT = 'layout'
+
+
+def current_version(screen_id):
+    version = cache.get(VERSION_KEY.format(screen_id))
+    if version is None:
+        # Lost or first use: start at 1 so any version a client holds is stale
+        cache.add(VERSION_KEY.format(screen_id), 1, timeout=None)
+        version = cache.get(VERSION_KEY.format(screen_id), 1)
+    return version
+
+
+def _next_version(screen_id):
+    current_version(screen_id)
+    try:
+        return cache.incr(VERSION_KEY.format(screen_id))
+    except ValueError:
+        cache.set(VERSION_KEY.format(screen_id), 1, timeout=None)
+        return 1
+
+
+def _seat_entry(seat_id, status, seat_type, price):
+    return [seat_id, status, seat_type, str(price)]
+
+
+def build_map(screen_id, version):
+    """Pack the screen's seats as rows of [id, number, type, price, status] under small lookup tables"""
+    types, prices, statuses, rows = [], [], [], []
+
+    def index(table, value):
+        if value not in table:
+            table.append(value)
+        return table.index(value)
+
+    seats = (TheaterSeat.objects.filter(screen_id=screen_id)
+             .order_by('row', 'number')
+             .values_list('id', 'row', 'number', 'seat_type', 'price', 'status'))
+    for seat_id, row, number, seat_type, price, status in seats:
+        if not rows or rows[-1][0] != row:
+            rows.append([row, []])
+        rows[-1][1].append([
+            seat_id, number, index(types, seat_type), index(prices, str(price)), index(statuses, status),
+        ])
+    return {
+        'screen': screen_id,
+        'version': version,
+        'types': types,
+        'prices': prices,
+        'statuses': statuses,
+        'rows': rows,
+    }
+
+
+def _seat_states(screen_id):
+    seats = TheaterSeat.objects.filter(screen_id=screen_id).values_list('id', 'status', 'seat_type', 'price')
+    return {seat_id: _seat_entry(seat_id, status, seat_type, price) for seat_id, status, seat_type, price in seats}
+
+
+def revalidate(screen_id, force=False):
+    """Record deltas for seats changed behind our back (public site, .update()); at most once per CHECK_INTERVAL"""
+    if force:
+        cache.set(CHECKED_KEY.format(screen_id), True, timeout=CHECK_INTERVAL)
+    elif not cache.add(CHECKED_KEY.format(screen_id), True, timeout=CHECK_INTERVAL):
+        # Another request (or worker) checked this screen recently
+        return
+    fresh = _seat_states(screen_id)
+    seen = cache.get(SEEN_KEY.format(screen_id))
+    cache.set(SEEN_KEY.format(screen_id), fresh, timeout=DELTA_TIMEOUT)
+    if seen is None:
+        # Nothing to compare with yet; maps built from now on start from this state
+        return
+    if set(seen) != set(fresh):
+        record_layout_change(screen_id)
+        return
+    entries = {}
+    for seat_id, entry in fresh.items():
+        if seen[seat_id] != entry:
+            entries[DELTA_KEY.format(screen_id, _next_version(screen_id))] = entry
+    if entries:
+        cache.set_many(entries, timeout=DELTA_TIMEOUT)
+
+
+def _bookings_changed(changes):
+    for screen_id in {change.row['screen_id'] for change in changes}:
+        revalidate(screen_id, force=True)
+
+
+capture.subscribe(_bookings_changed, verticals=['movies'])
+
+
+def get_map(screen_id):
+    capture.start()
+    revalidate(screen_id)
+    # Read the version before the seats: a change racing the build is replayed as a delta
+    version = current_version(screen_id)
+    key = MAP_KEY.format(screen_id, version)
+    seat_map = cache.get(key)
+    if seat_map is None:
+        seat_map = build_map(screen_id, version)
+        cache.set(key, seat_map, timeout=MAP_TIMEOUT)
+    return seat_map
+
+
+def get_changes(screen_id, since):
+    """Return (version, seat entries) changed after ``since``, or (version, None) if a full reload is needed"""
+    capture.start()
+    revalidate(screen_id)
+    version = current_version(screen_id)
+    if since == version:
+        return version, []
+    # A client ahead of the counter saw a version that was since lost (cache
+    # eviction or flush) and the counter restarted: it must reload
+    if since > version or version - since > MAX_DELTA:
+        return version, None
+
+    keys = [DELTA_KEY.format(screen_id, v) for v in range(since + 1, version + 1)]
+    found = cache.get_many(keys)
+    if len(found) != len(keys):
+        return version, None
+
+    latest = {}
+    for key in keys:
+        entry = found[key]
+        if entry == LAYOUT:
+            return version, None
+        latest[entry[0]] = entry
+    return version, list(latest.values())
+
+
+def record_seat(seat):
+    """Record one seat's new state as the next version of its screen's map"""
+    version = _next_version(seat.screen_id)
+    cache.set(
+        DELTA_KEY.format(seat.screen_id, version),
+        _seat_entry(seat.pk, seat.status, seat.seat_type, seat.price),
+        timeout=DELTA_TIMEOUT,
+    )
+    return version
+
+
+def record_layout_change(screen_id):
+    """Seats were added or removed: clients behind this version must refetch the whole map"""
+    version = _next_version(screen_id)
+    cache.set(DELTA_KEY.format(screen_id, version), LAYOUT, timeout=DELTA_TIMEOUT)
+    return version
+
+
+def record_bulk(screen_id, seat_ids):
+    """Record seats changed with queryset.update(), which sends no signals"""
+    seats = TheaterSeat.objects.filter(pk__in=seat_ids).values_list('id', 'status', 'seat_type', 'price')
+    entries = {}
+    for seat_id, status, seat_type, price in seats:
+        entries[DELTA_KEY.format(screen_id, _next_version(screen_id))] = _seat_entry(seat_id, status, seat_type, price)
+    cache.set_many(entries, timeout=DELTA_TIMEOUT)
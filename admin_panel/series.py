@@ -0,0 +1,333 @@
+# admin_panel/series.py
+"""
+Recurring series of events, comedy shows and movies.
+
+A series is a recurrence rule applied to an existing catalog row, the
+source. create_series() expands the rule into dates and copies the source
+onto every date with chunked bulk_create() calls, all in one transaction.
+For movies, the source's screens and their seat layouts are copied too:
+one bulk insert for all the screens and one (chunked) for all the seats.
+
+Rules are a subset of iCalendar RRULE:
+
+    FREQ=DAILY|WEEKLY|MONTHLY   required
+    INTERVAL=n                  every n days / weeks / months (default 1)
+    BYDAY=MO,WE,FR              WEEKLY only; defaults to the source's weekday
+    COUNT=n or UNTIL=YYYYMMDD   at least one is required
+
+update_series() and delete_series() act on every occurrence (or those on
+or after a date) with single queryset statements; delete_series() leaves
+occurrences that have bookings in place. Bulk writes send no
+model signals, so the facet indexes and typeahead caches are invalidated
+here once the transaction commits.
+"""
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from . import typeahead
+from .facets import INDEXES_BY_MODEL
+from .models import (
+    BookingComedyShow, BookingsEvent, ComedyShow, Event, EventSeries, Movie, MovieScreen, SeriesOccurrence,
+    TheaterSeat, TicketBooking,
+)
+
+MAX_OCCURRENCES = 1000
+CHUNK_SIZE = 500
+
+WEEKDAYS = ('MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU')
+FREQUENCIES = ('DAILY', 'WEEKLY', 'MONTHLY')
+
+KINDS = {
+    'event': Event,
+    'comedy': ComedyShow,
+    'movie': Movie,
+}
+
+# Fields update_series() may change on every occurrence at once
+EDITABLE_FIELDS = {
+    'event': ('name', 'description', 'location', 'time', 'ticket_price'),
+    'comedy': ('title', 'description', 'location', 'time', 'ticket_price', 'comedian_name', 'age_limit'),
+    'movie': ('title', 'description', 'location', 'time', 'ticket_price', 'language', 'genre'),
+}
+
+# Booking table and its catalog column per kind; booked occurrences are never deleted
+BOOKINGS = {
+    'event': (BookingsEvent, 'event_id'),
+    'comedy': (BookingComedyShow, 'comedy_show_id'),
+    'movie': (TicketBooking, 'movie_id'),
+}
+
+# Copied from the source screen; seats are copied separately
+SCREEN_FIELDS = (
+    'screen_name', 'total_rows', 'seats_per_row', 'premium_price_multiplier',
+    'executive_price_multiplier', 'normal_price_multiplier', 'premium_rows_end', 'executive_rows_end',
+)
+
+
+def title_field(model):
+    return 'name' if model is Event else 'title'
+
+
+# ----- rules -----
+
+@dataclass
+class Rule:
+    freq: str
+    interval: int = 1
+    byday: list = field(default_factory=list)
+    count: int = None
+    until: date = None
+
+    def __str__(self):
+        parts = [f"FREQ={self.freq}"]
+        if self.interval != 1:
+            parts.append(f"INTERVAL={self.interval}")
+        if self.byday:
+            parts.append(f"BYDAY={','.join(WEEKDAYS[day] for day in self.byday)}")
+        if self.count:
+            parts.append(f"COUNT={self.count}")
+        if self.until:
+            parts.append(f"UNTIL={self.until:%Y%m%d}")
+        return ';'.join(parts)
+
+
+def parse_rule(text):
+    """'FREQ=WEEKLY;BYDAY=FR;COUNT=8' -> Rule; raises ValueError"""
+    parts = {}
+    for part in text.strip().upper().removeprefix('RRULE:').split(';'):
+        if part:
+            name, _, value = part.partition('=')
+            parts[name.strip()] = value.strip()
+
+    freq = parts.pop('FREQ', '')
+    if freq not in FREQUENCIES:
+        raise ValueError(f"FREQ must be one of {', '.join(FREQUENCIES)}")
+    rule = Rule(freq)
+    try:
+        rule.interval = int(parts.pop('INTERVAL', 1))
+        rule.count = int(parts.pop('COUNT')) if 'COUNT' in parts else None
+    except ValueError:
+        raise ValueError("INTERVAL and COUNT must be whole numbers")
+    if rule.interval < 1 or (rule.count is not None and rule.count < 1):
+        raise ValueError("INTERVAL and COUNT must be at least 1")
+
+    if 'UNTIL' in parts:
+        value = parts.pop('UNTIL')[:8]
+        rule.until = parse_date(f"{value[:4]}-{value[4:6]}-{value[6:8]}") if len(value) == 8 else None
+        if rule.until is None:
+            raise ValueError("UNTIL must be a date as YYYYMMDD")
+    if 'BYDAY' in parts:
+        if freq != 'WEEKLY':
+            raise ValueError("BYDAY is only supported with FREQ=WEEKLY")
+        days = parts.pop('BYDAY').split(',')
+        if not set(days) <= set(WEEKDAYS):
+            raise ValueError(f"BYDAY takes {', '.join(WEEKDAYS)}")
+        rule.byday = sorted({WEEKDAYS.index(day) for day in days})
+    if parts:
+        raise ValueError(f"Unsupported rule parts: {', '.join(parts)}")
+    if rule.count is None and rule.until is None:
+        raise ValueError("Give COUNT or UNTIL so the series ends")
+    return rule
+
+
+def _candidates(rule, start):
+    """Every date the rule allows from ``start`` on, in order; raises OverflowError past date.max"""
+    step = 0
+    while True:
+        if rule.freq == 'DAILY':
+            yield start + timedelta(days=step * rule.interval)
+        elif rule.freq == 'WEEKLY':
+            week = start - timedelta(days=start.weekday()) + timedelta(weeks=step * rule.interval)
+            for day in rule.byday or [start.weekday()]:
+                candidate = week + timedelta(days=day)
+                if candidate >= start:
+                    yield candidate
+        else:
+            month = start.month - 1 + step * rule.interval
+            year = start.year + month // 12
+            if year > date.max.year:
+                raise OverflowError("date value out of range")
+            try:
+                yield start.replace(year=year, month=month % 12 + 1)
+            except ValueError:
+                # No such day this month (the 31st in April, ...): skipped, as RRULE does
+                pass
+        step += 1
+
+
+def expand(rule, start):
+    """Occurrence dates of ``rule`` starting at ``start``; raises ValueError past MAX_OCCURRENCES or date.max"""
+    dates = []
+    try:
+        for candidate in _candidates(rule, start):
+            if rule.until and candidate > rule.until:
+                break
+            if rule.count and len(dates) == rule.count:
+                break
+            if len(dates) == MAX_OCCURRENCES:
+                raise ValueError(f"A series is limited to {MAX_OCCURRENCES} occurrences")
+            dates.append(candidate)
+    except OverflowError:
+        # Every later date would also be past UNTIL; with COUNT alone the rule cannot be met
+        if not rule.until:
+            raise ValueError(f"The rule runs past the year {date.max.year}")
+    return dates
+
+
+# ----- bulk writes -----
+
+def _insert(model, objects, **match):
+    """bulk_create in chunks and return the new primary keys in insertion order"""
+    if connection.features.can_return_rows_from_bulk_insert:
+        model.objects.bulk_create(objects, batch_size=CHUNK_SIZE)
+        return [obj.pk for obj in objects]
+    # MySQL returns no ids from a multi-row INSERT; auto-increment ids grow in insertion
+    # order, so read back the matching rows above the previous high-water mark
+    floor = model.objects.aggregate(top=Max('pk'))['top'] or 0
+    model.objects.bulk_create(objects, batch_size=CHUNK_SIZE)
+    pks = list(model.objects.filter(pk__gt=floor, **match).order_by('pk').values_list('pk', flat=True))
+    if len(pks) != len(objects):
+        raise RuntimeError(f"Expected {len(objects)} new {model._meta.verbose_name_plural}, found {len(pks)}")
+    return pks
+
+
+def _copy(source, when):
+    model = type(source)
+    values = {
+        f.attname: getattr(source, f.attname)
+        for f in model._meta.concrete_fields
+        if not f.primary_key and f.name != 'modified_at'
+    }
+    values['date'] = when
+    if 'total_seats' in values:
+        # A fresh occurrence has sold nothing
+        values['available_seats'] = values['total_seats']
+    return model(**values)
+
+
+def _copy_screens(source, movie_pks):
+    screens = list(MovieScreen.objects.filter(movie=source).order_by('pk'))
+    if not screens:
+        return 0
+    plan = [(movie_pk, screen) for movie_pk in movie_pks for screen in screens]
+    new_screen_pks = _insert(
+        MovieScreen,
+        [MovieScreen(movie_id=movie_pk, **{name: getattr(screen, name) for name in SCREEN_FIELDS})
+         for movie_pk, screen in plan],
+        movie_id__in=movie_pks,
+    )
+
+    layouts = {
+        screen.pk: list(TheaterSeat.objects.filter(screen=screen).order_by('pk')
+                        .values_list('row', 'number', 'seat_type', 'price'))
+        for screen in screens
+    }
+    seats = [
+        TheaterSeat(screen_id=new_pk, row=row, number=number, seat_type=seat_type, price=price, status='Available')
+        for new_pk, (_, screen) in zip(new_screen_pks, plan)
+        for row, number, seat_type, price in layouts[screen.pk]
+    ]
+    TheaterSeat.objects.bulk_create(seats, batch_size=CHUNK_SIZE * 2)
+    return len(seats)
+
+
+def _catalog_changed(model):
+    INDEXES_BY_MODEL[model].invalidate()
+    typeahead.invalidate(model)
+
+
+def create_series(kind, source, rule_text, created_by=''):
+    """Expand ``rule_text`` from the source row's date and copy the source onto every later date"""
+    model = KINDS[kind]
+    rule = parse_rule(rule_text)
+    start = source.date if isinstance(source.date, date) else parse_date(str(source.date))
+    dates = expand(rule, start)
+    # The source is the first occurrence when the rule lands on its date
+    new_dates = [when for when in dates if when != start]
+    if not new_dates:
+        raise ValueError("The rule produces no dates besides the source's own")
+
+    name = getattr(source, title_field(model))
+    with transaction.atomic():
+        series = EventSeries.objects.create(
+            kind=kind, title=name, rule=str(rule), source_id=source.pk, starts_on=start, created_by=created_by,
+        )
+        pks = _insert(model, [_copy(source, when) for when in new_dates],
+                      **{title_field(model): name, 'date__in': new_dates})
+        occurrences = [SeriesOccurrence(series=series, object_id=pk, date=when) for pk, when in zip(pks, new_dates)]
+        if start in dates:
+            occurrences.insert(0, SeriesOccurrence(series=series, object_id=source.pk, date=start))
+        SeriesOccurrence.objects.bulk_create(occurrences, batch_size=CHUNK_SIZE)
+        if model is Movie:
+            _copy_screens(source, pks)
+        transaction.on_commit(lambda: _catalog_changed(model))
+    return series
+
+
+def occurrences(series, from_date=None):
+    """Queryset of the series' catalog rows, optionally from a date on"""
+    links = series.occurrences.all()
+    if from_date:
+        links = links.filter(date__gte=from_date)
+    return KINDS[series.kind].objects.filter(pk__in=links.values('object_id'))
+
+
+def clean_values(model, values):
+    """``values`` converted and validated by the model's fields; raises ValueError naming the bad field"""
+    cleaned = {}
+    for name, value in values.items():
+        field = model._meta.get_field(name)
+        try:
+            cleaned[name] = field.clean(value, None)
+        except ValidationError as e:
+            raise ValueError(f"{field.verbose_name.capitalize()}: {' '.join(e.messages)}")
+    return cleaned
+
+
+def update_series(series, values, from_date=None):
+    """Set ``values`` on every occurrence (from ``from_date`` on) with one UPDATE; returns the row count"""
+    unknown = set(values) - set(EDITABLE_FIELDS[series.kind])
+    if unknown:
+        raise ValueError(f"Cannot change {', '.join(sorted(unknown))} across a series")
+    if not values:
+        return 0
+    model = KINDS[series.kind]
+    # update() bypasses the fields, so raw form strings would reach the database unchecked
+    values = clean_values(model, values)
+    with transaction.atomic():
+        # update() skips auto_now, and modified_at drives the list pages' ETags
+        updated = occurrences(series, from_date).update(**values, modified_at=timezone.now())
+        if title_field(model) in values:
+            EventSeries.objects.filter(pk=series.pk).update(title=values[title_field(model)])
+        transaction.on_commit(lambda: _catalog_changed(model))
+    return updated
+
+
+def delete_series(series, from_date=None):
+    """Delete the unbooked occurrences (from ``from_date`` on) and, when none remain, the series
+
+    Bookings point at catalog rows without a foreign key constraint, so a
+    booked occurrence is kept rather than orphaning its bookings. Returns
+    (deleted, kept_because_booked).
+    """
+    model = KINDS[series.kind]
+    booking_model, column = BOOKINGS[series.kind]
+    links = series.occurrences.all()
+    if from_date:
+        links = links.filter(date__gte=from_date)
+    with transaction.atomic():
+        pks = set(links.values_list('object_id', flat=True))
+        booked = set(booking_model.objects.filter(**{f'{column}__in': pks}).values_list(column, flat=True).distinct())
+        doomed = pks - booked
+        model.objects.filter(pk__in=doomed).delete()
+        links.filter(object_id__in=doomed).delete()
+        if not series.occurrences.exists():
+            series.delete()
+        transaction.on_commit(lambda: _catalog_changed(model))
+    return len(doomed), len(booked)
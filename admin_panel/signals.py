@@ -0,0 +1,83 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from django.db import transaction
+
+from .models import LiveConcert, Movie, ComedyShow, Event, TheaterSeat, AmusementPark
+from . import fares
+from . import typeahead
+from . import seatmap
+from . import facets
+
+
+# ========= CONCERT FARE TABLE =========
+
+@receiver(pre_save, sender=LiveConcert)
+def concert_fare_fields_changed(sender, instance, update_fields=None, **kwargs):
+    """Remember whether this save touches any price or fee field"""
+    if update_fields is not None and not set(update_fields) & set(fares.FARE_FIELDS):
+        instance._fares_changed = False
+        return
+    if instance.pk is None:
+        instance._fares_changed = True
+        return
+
+    previous = LiveConcert.objects.filter(pk=instance.pk).values(*fares.FARE_FIELDS).first()
+    instance._fares_changed = previous is None or any(
+        previous[field] != getattr(instance, field) for field in fares.FARE_FIELDS
+    )
+
+
+@receiver(post_save, sender=LiveConcert)
+def rebuild_concert_fares(sender, instance, created, **kwargs):
+    """Rebuild the fare rows only when prices or fees actually changed"""
+    if created or getattr(instance, '_fares_changed', True):
+        fares.rebuild_fares([instance.pk])
+
+
+# ========= TYPEAHEAD PREFIX CACHE =========
+
+@receiver([post_save, post_delete], sender=Movie)
+@receiver([post_save, post_delete], sender=ComedyShow)
+@receiver([post_save, post_delete], sender=Event)
+def invalidate_typeahead(sender, **kwargs):
+    """Drop cached prefixes for a catalog model whenever one of its rows changes"""
+    typeahead.invalidate(sender)
+
+
+# ========= SEAT MAP VERSIONS =========
+
+@receiver(post_save, sender=TheaterSeat)
+def record_seat_change(sender, instance, created, **kwargs):
+    """New seats change the layout; anything else is a single-seat delta"""
+    if created:
+        transaction.on_commit(lambda: seatmap.record_layout_change(instance.screen_id))
+    else:
+        transaction.on_commit(lambda: seatmap.record_seat(instance))
+
+
+@receiver(post_delete, sender=TheaterSeat)
+def record_seat_removed(sender, instance, **kwargs):
+    transaction.on_commit(lambda: seatmap.record_layout_change(instance.screen_id))
+
+
+# ========= CATALOG FACETS =========
+
+@receiver(post_save, sender=Movie)
+@receiver(post_save, sender=ComedyShow)
+@receiver(post_save, sender=Event)
+@receiver(post_save, sender=LiveConcert)
+@receiver(post_save, sender=AmusementPark)
+def update_facets(sender, instance, **kwargs):
+    index = facets.INDEXES_BY_MODEL[sender]
+    transaction.on_commit(lambda: index.saved(instance.pk))
+
+
+@receiver(post_delete, sender=Movie)
+@receiver(post_delete, sender=ComedyShow)
+@receiver(post_delete, sender=Event)
+@receiver(post_delete, sender=LiveConcert)
+@receiver(post_delete, sender=AmusementPark)
+def remove_from_facets(sender, instance, **kwargs):
+    index = facets.INDEXES_BY_MODEL[sender]
+    pk = instance.pk
+    transaction.on_commit(lambda: index.deleted(pk))
@@ -0,0 +1,154 @@
+# admin_panel/staticfiles.py
+"""
+Static asset pipeline: minified, content-hashed, precompressed files.
+
+PrecompressedManifestStorage extends ManifestStaticFilesStorage. During
+collectstatic it first minifies JavaScript in place (with rjsmin when it is
+installed), so the content hash covers the minified bytes. Then it lets the
+manifest storage hash every file and write staticfiles.json, and finally
+writes .gz and, when the brotli package is installed, .br siblings for
+every compressible file. Files are compressed once at build time, never
+per request.
+
+serve() is the view that hands those files out when no proxy sits in front
+of Django. It picks the .br or .gz sibling the client accepts, sets
+Content-Encoding and Vary, and marks hashed names immutable for a year.
+Unhashed names get a short max-age, because their content can change
+under the same URL.
+"""
+import gzip
+import mimetypes
+import os
+import re
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, staticfiles_storage
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import rjsmin
+except ImportError:
+    rjsmin = None
+
+COMPRESSIBLE = ('.css', '.js', '.mjs', '.json', '.svg', '.map', '.txt', '.xml', '.html', '.ico')
+# Smaller files gain nothing once headers are counted
+MIN_COMPRESS_SIZE = 256
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+MUTABLE_MAX_AGE = getattr(settings, 'STATIC_MUTABLE_MAX_AGE', 60)
+# ManifestStaticFilesStorage inserts the first 12 hex digits of the MD5
+HASHED_NAME = re.compile(r'\.[0-9a-f]{12}\.[^./]+$')
+ENCODINGS = [('br', '.br'), ('gzip', '.gz')]
+
+
+def _compress(path):
+    """Write path.gz (and path.br) next to path; returns the variants written"""
+    data = Path(path).read_bytes()
+    written = []
+    variants = [('.gz', lambda raw: gzip.compress(raw, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variants.append(('.br', lambda raw: brotli.compress(raw, quality=11)))
+    for suffix, compress in variants:
+        packed = compress(data)
+        # Keep a variant only if it actually saves bytes
+        if len(packed) < len(data):
+            Path(path + suffix).write_bytes(packed)
+            written.append(path + suffix)
+    return written
+
+
+class PrecompressedManifestStorage(ManifestStaticFilesStorage):
+    """Minify JS, hash everything, then write .gz/.br variants of text assets"""
+
+    def post_process(self, paths, dry_run=False, **options):
+        if dry_run:
+            return
+        if rjsmin is not None:
+            for name in paths:
+                if name.endswith('.js') and not name.endswith('.min.js'):
+                    source = Path(self.path(name))
+                    source.write_text(rjsmin.jsmin(source.read_text(encoding='utf-8')), encoding='utf-8')
+
+        yield from super().post_process(paths, dry_run, **options)
+
+        names = set(paths) | set(self.hashed_files.values()) | {self.manifest_name}
+        for name in sorted(names):
+            if not name.endswith(COMPRESSIBLE) or not self.exists(name):
+                continue
+            if self.size(name) < MIN_COMPRESS_SIZE:
+                continue
+            for variant in _compress(self.path(name)):
+                yield name, os.path.relpath(variant, self.location), True
+
+
+def _accepted(header):
+    """Content codings the Accept-Encoding header allows (q > 0)"""
+    accepted = set()
+    for part in header.split(','):
+        coding, _, params = part.strip().partition(';')
+        quality = params.strip()
+        if quality.startswith('q='):
+            try:
+                if float(quality[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(coding.strip().lower())
+    return accepted
+
+
+def serve(request, path):
+    """Serve a collected file from STATIC_ROOT, precompressed when the client allows"""
+    try:
+        fullpath = safe_join(settings.STATIC_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404("Invalid path")
+    if not os.path.isfile(fullpath):
+        raise Http404(f"{path} does not exist")
+
+    accepted = _accepted(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+    chosen, encoding = fullpath, None
+    for coding, suffix in ENCODINGS:
+        if (coding in accepted or '*' in accepted) and os.path.isfile(fullpath + suffix):
+            chosen, encoding = fullpath + suffix, coding
+            break
+
+    stat = os.stat(chosen)
+    if not was_modified_since(request.META.get('HTTP_IF_MODIFIED_SINCE'), stat.st_mtime):
+        response = HttpResponseNotModified()
+    else:
+        content_type, _ = mimetypes.guess_type(fullpath)
+        response = FileResponse(open(chosen, 'rb'), content_type=content_type or 'application/octet-stream',
+                                filename=os.path.basename(fullpath))
+        if encoding:
+            response['Content-Encoding'] = encoding
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    response['Vary'] = 'Accept-Encoding'
+    if HASHED_NAME.search(path):
+        response['Cache-Control'] = f'public, max-age={IMMUTABLE_MAX_AGE}, immutable'
+    else:
+        response['Cache-Control'] = f'public, max-age={MUTABLE_MAX_AGE}'
+    return response
+
+
+BUILT_CSS = 'css/output.css'
+
+
+def assets(request):
+    """Template context: whether pages link the compiled Tailwind build or use the Play CDN"""
+    wanted = getattr(settings, 'USE_BUILT_CSS', not settings.DEBUG)
+    # Outside DEBUG {% static %} resolves through the manifest and would raise on
+    # every page if the build was never collected; keep the CDN instead
+    hashed = getattr(staticfiles_storage, 'hashed_files', None)
+    if wanted and not settings.DEBUG and hashed is not None and BUILT_CSS not in hashed:
+        return {'built_css': False}
+    return {'built_css': wanted}
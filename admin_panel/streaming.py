@@ -0,0 +1,157 @@
+# admin_panel/streaming.py
+"""
+Streaming render mode for long list pages.
+
+render_list() renders the page shell once, with the queryset left
+unevaluated and a marker where the table rows belong. The response is a
+StreamingHttpResponse that sends everything above the marker (page head,
+filters, stat cards) straight away. Then it renders the rows CHUNK_SIZE
+at a time through the page's row partial, and finally sends the rest of
+the page. Neither the full row list nor the full HTML string is ever held
+in memory.
+
+A page opts in by wrapping its row loop in a streaming table block:
+
+    {% if stream_marker %}{{ stream_marker }}{% else %}
+    {% for booking in bookings %}{% include row_template %}...{% endfor %}
+    {% endif %}
+
+Set STREAM_LIST_PAGES = False to render these pages in one piece again.
+"""
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connections
+from django.db.models import Q
+from django.http import StreamingHttpResponse
+from django.shortcuts import render
+from django.template import Context
+from django.template.loader import get_template, render_to_string
+from django.utils.safestring import mark_safe
+
+CHUNK_SIZE = 200
+MARKER = '<!-- stream:rows -->'
+ENABLED = getattr(settings, 'STREAM_LIST_PAGES', True)
+
+
+def chunked(queryset, size=CHUNK_SIZE):
+    """Rows of ``queryset`` in lists of ``size``, holding at most one list of model instances at a time"""
+    connection = connections[queryset.db]
+    if connection.vendor != 'mysql':
+        rows = []
+        for row in queryset.iterator(chunk_size=size):
+            rows.append(row)
+            if len(rows) == size:
+                yield rows
+                rows = []
+        if rows:
+            yield rows
+        return
+    # MySQL drivers buffer the whole result set even for iterator(), so page with
+    # LIMIT instead: each chunk starts after the previous chunk's last ordering key
+    ordering = _keyset_ordering(queryset)
+    if ordering is None:
+        yield from _chunked_by_pk(queryset, size)
+    else:
+        yield from _chunked_by_key(queryset, ordering, size)
+
+
+def _chunked_by_key(queryset, ordering, size):
+    names = [name for name, _ in ordering]
+    # The pk breaks ties, so every row sorts after exactly the rows of earlier chunks
+    queryset = queryset.order_by(*(f"-{name}" if descending else name for name, descending in ordering))
+    page = queryset
+    while True:
+        rows = list(page[:size])
+        if rows:
+            yield rows
+        if len(rows) < size:
+            return
+        last = queryset.filter(pk=rows[-1].pk).values_list(*names).get()
+        page = queryset.filter(_after(ordering, last))
+
+
+def _keyset_ordering(queryset):
+    """[(lookup, descending)] ending in the pk, or None when the ordering can't be paged by key"""
+    query = queryset.query
+    if query.is_sliced or query.distinct:
+        return None
+    order = query.order_by or (query.default_ordering and queryset.model._meta.ordering) or ()
+    ordering = []
+    for item in order:
+        if not isinstance(item, str) or item == '?':
+            return None
+        name = item.lstrip('-')
+        field = _field(queryset.model, name)
+        # NULLs drop out of > / < comparisons, so such rows would be skipped
+        if field is None or field.null:
+            return None
+        ordering.append((name, item.startswith('-')))
+        if field.primary_key and '__' not in name:
+            return ordering
+    return ordering + [('pk', ordering[-1][1] if ordering else False)]
+
+
+def _field(model, lookup):
+    field = None
+    for part in lookup.split('__'):
+        if model is None:
+            return None
+        try:
+            field = model._meta.pk if part == 'pk' else model._meta.get_field(part)
+        except FieldDoesNotExist:
+            return None
+        model = field.related_model
+    return field
+
+
+def _after(ordering, values):
+    """Rows that sort after ``values`` in ``ordering``"""
+    condition = Q()
+    equal = {}
+    for (name, descending), value in zip(ordering, values):
+        condition |= Q(**equal, **{f"{name}__{'lt' if descending else 'gt'}": value})
+        equal[name] = value
+    return condition
+
+
+def _chunked_by_pk(queryset, size):
+    # Fetch the ordered pks, then each chunk's rows by pk
+    pks = list(queryset.values_list('pk', flat=True))
+    for start in range(0, len(pks), size):
+        batch = pks[start:start + size]
+        by_pk = queryset.order_by().in_bulk(batch)
+        yield [by_pk[pk] for pk in batch if pk in by_pk]
+
+
+def render_list(request, template_name, context, rows, row_template, empty_template, row_name='booking'):
+    """Render ``template_name`` with ``rows`` streamed into its table block, CHUNK_SIZE rows per flush"""
+    context = {**context, 'row_template': row_template, 'empty_template': empty_template}
+    if not ENABLED:
+        return render(request, template_name, context)
+
+    page = render_to_string(template_name, {**context, 'stream_marker': mark_safe(MARKER)}, request)
+    head, marker, tail = page.partition(MARKER)
+    if not marker:
+        raise ValueError(f"{template_name} has no streaming table block")
+
+    def content():
+        yield head
+        row = get_template(row_template).template
+        # A plain Context: context processors already ran for the shell and rows do not need them
+        row_context = Context(context)
+        rendered = 0
+        for batch in chunked(rows):
+            parts = []
+            for obj in batch:
+                with row_context.push({row_name: obj}):
+                    parts.append(row.render(row_context))
+            rendered += len(batch)
+            yield ''.join(parts)
+        if not rendered:
+            yield render_to_string(empty_template, context, request)
+        yield tail
+
+    response = StreamingHttpResponse(content(), content_type='text/html; charset=utf-8')
+    # Ask nginx-style proxies not to buffer the body, or nothing reaches the browser early
+    response['X-Accel-Buffering'] = 'no'
+    return response
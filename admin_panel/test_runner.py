@@ -0,0 +1,34 @@
+# admin_panel/test_runner.py
+"""
+Test runner that also creates the public site's booking tables.
+
+The booking models are managed=False, so migrate never creates their
+tables and a test database would lack them. The tables are created right
+after the test database is migrated, before it is serialized or cloned
+for parallel runs, so every test database has them.
+"""
+from django.apps import apps
+from django.db import connections
+from django.db.models.signals import post_migrate
+from django.test.runner import DiscoverRunner
+
+
+def create_unmanaged_tables(using='default', **kwargs):
+    connection = connections[using]
+    existing = set(connection.introspection.table_names())
+    models = [model for model in apps.get_app_config('admin_panel').get_models()
+              if not model._meta.managed and model._meta.db_table not in existing]
+    # One schema editor, so foreign keys between the new tables are added once all exist
+    with connection.schema_editor() as editor:
+        for model in models:
+            editor.create_model(model)
+
+
+class UnmanagedTablesRunner(DiscoverRunner):
+    def setup_databases(self, **kwargs):
+        sender = apps.get_app_config('admin_panel')
+        post_migrate.connect(create_unmanaged_tables, sender=sender)
+        try:
+            return super().setup_databases(**kwargs)
+        finally:
+            post_migrate.disconnect(create_unmanaged_tables, sender=sender)
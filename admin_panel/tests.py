@@ -1,3 +1,494 @@
-from django.test import TestCase
+import io
+import json
+import os
+import tempfile
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
 
-# Create your tests here.
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from . import histogram, querylog, repricing, series, streaming
+from .bookings import get_source
+from .changefeed import INSERT, UPDATE, BookingChange
+from .leaderboards import Leaderboards
+from .admin_mixins import date_drilldown_filter
+from .reconcile import Reconciler, _json_array, read_settlements
+from .seat_holds import CacheHoldBackend, get_manager
+from .models import (
+    AmusementBooking, AmusementPark, BookingsEvent, Event, EventSeries, LiveConcert, LiveConcertTicketBooking,
+    Movie, MovieScreen, TheaterSeat, User,
+)
+from .series import MAX_OCCURRENCES, clean_values, expand, parse_rule
+
+
+class ParseRuleTests(SimpleTestCase):
+    def test_round_trips_through_str(self):
+        rule = parse_rule('rrule:freq=weekly;interval=2;byday=fr,mo;count=8')
+        self.assertEqual(rule.freq, 'WEEKLY')
+        self.assertEqual(rule.interval, 2)
+        self.assertEqual(rule.byday, [0, 4])
+        self.assertEqual(str(rule), 'FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,FR;COUNT=8')
+
+    def test_until(self):
+        self.assertEqual(parse_rule('FREQ=DAILY;UNTIL=20261231').until, date(2026, 12, 31))
+
+    def test_rejects_bad_rules(self):
+        for text in (
+            'COUNT=3',                          # no FREQ
+            'FREQ=YEARLY;COUNT=3',
+            'FREQ=DAILY',                       # never ends
+            'FREQ=DAILY;INTERVAL=0;COUNT=3',
+            'FREQ=DAILY;COUNT=x',
+            'FREQ=DAILY;UNTIL=2026',
+            'FREQ=DAILY;BYDAY=MO;COUNT=3',      # BYDAY is WEEKLY only
+            'FREQ=WEEKLY;BYDAY=XX;COUNT=3',
+            'FREQ=DAILY;COUNT=3;BYHOUR=9',
+        ):
+            with self.subTest(text=text), self.assertRaises(ValueError):
+                parse_rule(text)
+
+
+class ExpandTests(SimpleTestCase):
+    def test_daily_count(self):
+        self.assertEqual(
+            expand(parse_rule('FREQ=DAILY;INTERVAL=2;COUNT=3'), date(2026, 1, 30)),
+            [date(2026, 1, 30), date(2026, 2, 1), date(2026, 2, 3)],
+        )
+
+    def test_weekly_byday_starts_on_or_after_start(self):
+        # 2026-01-07 is a Wednesday, so that week's Monday is skipped
+        self.assertEqual(
+            expand(parse_rule('FREQ=WEEKLY;BYDAY=MO,FR;COUNT=3'), date(2026, 1, 7)),
+            [date(2026, 1, 9), date(2026, 1, 12), date(2026, 1, 16)],
+        )
+
+    def test_monthly_skips_missing_days(self):
+        self.assertEqual(
+            expand(parse_rule('FREQ=MONTHLY;UNTIL=20260531'), date(2026, 1, 31)),
+            [date(2026, 1, 31), date(2026, 3, 31), date(2026, 5, 31)],
+        )
+
+    def test_limited_to_max_occurrences(self):
+        with self.assertRaises(ValueError):
+            expand(parse_rule(f'FREQ=DAILY;COUNT={MAX_OCCURRENCES + 1}'), date(2026, 1, 1))
+
+    def test_huge_interval_with_count_is_rejected(self):
+        # MONTHLY used to loop forever here; DAILY and WEEKLY raised OverflowError
+        for text in (
+            'FREQ=MONTHLY;INTERVAL=12000;COUNT=20',
+            'FREQ=DAILY;INTERVAL=999999999;COUNT=3',
+            'FREQ=WEEKLY;INTERVAL=999999999999;COUNT=3',
+        ):
+            with self.subTest(text=text), self.assertRaises(ValueError):
+                expand(parse_rule(text), date(2026, 1, 31))
+
+    def test_huge_interval_with_until_stops(self):
+        for text in ('FREQ=MONTHLY;INTERVAL=120000;UNTIL=20300101', 'FREQ=DAILY;INTERVAL=99999999;UNTIL=20300101'):
+            with self.subTest(text=text):
+                self.assertEqual(expand(parse_rule(text), date(2026, 1, 31)), [date(2026, 1, 31)])
+
+
+class SeriesTests(TestCase):
+    def setUp(self):
+        self.event = Event.objects.create(
+            name='Open Mic', description='Weekly open mic', location='Pune', date=date(2026, 3, 6),
+            time=time(19, 0), total_seats=50, ticket_price=Decimal('200.00'),
+        )
+        # Sold some seats; copies start with none sold
+        Event.objects.filter(pk=self.event.pk).update(available_seats=12)
+        self.event.refresh_from_db()
+
+    def test_create_series_copies_the_source_onto_each_date(self):
+        created = series.create_series('event', self.event, 'FREQ=WEEKLY;COUNT=3')
+        links = list(created.occurrences.order_by('date').values_list('object_id', 'date'))
+        self.assertEqual([when for _, when in links], [date(2026, 3, 6), date(2026, 3, 13), date(2026, 3, 20)])
+        self.assertEqual(links[0][0], self.event.pk)
+        copies = Event.objects.filter(pk__in=[pk for pk, _ in links[1:]]).order_by('date')
+        self.assertEqual([(copy.date, copy.name, copy.available_seats) for copy in copies],
+                         [(date(2026, 3, 13), 'Open Mic', 50), (date(2026, 3, 20), 'Open Mic', 50)])
+
+    def test_create_series_copies_movie_screens_and_seats(self):
+        movie = Movie.objects.create(
+            title='Rerun', description='', location='Pune', date=date(2026, 3, 6), time=time(18, 0),
+            language='Hindi', duration=timedelta(hours=2), genre='Drama', ticket_price=Decimal('150.00'),
+            available_seats=4,
+        )
+        screen = MovieScreen.objects.create(movie=movie, total_rows=1, seats_per_row=4)
+        TheaterSeat.objects.bulk_create([TheaterSeat(screen=screen, row='A', number=n, price=750) for n in range(1, 5)])
+        TheaterSeat.objects.filter(screen=screen, number=1).update(status='Booked')
+
+        created = series.create_series('movie', movie, 'FREQ=DAILY;COUNT=3')
+        copies = series.occurrences(created).exclude(pk=movie.pk)
+        self.assertEqual(copies.count(), 2)
+        for copy in copies:
+            seats = TheaterSeat.objects.filter(screen__movie=copy)
+            self.assertEqual(seats.count(), 4)
+            self.assertFalse(seats.exclude(status='Available').exists())
+
+    def test_update_series_cleans_values(self):
+        created = series.create_series('event', self.event, 'FREQ=DAILY;COUNT=3')
+        self.assertEqual(series.update_series(created, {'ticket_price': '250'}, from_date=date(2026, 3, 7)), 2)
+        prices = list(series.occurrences(created).order_by('date').values_list('ticket_price', flat=True))
+        self.assertEqual(prices, [Decimal('200.00'), Decimal('250.00'), Decimal('250.00')])
+        with self.assertRaises(ValueError):
+            series.update_series(created, {'ticket_price': 'free'})
+
+    def test_delete_series_keeps_booked_occurrences(self):
+        created = series.create_series('event', self.event, 'FREQ=DAILY;COUNT=3')
+        booked = series.occurrences(created).get(date=date(2026, 3, 7))
+        BookingsEvent.objects.create(
+            event_id=booked.pk, booking_date=timezone.now(), total_amount=Decimal('200.00'), status='confirmed',
+            booking_id='BK1', customer_name='A', customer_email='a@example.com',
+        )
+        self.assertEqual(series.delete_series(created), (2, 1))
+        self.assertEqual(list(Event.objects.values_list('pk', flat=True)), [booked.pk])
+        self.assertEqual(list(created.occurrences.values_list('object_id', flat=True)), [booked.pk])
+
+        BookingsEvent.objects.all().delete()
+        self.assertEqual(series.delete_series(created), (1, 0))
+        self.assertFalse(EventSeries.objects.filter(pk=created.pk).exists())
+
+
+class KeysetChunkTests(TestCase):
+    def setUp(self):
+        event = Event.objects.create(
+            name='Gig', description='', location='Pune', date=date(2026, 3, 6), time=time(19, 0),
+            total_seats=50, ticket_price=Decimal('200.00'),
+        )
+        # Repeated dates, so chunk boundaries fall inside runs of equal keys
+        for number in range(7):
+            BookingsEvent.objects.create(
+                event=event, booking_date=timezone.make_aware(datetime(2026, 1, 1 + number // 3)),
+                total_amount=Decimal('200.00'), status='confirmed', booking_id=f'BK{number}',
+                customer_name='A', customer_email='a@example.com',
+            )
+
+    def test_pages_follow_the_ordering_with_pk_tiebreak(self):
+        for order in (['-booking_date'], ['booking_date'], ['-booking_date', 'customer_name'], ['-pk']):
+            with self.subTest(order=order):
+                queryset = BookingsEvent.objects.order_by(*order)
+                ordering = streaming._keyset_ordering(queryset)
+                expected = list(queryset.order_by(*order, '-pk' if ordering[-1][1] else 'pk')
+                                .values_list('pk', flat=True))
+                chunks = list(streaming._chunked_by_key(queryset, ordering, 3))
+                self.assertEqual([len(chunk) for chunk in chunks], [3, 3, 1])
+                self.assertEqual([booking.pk for chunk in chunks for booking in chunk], expected)
+
+    def test_unkeyable_orderings_fall_back(self):
+        for queryset in (BookingsEvent.objects.order_by('?'), BookingsEvent.objects.order_by('user'),
+                         BookingsEvent.objects.order_by('-booking_date')[:3]):
+            with self.subTest(query=str(queryset.query)):
+                self.assertIsNone(streaming._keyset_ordering(queryset))
+
+
+class CleanValuesTests(SimpleTestCase):
+    def test_converts_form_strings(self):
+        self.assertEqual(clean_values(Event, {'ticket_price': '12.50', 'time': '18:30'}),
+                         {'ticket_price': Decimal('12.50'), 'time': time(18, 30)})
+
+    def test_bad_values_raise_value_error(self):
+        for values in ({'ticket_price': 'free'}, {'time': '25:00'}, {'name': 'x' * 1000}):
+            with self.subTest(values=values), self.assertRaises(ValueError):
+                clean_values(Event, values)
+
+
+class RepricingTests(SimpleTestCase):
+    def test_row_labels(self):
+        self.assertEqual([repricing.row_label(n) for n in (1, 26, 27)], ['A', 'Z', 'Z27'])
+        for n in (1, 13, 26, 27, 40):
+            self.assertEqual(repricing.row_number(repricing.row_label(n)), n)
+        self.assertIsNone(repricing.row_number('AA'))
+
+    def test_seat_tier(self):
+        # Views assign raw POST strings, so the screen may hold strings
+        screen = SimpleNamespace(
+            premium_rows_end='2', executive_rows_end=5,
+            premium_price_multiplier='450', executive_price_multiplier=300, normal_price_multiplier=Decimal('180.5'),
+        )
+        self.assertEqual(repricing.seat_tier(screen, 2), ('Premium', Decimal('450.00')))
+        self.assertEqual(repricing.seat_tier(screen, 3), ('Executive', Decimal('300.00')))
+        self.assertEqual(repricing.seat_tier(screen, 6), ('Normal', Decimal('180.50')))
+
+
+class RepriceTests(TestCase):
+    def setUp(self):
+        movie = Movie.objects.create(
+            title='Rerun', description='', location='Pune', date=date(2026, 3, 6), time=time(18, 0),
+            language='Hindi', duration=timedelta(hours=2), genre='Drama', ticket_price=Decimal('150.00'),
+            available_seats=8,
+        )
+        self.screen = MovieScreen.objects.create(
+            movie=movie, total_rows=4, seats_per_row=2, premium_rows_end=1, executive_rows_end=2,
+            premium_price_multiplier=Decimal('750.00'), executive_price_multiplier=Decimal('500.00'),
+            normal_price_multiplier=Decimal('350.00'),
+        )
+        TheaterSeat.objects.bulk_create([
+            TheaterSeat(screen=self.screen, row=row, number=number, seat_type=seat_type, price=price)
+            for row, seat_type, price in (('A', 'Premium', 750), ('B', 'Executive', 500),
+                                          ('C', 'Normal', 350), ('D', 'Normal', 350))
+            for number in (1, 2)
+        ])
+
+    def row_types(self):
+        return dict(TheaterSeat.objects.filter(screen=self.screen).values_list('row', 'seat_type').distinct())
+
+    def row_prices(self):
+        return set(TheaterSeat.objects.filter(screen=self.screen).values_list('row', 'price'))
+
+    def test_nothing_to_do_when_seats_match(self):
+        self.assertEqual(repricing.reprice([self.screen]), ([], 0))
+
+    def test_rewrites_only_rows_that_differ(self):
+        MovieScreen.objects.filter(pk=self.screen.pk).update(
+            premium_rows_end=2, executive_rows_end=3, normal_price_multiplier=Decimal('300.00'))
+        self.screen.refresh_from_db()
+
+        changes, _ = repricing.reprice([self.screen], dry_run=True)
+        self.assertEqual([(change.row, change.new_type, change.new_price) for change in changes], [
+            ('B', 'Premium', Decimal('750.00')), ('C', 'Executive', Decimal('500.00')),
+            ('D', 'Normal', Decimal('300.00')),
+        ])
+        self.assertEqual(TheaterSeat.objects.filter(seat_type='Premium').count(), 2)
+
+        changes, updated = repricing.reprice([self.screen])
+        self.assertEqual((len(changes), updated), (3, 6))
+        self.assertEqual(self.row_types(), {'A': 'Premium', 'B': 'Premium', 'C': 'Executive', 'D': 'Normal'})
+        self.assertEqual(self.row_prices(), {('A', Decimal('750.00')), ('B', Decimal('750.00')),
+                                  ('C', Decimal('500.00')), ('D', Decimal('300.00'))})
+        self.assertEqual(repricing.reprice([self.screen]), ([], 0))
+
+
+class JsonArrayTests(SimpleTestCase):
+    def read(self, text, size=4):
+        return list(_json_array(io.StringIO(text), size=size))
+
+    def test_objects_split_across_reads(self):
+        text = ' [ {"order_id": "order_1", "amount": 100},\n{"order_id": "order_2", "note": "a, ]"} ] '
+        self.assertEqual(self.read(text), [
+            {'order_id': 'order_1', 'amount': 100},
+            {'order_id': 'order_2', 'note': 'a, ]'},
+        ])
+
+    def test_empty_array(self):
+        self.assertEqual(self.read('[]'), [])
+
+    def test_rejects_non_array(self):
+        with self.assertRaises(ValueError):
+            self.read('{"order_id": "order_1"}')
+
+    def test_rejects_truncated_file(self):
+        with self.assertRaises(ValueError):
+            self.read('[{"order_id": "order_1"}, {"order_id": "ord')
+
+
+class ReconcilerTests(TestCase):
+    def setUp(self):
+        park = AmusementPark.objects.create(
+            park_name='Splash', description='', location='Pune', date=date(2026, 3, 6), time=time(10, 0),
+            rides_available=5, ticket_price=Decimal('100.00'), available_seats=100,
+        )
+        for order_id, amount, paid in (('order_1', 100, True), ('order_2', 200, True),
+                                       ('order_3', 300, False), ('order_4', 400, True)):
+            AmusementBooking.objects.create(
+                booking_id=order_id, amusement_park=park, customer_name='A', customer_email='a@example.com',
+                customer_phone='9999999999', grand_total=Decimal(amount), created_at=timezone.now(),
+                razorpay_order_id=order_id, payment_status=paid,
+            )
+        concert = LiveConcert.objects.create(
+            title='Live', description='', location='Pune', date=date(2026, 3, 6), time=time(20, 0),
+            artist_name='Band', music_genre='Rock', available_seats=100,
+        )
+        user = User.objects.create(email='a@example.com', mobile='9999999999', password='x')
+        LiveConcertTicketBooking.objects.create(
+            user=user, concert=concert, total_amount=Decimal('500.00'), booked_at=timezone.now(),
+            payment_status='Pending', razorpay_order_id='order_5',
+        )
+        lines = [
+            ('order_1', '100.00', 'payment'),
+            ('order_2', '150.00', 'payment'),       # amount differs
+            ('order_3', '300.00', 'payment'),       # booking not marked paid
+            ('order_4', '400.00', 'payment'),
+            ('order_4', '400.00', 'refund'),        # refunded, but the booking still says paid
+            ('order_5', '500.00', 'payment'),       # free-text payment status
+            ('order_9', '50.00', 'payment'),        # no such booking
+            ('', '10.00', 'payment'),
+            ('order_1', 'n/a', 'payment'),
+        ]
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        self.path = os.path.join(folder.name, 'settlement.csv')
+        with open(self.path, 'w', newline='') as handle:
+            handle.write('order_id,entity_id,amount,type\n')
+            handle.writelines(f'{order_id},pay_{number},{amount},{kind}\n'
+                              for number, (order_id, amount, kind) in enumerate(lines))
+
+    def test_categories(self):
+        reconciler = Reconciler(chunk=4)
+        results = {result.line.number: result for result in reconciler.run(read_settlements(self.path))}
+        self.assertEqual([results[number].category for number in sorted(results)], [
+            'matched', 'amount_mismatch', 'status_mismatch', 'matched', 'status_mismatch', 'status_mismatch',
+            'missing', 'invalid', 'invalid',
+        ])
+        self.assertEqual(reconciler.by_vertical['concerts']['status_mismatch'], 1)
+        self.assertEqual(reconciler.by_vertical['amusement']['status_mismatch'], 2)
+        # Without apply nothing is written
+        self.assertEqual(reconciler.updated, 0)
+        self.assertFalse(AmusementBooking.objects.get(razorpay_order_id='order_3').payment_status)
+
+    def test_apply_command_fixes_status_mismatches_only(self):
+        out = io.StringIO()
+        call_command('reconcile_settlements', self.path, '--apply', '--chunk', '3', stdout=out)
+
+        self.assertIn('payment_status updated on 3 bookings', out.getvalue())
+        paid = dict(AmusementBooking.objects.values_list('razorpay_order_id', 'payment_status'))
+        self.assertEqual(paid, {'order_1': True, 'order_2': True, 'order_3': True, 'order_4': False})
+        self.assertEqual(LiveConcertTicketBooking.objects.get().payment_status, 'paid')
+        self.assertEqual(AmusementBooking.objects.get(razorpay_order_id='order_2').grand_total, Decimal('200.00'))
+
+
+class HistogramValidateTests(SimpleTestCase):
+    def test_bucket_count_matches_bucket_starts(self):
+        ranges = [
+            (date(2026, 1, 1), date(2026, 1, 1)),
+            (date(2026, 1, 7), date(2026, 2, 2)),
+            (date(2025, 12, 29), date(2026, 3, 1)),
+            (date(2024, 2, 29), date(2026, 1, 31)),
+        ]
+        for granularity in histogram.GRANULARITIES:
+            for start, end in ranges:
+                with self.subTest(granularity=granularity, start=start, end=end):
+                    self.assertEqual(
+                        histogram.bucket_count(start, end, granularity),
+                        len(histogram.bucket_starts(start, end, granularity)),
+                    )
+
+    def test_accepts_a_normal_range(self):
+        histogram.validate(date(2026, 1, 1), date(2026, 1, 31), 'day')
+
+    def test_rejects_bad_arguments(self):
+        for args in (
+            (date(2026, 1, 1), date(2026, 1, 31), 'minute'),
+            (date(2026, 2, 1), date(2026, 1, 1), 'day'),
+            (None, date(2026, 1, 1), 'day'),
+        ):
+            with self.subTest(args=args), self.assertRaises(ValueError):
+                histogram.validate(*args)
+
+    def test_rejects_too_many_buckets_without_building_them(self):
+        with self.assertRaises(ValueError):
+            histogram.validate(date.min, date.max, 'hour')
+
+    def test_rejects_ranges_that_overflow(self):
+        for start, end, granularity in (
+            (date(9999, 12, 1), date.max, 'day'),
+            (date(9999, 12, 20), date(9999, 12, 30), 'week'),
+            (date(9999, 1, 1), date(9999, 12, 30), 'month'),
+        ):
+            with self.subTest(end=end, granularity=granularity), self.assertRaises(ValueError):
+                histogram.validate(start, end, granularity)
+
+
+class LeaderboardChangeTests(SimpleTestCase):
+    def setUp(self):
+        self.boards = Leaderboards()
+        self.source = get_source('events')
+        self.row = {'id': 7, 'event_id': 3, 'booking_date': datetime(2026, 1, 5, 10), 'number_of_tickets': 4,
+                    'status': 'confirmed', 'payment_status': True}
+
+    def sold(self):
+        sketch = self.boards._days['events'].get(date(2026, 1, 5))
+        return sketch.counts.get(3, 0) if sketch else 0
+
+    def test_only_paid_bookings_count(self):
+        self.boards.apply_changes([BookingChange(INSERT, self.source, 7, {**self.row, 'payment_status': False})])
+        self.assertEqual(self.sold(), 0)
+        self.boards.apply_changes([BookingChange(INSERT, self.source, 8, {**self.row, 'id': 8})])
+        self.assertEqual(self.sold(), 4)
+
+    def test_cancellation_takes_tickets_back(self):
+        self.boards.apply_changes([BookingChange(INSERT, self.source, 7, self.row)])
+        cancelled = {**self.row, 'status': 'cancelled'}
+        self.boards.apply_changes([BookingChange(UPDATE, self.source, 7, cancelled, previous=self.row)])
+        self.assertEqual(self.sold(), 0)
+
+    def test_update_with_unknown_previous_state_rebuilds(self):
+        today = {**self.row, 'booking_date': datetime.now()}
+        self.boards.apply_changes([BookingChange(UPDATE, self.source, 7, today)])
+        self.assertTrue(self.boards._stale)
+
+
+class QueryLogTests(SimpleTestCase):
+    def test_in_lists_share_a_fingerprint(self):
+        self.assertEqual(
+            querylog.fingerprint('SELECT * FROM t WHERE t.id IN (%s, %s, %s)'),
+            querylog.fingerprint('SELECT * FROM t WHERE t.id IN (%s)'),
+        )
+        self.assertEqual(
+            querylog.fingerprint("SELECT * FROM t WHERE t.id IN (1, 2) AND t.name = 'x'"),
+            'SELECT * FROM t WHERE t.id IN (...) AND t.name = ?',
+        )
+
+    def test_warns_once_when_full(self):
+        log = querylog.QueryLog()
+        timings = [(f'q{n}', 'SELECT 1', 1.0) for n in range(querylog.MAX_FINGERPRINTS + 2)]
+        with self.assertLogs(querylog.logger, 'WARNING') as logs:
+            log.record('home', timings)
+        self.assertEqual(len(logs.records), 1)
+        self.assertEqual(len(log.fingerprints), querylog.MAX_FINGERPRINTS)
+        self.assertEqual(log.urls['home'].count, querylog.MAX_FINGERPRINTS)
+
+
+class DateDrilldownFilterTests(SimpleTestCase):
+    def apply(self, value):
+        model_admin = SimpleNamespace(model=BookingsEvent)
+        list_filter = date_drilldown_filter('booking_date')(
+            None, {'booking_date_range': [value]}, BookingsEvent, model_admin)
+        return list_filter.queryset(None, BookingsEvent.objects.all())
+
+    def test_month_range(self):
+        where = str(self.apply('2026-12').query)
+        self.assertIn('2026-12-01', where)
+        self.assertIn('2027-01-01', where)
+
+    def test_bad_months_are_ignored(self):
+        for value in ('9999-12', '2026-13', '0-1', 'soon', '2026-01-01'):
+            with self.subTest(value=value):
+                self.assertEqual(str(self.apply(value).query), str(BookingsEvent.objects.all().query))
+
+
+class CollectStaticTests(SimpleTestCase):
+    def test_collectstatic_hashes_and_compresses(self):
+        with tempfile.TemporaryDirectory() as root, override_settings(STATIC_ROOT=root):
+            call_command('collectstatic', interactive=False, verbosity=0)
+            with open(os.path.join(root, 'staticfiles.json')) as handle:
+                paths = json.load(handle)['paths']
+            # Tailwind sources import packages that only exist under node_modules
+            self.assertFalse([name for name in paths if name.endswith('input.css')])
+            hashed = paths['admin/css/base.css']
+            self.assertRegex(hashed, r'\.[0-9a-f]{12}\.css$')
+            self.assertTrue(os.path.isfile(os.path.join(root, hashed + '.gz')))
+
+
+class SeatHoldBackendTests(SimpleTestCase):
+    def test_local_seat_holds_are_refused_outside_debug(self):
+        with override_settings(DEBUG=False):
+            with self.assertRaises(ImproperlyConfigured):
+                get_manager('local')
+            self.assertIsInstance(get_manager().backend, CacheHoldBackend)
+
+
+class UpdateConcertFeesCommandTests(SimpleTestCase):
+    def test_needs_a_change_and_a_selection(self):
+        with self.assertRaisesMessage(CommandError, '--convenience-fee'):
+            call_command('update_concert_fees', '--all')
+        with self.assertRaisesMessage(CommandError, '--concert, --upcoming or --all'):
+            call_command('update_concert_fees', '--convenience-fee', '5')
+
+    def test_rejects_bad_amounts(self):
+        for value in ('five', '-1'):
+            with self.subTest(value=value), self.assertRaises(CommandError):
+                call_command('update_concert_fees', '--all', '--convenience-fee', value)
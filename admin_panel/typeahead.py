@@ -0,0 +1,198 @@
+# admin_panel/typeahead.py
+"""
+Prefix search behind the typeahead pickers on the booking and screen forms.
+
+Each searchable column is queried on its own with ``istartswith`` (a
+``LIKE 'abc%'`` that can use that column's index) and LIMITed to the page
+size; results are merged in column order. Recent prefixes are kept in a
+small in-process LRU. When a shorter prefix already returned everything it
+matched, longer prefixes are answered by filtering that result in Python
+without touching the database.
+"""
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from django.contrib.auth.models import User as Account
+from django.utils import timezone
+
+from .models import User, Movie, ComedyShow, Event
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 25
+MIN_PREFIX = 1
+CACHE_SIZE = 512
+# Users are written by the public site, so their entries cannot be invalidated on save
+CACHE_TTL = 60
+
+
+@dataclass(frozen=True)
+class TypeaheadSource:
+    model: type
+    search_fields: tuple
+    fields: tuple
+    label: Callable[[dict], str]
+    ordering: tuple = ('pk',)
+    # Extra filter applied to every lookup, e.g. upcoming shows only
+    scope: Optional[Callable[[], dict]] = None
+    # Fields searched when the prefix is all digits (phone numbers)
+    numeric_fields: tuple = ()
+
+    def fields_for(self, prefix):
+        if self.numeric_fields and prefix.isdigit():
+            return self.numeric_fields
+        return self.search_fields
+
+
+def _upcoming():
+    return {'date__gte': timezone.localdate()}
+
+
+def _user_label(row):
+    name = ' '.join(part for part in (row['firstname'], row['lastname']) if part)
+    return f"{name} ({row['email']})" if name else row['email']
+
+
+def _account_label(row):
+    name = ' '.join(part for part in (row['first_name'], row['last_name']) if part)
+    return f"{name or row['username']} ({row['email'] or row['username']})"
+
+
+SOURCES = {
+    'users': TypeaheadSource(
+        model=User,
+        search_fields=('email', 'firstname', 'lastname'),
+        numeric_fields=('mobile',),
+        fields=('id', 'email', 'firstname', 'lastname', 'mobile'),
+        label=_user_label,
+    ),
+    # auth.User accounts, which comedy bookings point at instead of the site's users
+    'accounts': TypeaheadSource(
+        model=Account,
+        search_fields=('username', 'email', 'first_name', 'last_name'),
+        fields=('id', 'username', 'email', 'first_name', 'last_name'),
+        label=_account_label,
+        scope=lambda: {'is_active': True},
+    ),
+    'movies': TypeaheadSource(
+        model=Movie,
+        search_fields=('title',),
+        fields=('id', 'title', 'date', 'language'),
+        label=lambda row: f"{row['title']} ({row['language']}, {row['date']})",
+        ordering=('-date', 'pk'),
+    ),
+    'shows': TypeaheadSource(
+        model=ComedyShow,
+        search_fields=('title', 'comedian_name'),
+        fields=('id', 'title', 'comedian_name', 'date', 'ticket_price', 'available_seats'),
+        label=lambda row: f"{row['title']} - {row['comedian_name']} ({row['date']})",
+        ordering=('date', 'pk'),
+        scope=lambda: {**_upcoming(), 'available_seats__gt': 0},
+    ),
+    'events': TypeaheadSource(
+        model=Event,
+        search_fields=('name',),
+        fields=('id', 'name', 'date', 'ticket_price', 'available_seats'),
+        label=lambda row: f"{row['name']} ({row['date']})",
+        ordering=('date', 'pk'),
+        scope=_upcoming,
+    ),
+}
+
+
+class PrefixCache:
+    """Thread-safe LRU of (source, prefix, limit) -> (rows, complete, stored_at)"""
+
+    def __init__(self, size=CACHE_SIZE, ttl=CACHE_TTL):
+        self.size = size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[2] > self.ttl:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0], entry[1]
+
+    def put(self, key, rows, complete):
+        with self._lock:
+            self._entries[key] = (rows, complete, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, source_name):
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == source_name]:
+                del self._entries[key]
+
+
+cache = PrefixCache()
+
+
+def _matches(source, row, prefix):
+    return any(
+        str(row.get(field) or '').lower().startswith(prefix)
+        for field in source.fields_for(prefix)
+    )
+
+
+def _query(source, prefix, limit):
+    """One LIMITed prefix query per search column, merged without duplicates"""
+    base = source.model.objects.all()
+    if source.scope:
+        base = base.filter(**source.scope())
+    rows = {}
+    for field in source.fields_for(prefix):
+        if len(rows) >= limit:
+            break
+        queryset = base.filter(**{f'{field}__istartswith': prefix}).order_by(*source.ordering)
+        if rows:
+            queryset = queryset.exclude(pk__in=list(rows))
+        for row in queryset.values(*source.fields)[:limit - len(rows)]:
+            rows[row['id']] = row
+    return list(rows.values())
+
+
+def search(source_name, prefix, limit=DEFAULT_LIMIT):
+    """Return up to ``limit`` rows of ``source_name`` matching ``prefix``"""
+    source = SOURCES[source_name]
+    prefix = prefix.strip().lower()
+    limit = max(1, min(limit, MAX_LIMIT))
+    if len(prefix) < MIN_PREFIX:
+        return []
+
+    cached = cache.get((source_name, prefix, limit))
+    if cached is not None:
+        return cached[0]
+
+    # A shorter prefix that returned fewer than `limit` rows holds every match
+    for end in range(len(prefix) - 1, MIN_PREFIX - 1, -1):
+        if source.fields_for(prefix[:end]) != source.fields_for(prefix):
+            break
+        shorter = cache.get((source_name, prefix[:end], limit))
+        if shorter is not None and shorter[1]:
+            rows = [row for row in shorter[0] if _matches(source, row, prefix)]
+            cache.put((source_name, prefix, limit), rows, True)
+            return rows
+
+    rows = _query(source, prefix, limit)
+    cache.put((source_name, prefix, limit), rows, len(rows) < limit)
+    return rows
+
+
+def results(source_name, prefix, limit=DEFAULT_LIMIT):
+    """Rows shaped for the picker: id, label and the source's fields"""
+    source = SOURCES[source_name]
+    return [{**row, 'label': source.label(row)} for row in search(source_name, prefix, limit)]
+
+
+def invalidate(model):
+    for name, source in SOURCES.items():
+        if source.model is model:
+            cache.invalidate(name)
@@ -26,7 +26,7 @@
 # ]
 
 from django.urls import path
-from . import views
+from .views import lazy_view as view
 from django.conf import settings
 from django.conf.urls.static import static
 
@@ -38,70 +38,104 @@ urlpatterns = [
     # path('login/', views.AdminLoginView.as_view(), name='admin_login'),
     # path('logout/', views.admin_logout, name='admin_logout'),
 
-    path('', views.dashboard, name='admin_dashboard'),
+    path('', view('dashboard.dashboard'), name='admin_dashboard'),
+    path('dashboard/stream/', view('dashboard.dashboard_stream', is_async=True), name='dashboard_stream'),
     
     # Authentication
-    path('admin-panel/login/', views.AdminLoginView.as_view(), name='admin_login'),
-    path('admin-panel/logout/', views.admin_logout, name='admin_logout'),
+    path('admin-panel/login/', view('auth.AdminLoginView'), name='admin_login'),
+    path('admin-panel/logout/', view('auth.admin_logout'), name='admin_logout'),
     
     # Event Management
-    path('event-bookings/', views.admin_event_bookings, name='admin_event_bookings'),
-    path('event-bookings/<int:booking_id>/', views.admin_event_booking_detail, name='admin_event_booking_detail'),
-    path('events/', views.admin_events_list, name='admin_events_list'),
-    path('events/create/', views.create_event, name='admin_create_event'),
-    path('events/<int:event_id>/', views.admin_event_detail, name='admin_event_detail'),
-    path('events/<int:event_id>/edit/', views.edit_event, name='edit_event'),
-    path('events/reports/', views.event_report, name='event_report'),
-
-    path('event/book/', views.event_book, name='event_book'),
-    path('event/book/add/', views.event_book_add, name='event_book_add'),
-    path('event/bookings/', views.event_bookings_list, name='event_bookings_list'),
-    path('event/booking/<str:booking_id>/', views.event_booking_detail, name='event_booking_detail'),
-    path('event/booking/<str:booking_id>/cancel/', views.event_booking_cancel, name='event_booking_cancel'),
-    path('event-bookings/<int:booking_id>/edit/', views.admin_event_booking_edit, name='admin_event_booking_edit'),
-    path('events/<int:event_id>/delete/', views.delete_event, name='delete_event'),
+    path('event-bookings/', view('events.admin_event_bookings'), name='admin_event_bookings'),
+    path('event-bookings/<int:booking_id>/', view('events.admin_event_booking_detail'), name='admin_event_booking_detail'),
+    path('events/', view('events.admin_events_list'), name='admin_events_list'),
+    path('events/create/', view('events.create_event'), name='admin_create_event'),
+    path('events/<int:event_id>/', view('events.admin_event_detail'), name='admin_event_detail'),
+    path('events/<int:event_id>/edit/', view('events.edit_event'), name='edit_event'),
+    path('events/reports/', view('events.event_report'), name='event_report'),
+
+    path('event/book/', view('events.event_book'), name='event_book'),
+    path('event/book/add/', view('events.event_book_add'), name='event_book_add'),
+    path('event/bookings/', view('events.event_bookings_list'), name='event_bookings_list'),
+    path('event/booking/<str:booking_id>/', view('events.event_booking_detail'), name='event_booking_detail'),
+    path('event/booking/<str:booking_id>/cancel/', view('events.event_booking_cancel'), name='event_booking_cancel'),
+    path('event-bookings/<int:booking_id>/edit/', view('events.admin_event_booking_edit'), name='admin_event_booking_edit'),
+    path('events/<int:event_id>/delete/', view('events.delete_event'), name='delete_event'),
 
     # Movies 
-    path('dashboard/eventapp/moviescreen/', views.admin_movie_screen, name='admin_movie_screen'),  
-    path('dashboard/eventapp/movie/', views.admin_movie_list, name='admin_movie_list'),
-    path('dashboard/eventapp/movieticketbooking/', views.movie_bookings_list, name='movie_bookings_list'),
+    path('dashboard/eventapp/moviescreen/', view('movies.admin_movie_screen'), name='admin_movie_screen'),  
+    path('dashboard/eventapp/movie/', view('movies.admin_movie_list'), name='admin_movie_list'),
+    path('dashboard/eventapp/movieticketbooking/', view('movies.movie_bookings_list'), name='movie_bookings_list'),
     # View Movie Booking 
-    path('bookings/<int:booking_id>/view/', views.movies_booking_view, name='movies_booking_view'),
+    path('bookings/<int:booking_id>/view/', view('movies.movies_booking_view'), name='movies_booking_view'),
     # Edit Movie Booking
-    path('bookings/<int:booking_id>/edit/', views.movies_booking_edit, name='movies_booking_edit'),
+    path('bookings/<int:booking_id>/edit/', view('movies.movies_booking_edit'), name='movies_booking_edit'),
     # Delete Movie Booking
-    path('bookings/<int:booking_id>/delete/', views.movies_booking_delete, name='movies_booking_delete'),
+    path('bookings/<int:booking_id>/delete/', view('movies.movies_booking_delete'), name='movies_booking_delete'),
     # Add Movie
-    path('movies/add/', views.add_movie, name='add_movie'),
+    path('movies/add/', view('movies.add_movie'), name='add_movie'),
     # Movie Catlog
-    path('movies/', views.movie_catalog, name='movies'),
+    path('movies/', view('movies.movie_catalog'), name='movies'),
     # Edit Movie Screen
-    path('screens/edit/<int:screen_id>/', views.edit_movie_screen, name='edit_movie_screen'),
+    path('screens/edit/<int:screen_id>/', view('movies.edit_movie_screen'), name='edit_movie_screen'),
     # Delete Movie Screen
-    path('screens/delete/<int:screen_id>/', views.delete_movie_screen, name='delete_movie_screen'),
+    path('screens/delete/<int:screen_id>/', view('movies.delete_movie_screen'), name='delete_movie_screen'),
     # Book Movie
-    path('book-movie/', views.book_movie, name='book_movie'),
+    path('book-movie/', view('movies.book_movie'), name='book_movie'),
     # Movie seat selection
-    path('book-movie/<int:movie_id>/seats/', views.book_seat_selection, name='book_seat_selection'),
+    path('book-movie/<int:movie_id>/seats/', view('movies.book_seat_selection'), name='book_seat_selection'),
+    path('screens/<int:screen_id>/seat-map/', view('movies.seat_map'), name='seat_map'),
+    path('screens/<int:screen_id>/holds/', view('movies.hold_seats'), name='hold_seats'),
+    path('screens/<int:screen_id>/holds/release/', view('movies.release_seats'), name='release_seats'),
 
 
     # comedy shows 
-    path('comedy/shows/', views.comedy_shows_list, name='comedy_shows_list'),
-    path('comedy/bookings/', views.comedy_bookings, name='comedy_bookings'),
-    path('comedy/book-ticket/', views.book_comedy_show, name='book_comedy_show'),
-    path('comedy/add/', views.add_comedy_show, name='add_comedy_show'),
-    path('bookings/view/<int:booking_id>/', views.comedy_show_bookings_view, name='comedy_show_bookings_view'),
-    path('bookings/edit/<int:booking_id>/', views.comedy_show_bookings_edit, name='comedy_show_bookings_edit'),
-    path('comedy-shows/delete/<int:show_id>/', views.delete_comedy_show, name='delete_comedy_show'),
-    path('show/edit/<int:pk>/', views.edit_comedy_show_list, name='edit_comedy_show_list'),
-    path('show/delete/<int:pk>/', views.delete_comedy_show_list, name='delete_comedy_show_list'),
+    path('comedy/shows/', view('comedy.comedy_shows_list'), name='comedy_shows_list'),
+    path('comedy/bookings/', view('comedy.comedy_bookings'), name='comedy_bookings'),
+    path('comedy/book-ticket/', view('comedy.book_comedy_show'), name='book_comedy_show'),
+    path('comedy/add/', view('comedy.add_comedy_show'), name='add_comedy_show'),
+    path('bookings/view/<int:booking_id>/', view('comedy.comedy_show_bookings_view'), name='comedy_show_bookings_view'),
+    path('bookings/edit/<int:booking_id>/', view('comedy.comedy_show_bookings_edit'), name='comedy_show_bookings_edit'),
+    path('comedy-shows/delete/<int:show_id>/', view('comedy.delete_comedy_show'), name='delete_comedy_show'),
+    path('show/edit/<int:pk>/', view('comedy.edit_comedy_show_list'), name='edit_comedy_show_list'),
+    path('show/delete/<int:pk>/', view('comedy.delete_comedy_show_list'), name='delete_comedy_show_list'),
 
 
 
 
+    # Recurring series
+    path('series/', view('series.series_list'), name='series_list'),
+    path('series/new/<str:kind>/<int:pk>/', view('series.create_series'), name='create_series'),
+    path('series/<int:pk>/', view('series.series_detail'), name='series_detail'),
+    path('series/<int:pk>/delete/', view('series.delete_series'), name='delete_series'),
+
+    # Report jobs
+    path('reports/<str:name>/', view('reports.report_request'), name='report_request'),
+    path('reports/jobs/<int:job_id>/', view('reports.report_job'), name='report_job'),
+    path('reports/jobs/<int:job_id>/result/', view('reports.report_result'), name='report_result'),
+
+    # Analytics
+    path('analytics/cube/', view('dashboard.analytics_cube'), name='analytics_cube'),
+    path('analytics/histogram/', view('dashboard.booking_histogram'), name='booking_histogram'),
+    path('analytics/leaderboards/', view('dashboard.leaderboard_data'), name='leaderboard_data'),
+    path('analytics/leaderboards/rebuild/', view('dashboard.rebuild_leaderboards'), name='rebuild_leaderboards'),
+    path('activity/recent/', view('dashboard.recent_activity'), name='recent_activity'),
+
+    # Diagnostics
+    path('diagnostics/slow-queries/', view('diagnostics.slow_queries'), name='slow_queries'),
+    path('diagnostics/slow-queries/reset/', view('diagnostics.reset_slow_queries'), name='reset_slow_queries'),
+
+    # Typeahead pickers
+    path('typeahead/<str:source>/', view('dashboard.typeahead_search'), name='typeahead_search'),
+
+    # Read-only JSON API
+    path('api/', view('admin_panel.api.api_index'), name='api_index'),
+    path('api/<str:resource>/', view('admin_panel.api.api_list'), name='api_list'),
+    path('api/<str:resource>/<int:pk>/', view('admin_panel.api.api_detail'), name='api_detail'),
+
     # Other views
-    path('movies/create/', views.create_movie, name='create_movie'),
-    path('concerts/create/', views.create_concert, name='create_concert'),
+    path('movies/create/', view('movies.create_movie'), name='create_movie'),
+    path('concerts/create/', view('events.create_concert'), name='create_concert'),
 ]
 
 if settings.DEBUG:
@@ -0,0 +1,39 @@
+# admin_panel/views/__init__.py
+"""
+Admin panel views, one module per vertical.
+
+The URLconf refers to views through lazy_view('<module>.<name>') so a
+worker only imports a vertical's module (and its forms) the first time a
+URL from that vertical is requested, rather than all of them at boot.
+"""
+import functools
+from importlib import import_module
+
+
+def lazy_view(path, is_async=False):
+    """Return a view that imports ``admin_panel.views.<module>.<name>`` on first call
+
+    A dotted module (``admin_panel.api.api_list``) is imported as given.
+    Class-based views are turned into callables with as_view(). Async views
+    must be flagged with ``is_async=True`` so the handler awaits the wrapper.
+    """
+    module_name, _, attr = path.rpartition('.')
+    if '.' not in module_name:
+        module_name = f'{__name__}.{module_name}'
+
+    @functools.cache
+    def resolve():
+        target = getattr(import_module(module_name), attr)
+        return target.as_view() if isinstance(target, type) else target
+
+    if is_async:
+        async def view(request, *args, **kwargs):
+            return await resolve()(request, *args, **kwargs)
+    else:
+        def view(request, *args, **kwargs):
+            return resolve()(request, *args, **kwargs)
+
+    view.__name__ = view.__qualname__ = attr
+    view.__module__ = module_name
+    view.resolve = resolve
+    return view
@@ -0,0 +1,32 @@
+from django.shortcuts import render
+from django.contrib.auth import logout
+from django.contrib import messages
+from django.contrib.auth.views import LoginView
+from django.urls import reverse_lazy
+from django.contrib.auth.forms import AuthenticationForm
+
+
+# Custom login view to add messages
+class AdminLoginView(LoginView):
+    template_name = 'admin_panel/login.html'
+    redirect_authenticated_user = True
+    authentication_form = AuthenticationForm
+
+    def get_success_url(self):
+        return reverse_lazy('admin_dashboard')
+
+    def form_valid(self, form):
+        messages.success(self.request, 'Welcome back! You have successfully logged in.')
+        return super().form_valid(form)
+    
+    def form_invalid(self, form):
+        messages.error(self.request, 'Invalid username or password. Please try again.')
+        return super().form_invalid(form)
+
+# Custom logout view
+def admin_logout(request):
+    """Custom logout view to show logout confirmation"""
+    if request.user.is_authenticated:
+        messages.success(request, 'You have been successfully logged out.')
+    logout(request)
+    return render(request, 'admin_panel/logout.html')
@@ -0,0 +1,221 @@
+from django.shortcuts import render, get_object_or_404, redirect
+from django.contrib import messages
+from django.utils import timezone
+from datetime import date
+from django.contrib.auth import get_user_model
+from ..models import ComedyShow, BookingComedyShow
+from ..forms import ComedyShowForm
+from .. import activity
+from .. import archive
+from .. import conditional
+from ..conditional import conditional_page
+from ..facets import INDEXES
+import uuid
+
+
+# comedy shows
+
+@conditional_page(conditional.comedy_shows_etag)
+def comedy_shows_list(request):
+    index = INDEXES['comedy']
+    shows, facets = index.filter(ComedyShow.objects.all().order_by('-date'), index.parse(request.GET))
+    context = {
+        'page_title': 'Comedy Shows',
+        'shows': shows,
+        'facets': facets,
+    }
+    return render(request, 'admin_panel/comedys/comedy_shows_list.html', context)
+
+
+def comedy_bookings(request):
+    archived = request.GET.get('archived') == '1'
+    bookings = (archive.bookings(BookingComedyShow, archived)
+                .select_related('user', 'comedy_show').order_by('-booking_date'))
+    context = {
+        'page_title': 'Comedy Bookings',
+        'bookings': bookings,
+        'archived': archived,
+    }
+    return render(request, 'admin_panel/comedys/comedy_bookings.html', context)
+
+def book_comedy_show(request):
+    if request.method == 'POST':
+        try:
+            user_id = request.POST.get('user_id')
+            show_id = request.POST.get('show_id')
+            tickets = int(request.POST.get('tickets'))
+            
+            # BookingComedyShow.user is an auth.User, not one of the site's eventapp users
+            user = get_user_model().objects.get(id=user_id)
+            show = ComedyShow.objects.get(id=show_id)
+            
+            # 1. Check Availability
+            if show.available_seats < tickets:
+                messages.error(request, f"Not enough seats! Only {show.available_seats} left.")
+                return redirect('book_comedy_show')
+
+            # 2. Calculate Totals
+            total_price = show.ticket_price * tickets
+            
+            # 3. Create Booking ID
+            booking_id = f"COM-{uuid.uuid4().hex[:8].upper()}"
+
+            # 4. Create Record
+            booking = BookingComedyShow(
+                booking_id=booking_id,
+                user=user,
+                comedy_show=show,
+                number_of_tickets=tickets,
+                booking_date=timezone.now(),
+                total_price=total_price,
+                payment_status=True # Assuming admin booking is paid/manual
+            )
+            booking.save()
+
+            # 5. Update Seats
+            show.available_seats -= tickets
+            show.save()
+            activity.record(request, 'create', booking, f"Comedy booking {booking_id} created for '{show.title}'")
+
+            messages.success(request, f"Booking {booking_id} created successfully!")
+            return redirect('comedy_bookings')
+
+        except Exception as e:
+            messages.error(request, f"Error creating booking: {str(e)}")
+            return redirect('book_comedy_show')
+
+    # GET Request: users and shows are picked through the typeahead endpoints
+    context = {
+        'page_title': 'Book Comedy Show',
+    }
+    return render(request, 'admin_panel/comedys/book_comedy_show.html', context)
+
+
+def add_comedy_show(request):
+    if request.method == 'POST':
+        try:
+            # Extract fields from the form
+            title = request.POST.get('title')
+            description = request.POST.get('description')
+            location = request.POST.get('location')
+            date = request.POST.get('date')
+            time = request.POST.get('time')
+            comedian_name = request.POST.get('comedian_name')
+            age_limit = request.POST.get('age_limit')
+            total_seats = int(request.POST.get('total_seats'))
+            ticket_price = request.POST.get('ticket_price')
+            
+            # Additional fields
+            comedy_type = request.POST.get('comedy_type')
+            rating = request.POST.get('rating')
+            duration = request.POST.get('duration')
+            popularity = request.POST.get('popularity')
+            experience = request.POST.get('experience')
+
+            # Handle Image Upload
+            image = request.FILES.get('image')
+
+            # Create the ComedyShow object
+            # Note: For a new show, we typically set available_seats = total_seats initially
+            new_show = ComedyShow(
+                title=title,
+                description=description,
+                location=location,
+                date=date,
+                time=time,
+                comedian_name=comedian_name,
+                age_limit=age_limit,
+                total_seats=total_seats,
+                ticket_price=ticket_price,
+                available_seats=total_seats,  # Initialize availability
+                image=image,
+                comedy_type=comedy_type,
+                rating=rating,
+                duration=duration,
+                popularity=popularity,
+                experience=experience
+            )
+            new_show.save()
+            activity.record(request, 'create', new_show, f"Comedy show '{title}' created")
+
+            messages.success(request, f"Comedy Show '{title}' created successfully!")
+            return redirect('comedy_shows_list')
+
+        except Exception as e:
+            messages.error(request, f"Error creating show: {str(e)}")
+            # In a real app, you might want to return the form with entered data here
+            return redirect('add_comedy_show')
+
+    # GET Request: Display the empty form
+    context = {
+        'page_title': 'Add Comedy Show'
+    }
+    return render(request, 'admin_panel/comedys/add_comedy_show.html', context)
+
+
+
+def comedy_show_bookings_view(request, booking_id):
+    booking = get_object_or_404(BookingComedyShow, id=booking_id)
+    
+    context = {
+        'booking': booking,
+    }
+    return render(request, 'admin_panel/comedys/comedy_show_bookings_view.html', context)
+
+
+def comedy_show_bookings_edit(request, booking_id):
+    booking = get_object_or_404(BookingComedyShow, id=booking_id)
+    if request.method == 'POST':
+        booking.number_of_tickets = request.POST.get('number_of_tickets')
+        payment_status = request.POST.get('payment_status')
+        if payment_status == 'Paid':
+            booking.payment_status = True
+        else:
+            booking.payment_status = False
+        booking.save()
+        activity.record(request, 'edit', booking, f"Comedy booking {booking.booking_id} updated")
+        messages.success(request, 'Booking updated successfully!')
+        return redirect('comedy_show_bookings') 
+
+    context = {
+        'booking': booking,
+    }
+    return render(request, 'admin_panel/comedys/comedy_show_bookings_edit.html', context)
+
+
+def delete_comedy_show(request, show_id):
+    show = get_object_or_404(ComedyShow, id=show_id)
+    if request.method == 'POST':
+        show.delete()
+        activity.record(request, 'delete', show, f"Comedy show '{show.title}' deleted", object_id=show_id)
+        messages.success(request, 'Comedy show deleted successfully!')
+        return redirect('comedy_shows') 
+    context = {
+        'show': show
+    }
+    return render(request, 'admin_panel/comedy_show_delete_confirm.html', context)
+
+def edit_comedy_show_list(request, pk):
+    show = get_object_or_404(ComedyShow, pk=pk)
+    
+    if request.method == 'POST':
+        form = ComedyShowForm(request.POST, request.FILES, instance=show)
+        if form.is_valid():
+            form.save()
+            activity.record(request, 'edit', show, f"Comedy show '{show.title}' updated")
+            messages.success(request, f"Show '{show.title}' updated successfully!")
+            return redirect('comedy_show_list') 
+    else:
+        form = ComedyShowForm(instance=show)
+    return render(request, 'admin_panel/comedys/edit_comedy_show.html', {
+        'form': form, 
+        'show': show
+    })
+
+def delete_comedy_show_list(request, pk):
+    if request.method == 'POST':
+        show = get_object_or_404(ComedyShow, pk=pk)
+        show.delete()
+        activity.record(request, 'delete', show, f"Comedy show '{show.title}' deleted", object_id=pk)
+        messages.warning(request, "Show has been deleted.")
+    return redirect('add_comedy_show') 
@@ -0,0 +1,153 @@
+from django.shortcuts import render
+from django.contrib.auth.decorators import login_required
+from django.views.decorators.http import require_POST
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, HttpResponse, StreamingHttpResponse
+from ..models import Event, User
+from .. import analytics
+from .. import activity
+from .. import histogram
+from ..leaderboards import leaderboards, WINDOWS
+from .. import live_feed
+from .. import typeahead
+import asyncio
+from datetime import timedelta
+
+
+# Dashboard view (with login required)
+@login_required(login_url='/admin-panel/login/')
+def dashboard(request):
+    # Get event stats
+    total_events = Event.objects.count() if hasattr(Event, 'objects') else 0
+    upcoming_events = Event.objects.filter(date__gte=timezone.now().date()).count() if hasattr(Event, 'objects') else 0
+    
+    context = {
+        'page_title': 'Dashboard',
+        'current_date': timezone.now().strftime('%A, %d %B %Y'),
+        'dashboard_stats': {
+            'total_events': total_events,
+            'total_users': User.objects.count() if hasattr(User, 'objects') else 89,
+            'upcoming_events': upcoming_events,
+        },
+        'events_count': total_events,
+        'upcoming_count': upcoming_events,
+        'leaderboards': leaderboards.tops('week'),
+        'recent_activity': activity.recent(5),
+        # Under WSGI the stream would pin a worker and never flush; the page polls instead
+        'live_feed': isinstance(request, ASGIRequest),
+    }
+    return render(request, 'admin_panel/dashboard.html', context)
+
+async def dashboard_stream(request):
+    """Server-Sent Events stream of new bookings, cancellations and stat deltas (ASGI only)"""
+    if not isinstance(request, ASGIRequest):
+        # WSGI drains an async iterator completely before sending it, i.e. never for this one
+        return HttpResponse("The live feed needs an ASGI server.", status=400, content_type='text/plain')
+    user = await request.auser()
+    if not user.is_authenticated:
+        return HttpResponse(status=401)
+
+    queue = live_feed.hub.subscribe()
+
+    async def event_stream():
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    # Comment frame keeps proxies from closing an idle connection
+                    yield ": keepalive\n\n"
+                    continue
+                yield live_feed.format_event(message)
+        finally:
+            live_feed.hub.unsubscribe(queue)
+
+    response = StreamingHttpResponse(event_stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+def _csv_param(request, name):
+    """Collect ?name=a,b&name=c style query parameters into one list"""
+    return [value for item in request.GET.getlist(name) for value in item.split(',') if value]
+
+
+@login_required(login_url='/admin-panel/login/')
+def analytics_cube(request):
+    """Group-by/filter/sum over bookings of every vertical, as JSON for dashboard charts"""
+    group_by = _csv_param(request, 'group_by')
+    filters = {dim: _csv_param(request, dim) for dim in analytics.ENCODED_DIMENSIONS}
+    start = parse_date(request.GET.get('start', '') or '')
+    end = parse_date(request.GET.get('end', '') or '')
+
+    try:
+        rows, elapsed_ms = analytics.run_query(group_by=group_by, filters=filters, start=start, end=end)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    return JsonResponse({
+        'group_by': group_by,
+        'rows': rows,
+        'query_ms': round(elapsed_ms, 3),
+        'cube': analytics.cube.stats(),
+    })
+
+@login_required(login_url='/admin-panel/login/')
+def booking_histogram(request):
+    """Bookings, tickets and revenue per hour/day/week/month bucket between two dates, as JSON"""
+    verticals = _csv_param(request, 'vertical')
+    try:
+        end = parse_date(request.GET.get('end', '') or '') or timezone.localdate()
+        start = parse_date(request.GET.get('start', '') or '') or end - timedelta(days=29)
+        data = histogram.booking_histogram(start, end, request.GET.get('granularity', 'day'), verticals)
+    except OverflowError:
+        return JsonResponse({'error': 'Dates are out of range'}, status=400)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    return JsonResponse(data)
+
+@login_required(login_url='/admin-panel/login/')
+def leaderboard_data(request):
+    """Top sellers per vertical for ?window=today|week|month, as JSON"""
+    window = request.GET.get('window', 'week')
+    if window not in WINDOWS:
+        return JsonResponse({'error': f"Unknown window: {window}"}, status=400)
+    try:
+        size = min(int(request.GET.get('size', 5)), 50)
+    except ValueError:
+        return JsonResponse({'error': 'size must be an integer'}, status=400)
+    return JsonResponse({
+        'window': window,
+        'boards': leaderboards.tops(window, size),
+        'rebuilt_at': leaderboards.rebuilt_at.isoformat() if leaderboards.rebuilt_at else None,
+    })
+
+@login_required(login_url='/admin-panel/login/')
+@require_POST
+def rebuild_leaderboards(request):
+    """Recount the leaderboards from the booking tables"""
+    leaderboards.rebuild()
+    return JsonResponse({'rebuilt_at': leaderboards.rebuilt_at.isoformat()})
+
+@login_required(login_url='/admin-panel/login/')
+def recent_activity(request):
+    """Last ?limit= staff actions, newest first, including ones not flushed yet"""
+    try:
+        limit = max(min(int(request.GET.get('limit', 20)), activity.RING_SIZE), 1)
+    except ValueError:
+        return JsonResponse({'error': 'limit must be an integer'}, status=400)
+    return JsonResponse({'activity': activity.recent(limit), 'buffer': activity.buffer.stats()})
+
+@login_required(login_url='/admin-panel/login/')
+def typeahead_search(request, source):
+    """Prefix matches for the picker inputs, as JSON"""
+    if source not in typeahead.SOURCES:
+        return JsonResponse({'error': f"Unknown source: {source}"}, status=404)
+    try:
+        limit = int(request.GET.get('limit', typeahead.DEFAULT_LIMIT))
+    except ValueError:
+        return JsonResponse({'error': 'limit must be an integer'}, status=400)
+    return JsonResponse({'results': typeahead.results(source, request.GET.get('q', ''), limit)})
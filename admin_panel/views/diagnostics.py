@@ -0,0 +1,39 @@
+from django.contrib import messages
+from django.contrib.admin.views.decorators import staff_member_required
+from django.shortcuts import render, redirect
+from django.views.decorators.http import require_POST
+
+from .. import querylog
+
+SORT_KEYS = {'total': 'total_ms', 'p95': 'p95_ms', 'max': 'max_ms', 'count': 'count'}
+
+
+# ========= SLOW QUERIES =========
+
+@staff_member_required(login_url='/admin-panel/login/')
+def slow_queries(request):
+    """Query fingerprints and URL names ranked by ?sort= (total, p95, max or count)"""
+    sort = request.GET.get('sort', 'total')
+    if sort not in SORT_KEYS:
+        sort = 'total'
+    fingerprints, urls = querylog.load()
+    key = SORT_KEYS[sort]
+    fingerprints.sort(key=lambda row: row[key], reverse=True)
+    urls.sort(key=lambda row: row[key], reverse=True)
+
+    context = {
+        'fingerprints': fingerprints[:100],
+        'urls': urls[:50],
+        'sort': sort,
+        'sort_options': list(SORT_KEYS),
+        'threshold_ms': querylog.SLOW_QUERY_MS,
+    }
+    return render(request, 'admin_panel/slow_queries.html', context)
+
+
+@staff_member_required(login_url='/admin-panel/login/')
+@require_POST
+def reset_slow_queries(request):
+    querylog.clear()
+    messages.success(request, "Query statistics cleared.")
+    return redirect('slow_queries')
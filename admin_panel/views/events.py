@@ -0,0 +1,531 @@
+from django.shortcuts import render, get_object_or_404, redirect
+from django.contrib.auth.decorators import login_required
+from django.contrib import messages
+from django.urls import reverse
+from django.utils import timezone
+from datetime import date
+from django.db.models import Count, Sum, Q, Avg
+from ..models import Event, BookingsEvent
+from ..forms import EventForm
+from .. import activity
+from .. import archive
+from .. import conditional
+from .. import streaming
+from ..conditional import conditional_page
+from ..facets import INDEXES
+import uuid
+
+
+# ========= EVENT MANAGEMENT VIEWS =========
+
+@login_required(login_url='/admin-panel/login/')
+def admin_event_bookings(request):
+    """Admin view for event bookings; ?archived=1 lists the archive table instead"""
+    archived = request.GET.get('archived') == '1'
+    bookings = archive.bookings(BookingsEvent, archived).select_related('event', 'user').order_by('-booking_date')
+    
+    # Filtering
+    status_filter = request.GET.get('status', '')
+    if status_filter:
+        bookings = bookings.filter(status=status_filter)
+    
+    # Search
+    search_query = request.GET.get('search', '')
+    if search_query:
+        bookings = bookings.filter(
+            Q(event__name__icontains=search_query) |
+            Q(user__username__icontains=search_query) |
+            Q(booking_id__icontains=search_query)
+        )
+    
+    # Stats
+    total_bookings = bookings.count()
+    pending_bookings = bookings.filter(status='pending').count()
+    confirmed_bookings = bookings.filter(status='confirmed').count()
+    cancelled_bookings = bookings.filter(status='cancelled').count()
+    
+    context = {
+        'bookings': bookings,
+        'total_bookings': total_bookings,
+        'pending_bookings': pending_bookings,
+        'confirmed_bookings': confirmed_bookings,
+        'cancelled_bookings': cancelled_bookings,
+        'status_filter': status_filter,
+        'search_query': search_query,
+        'page_title': 'Event Bookings',
+        'archived': archived,
+    }
+    return streaming.render_list(
+        request, 'admin_panel/events/event_book_list.html', context, bookings,
+        'admin_panel/events/event_booking_row.html', 'admin_panel/events/event_booking_row_empty.html',
+    )
+
+@login_required(login_url='/admin-panel/login/')
+def admin_event_booking_detail(request, booking_id):
+    """Admin view for booking detail; archived bookings are shown read-only"""
+    booking, archived = archive.get_booking(BookingsEvent, ('event', 'user'), id=booking_id)
+    
+    if request.method == 'POST' and archived:
+        messages.error(request, 'Archived bookings cannot be changed.')
+    elif request.method == 'POST':
+        new_status = request.POST.get('status')
+        if new_status and new_status in ['pending', 'confirmed', 'cancelled']:
+            booking.status = new_status
+            booking.save()
+            activity.record(request, 'cancel' if new_status == 'cancelled' else 'edit', booking,
+                            f'Event booking {booking.booking_id} set to {new_status}')
+            messages.success(request, f'Booking status updated to {new_status}')
+            return redirect('admin_event_booking_detail', booking_id=booking_id)
+    
+    context = {
+        'booking': booking,
+        'archived': archived,
+        'page_title': f'Booking #{booking.booking_id}',
+    }
+    return render(request, 'admin_panel/events/event_booking_detail.html', context)
+
+
+# In views.py
+
+@login_required(login_url='/admin-panel/login/')
+def admin_event_booking_edit(request, booking_id):
+    """View to edit a specific booking"""
+    booking = get_object_or_404(BookingsEvent, id=booking_id)
+    
+    if request.method == 'POST':
+        try:
+            # Update basic fields
+            booking.customer_name = request.POST.get('customer_name')
+            booking.customer_email = request.POST.get('customer_email')
+            booking.customer_phone = request.POST.get('customer_phone')
+            booking.special_request = request.POST.get('special_request')
+            booking.status = request.POST.get('status')
+            
+            # Handle Checkbox for Payment Status
+            booking.payment_status = request.POST.get('payment_status') == 'on'
+            
+            # Handle Ticket Update & Price Recalculation
+            new_tickets = int(request.POST.get('number_of_tickets'))
+            if new_tickets != booking.number_of_tickets:
+                booking.number_of_tickets = new_tickets
+                # Recalculate total amount based on event price
+                booking.total_amount = booking.event.ticket_price * new_tickets
+            
+            booking.save()
+            activity.record(request, 'edit', booking, f'Event booking {booking.booking_id} updated')
+            messages.success(request, f'Booking #{booking.booking_id} updated successfully!')
+            return redirect('admin_event_bookings')
+            
+        except ValueError:
+            messages.error(request, 'Invalid input for tickets.')
+        except Exception as e:
+            messages.error(request, f'Error updating booking: {str(e)}')
+            
+    context = {
+        'booking': booking,
+        'page_title': f'Edit Booking #{booking.booking_id}',
+    }
+    return render(request, 'admin_panel/events/event_book_edit.html', context)
+
+
+@login_required(login_url='/admin-panel/login/')
+@conditional_page(conditional.events_list_etag)
+def admin_events_list(request):
+    """Custom admin view for events list"""
+    today = date.today()
+    events = Event.objects.annotate(
+        booking_count=Count('bookingsevent')
+    ).order_by('-date')
+    
+    # Filtering: location / month / upcoming-past facets
+    index = INDEXES['events']
+    events, facets = index.filter(events, index.parse(request.GET))
+
+    status_filter = request.GET.get('status', '')
+    if status_filter == 'upcoming':
+        events = events.filter(date__gte=today)
+    elif status_filter == 'past':
+        events = events.filter(date__lt=today)
+    
+    # Search
+    search_query = request.GET.get('search', '')
+    if search_query:
+        events = events.filter(
+            Q(name__icontains=search_query) |
+            Q(location__icontains=search_query) |
+            Q(description__icontains=search_query)
+        )
+    
+    # Stats
+    total_events = events.count()
+    upcoming_events = events.filter(date__gte=today).count()
+    past_events = events.filter(date__lt=today).count()
+    
+    context = {
+        'events': events,
+        'total_events': total_events,
+        'upcoming_events': upcoming_events,
+        'past_events': past_events,
+        'today': today,
+        'facets': facets,
+        'status_filter': status_filter,
+        'search_query': search_query,
+        'page_title': 'Manage Events',
+    }
+    return render(request, 'admin_panel/events/events.html', context)
+
+
+@login_required(login_url='/admin-panel/login/')
+def admin_event_detail(request, event_id):
+    """Custom admin view for event details"""
+    try:
+        event = Event.objects.annotate(
+            booking_count=Count('bookingsevent')
+        ).get(id=event_id)
+    except Event.DoesNotExist:
+        messages.error(request, 'Event not found!')
+        return redirect('admin_events_list')
+    
+    # Get bookings for this event
+    bookings = BookingsEvent.objects.filter(event=event).select_related('user').order_by('-booking_date')
+    
+    # Calculate stats
+    total_bookings = bookings.count()
+    total_revenue = bookings.aggregate(Sum('total_amount'))['total_amount__sum'] or 0
+    
+    # Calculate booked seats by summing up all tickets from confirmed bookings
+    # Only count confirmed bookings (not pending or cancelled)
+    confirmed_bookings = bookings.filter(status='confirmed')
+    booked_seats = confirmed_bookings.aggregate(total_tickets=Sum('number_of_tickets'))['total_tickets'] or 0
+    
+    # Calculate available seats
+    if event.total_seats is not None:
+        available_seats = max(0, event.total_seats - booked_seats)
+        
+        # Calculate booking percentage
+        if event.total_seats > 0:
+            booking_percentage = (booked_seats / event.total_seats) * 100
+        else:
+            booking_percentage = 0
+    else:
+        available_seats = event.available_seats or 0
+        booking_percentage = 0
+    
+    # Check if event is sold out
+    is_sold_out = available_seats <= 0
+    
+    context = {
+        'event': event,
+        'bookings': bookings,
+        'total_bookings': total_bookings,
+        'total_revenue': total_revenue,
+        'available_seats': available_seats,
+        'booked_seats': booked_seats,  # Add this to context
+        'booking_percentage': booking_percentage,  # Add this to context
+        'is_sold_out': is_sold_out,  # Add this to context
+        'today': date.today(),
+        'page_title': f'Event: {event.name}',
+    }
+    return render(request, 'admin_panel/events/event_detail.html', context)
+
+
+
+@login_required(login_url='/admin-panel/login/')
+def create_event(request):
+    """Create new event"""
+    if request.method == 'POST':
+        form = EventForm(request.POST, request.FILES)
+        if form.is_valid():
+            event = form.save()
+            activity.record(request, 'create', event, f'Event "{event.name}" created')
+            messages.success(request, f'Event "{event.name}" created successfully!')
+            return redirect('admin_event_detail', event_id=event.id)
+    else:
+        form = EventForm()
+    
+    # Get stats for sidebar
+    total_events = Event.objects.count()
+    upcoming_events = Event.objects.filter(date__gte=date.today()).count()
+    avg_price = Event.objects.aggregate(avg=Avg('ticket_price'))['avg'] or 0
+    avg_seats = Event.objects.aggregate(avg=Avg('total_seats'))['avg'] or 0
+    
+    context = {
+        'form': form,
+        'total_events': total_events,
+        'upcoming_events': upcoming_events,
+        'avg_price': avg_price,
+        'avg_seats': avg_seats,
+        'page_title': 'Create Event',
+        'event': None, 
+    }
+    return render(request, 'admin_panel/events/create_event.html', context)
+
+@login_required(login_url='/admin-panel/login/')
+def edit_event(request, event_id):
+    """Edit existing event"""
+    event = get_object_or_404(Event, id=event_id)
+    
+    if request.method == 'POST':
+        form = EventForm(request.POST, request.FILES, instance=event)
+        if form.is_valid():
+            event = form.save()
+            activity.record(request, 'edit', event, f'Event "{event.name}" updated')
+            messages.success(request, f'Event "{event.name}" updated successfully!')
+            return redirect('admin_event_detail', event_id=event.id)
+    else:
+        form = EventForm(instance=event)
+    
+    context = {
+        'form': form,
+        'event': event,
+        'page_title': f'Edit Event: {event.name}',
+    }
+    return render(request, 'admin_panel/events/create_event.html', context)
+
+
+
+def generate_booking_id():
+    """Generate a unique booking ID matching the model's format"""
+    while True:
+        booking_id = f"EVT{uuid.uuid4().hex[:8].upper()}"
+        if not BookingsEvent.objects.filter(booking_id=booking_id).exists():
+            return booking_id
+
+
+
+@login_required
+def event_book(request):
+    events = Event.objects.filter(
+        date__gte=timezone.now().date()  
+    ).order_by('date', 'time')
+    context = {
+        'events': events,
+        'current_date': timezone.now(),
+    }
+    return render(request, 'admin_panel/events/event_book.html', context)
+
+
+@login_required(login_url='/admin-panel/login/')
+def delete_event(request, event_id):
+    """Delete an event"""
+    event = get_object_or_404(Event, id=event_id)
+    if request.method == 'POST':
+        event.delete()
+        activity.record(request, 'delete', event, f'Event "{event.name}" deleted', object_id=event_id)
+        messages.success(request, 'Event deleted successfully.')
+        return redirect('admin_events_list')
+    return redirect('admin_events_list')
+
+
+@login_required(login_url='/admin-panel/login/')
+@conditional_page(conditional.event_detail_etag)
+def admin_event_detail(request, event_id):
+    try:
+        # Get event with booking count annotation
+        event = Event.objects.annotate(
+            booking_count=Count('bookingsevent')
+        ).get(id=event_id)
+    except Event.DoesNotExist:
+        messages.error(request, 'Event not found!')
+        return redirect('admin_events_list')
+    
+    # Get all bookings for this specific event
+    bookings = BookingsEvent.objects.filter(event=event).select_related('user').order_by('-booking_date')
+    
+    # --- STATISTICS CALCULATION ---
+    total_bookings = bookings.count()
+    
+    # Calculate Total Revenue (handle None if no bookings)
+    total_revenue = bookings.aggregate(Sum('total_amount'))['total_amount__sum'] or 0
+    
+    # Calculate Booked Seats (only confirmed bookings count towards occupancy)
+    confirmed_bookings = bookings.filter(status='confirmed')
+    booked_seats = confirmed_bookings.aggregate(total_tickets=Sum('number_of_tickets'))['total_tickets'] or 0
+    
+    # Calculate Available Seats & Percentage
+    if event.total_seats and event.total_seats > 0:
+        available_seats = max(0, event.total_seats - booked_seats)
+        booking_percentage = (booked_seats / event.total_seats) * 100
+    else:
+        # Fallback if total_seats is not set or 0
+        available_seats = event.available_seats or 0
+        booking_percentage = 0
+        if available_seats == 0 and booked_seats > 0:
+            booking_percentage = 100 # Assume full if no total set but seats sold
+
+    is_sold_out = available_seats <= 0
+    
+    context = {
+        'event': event,
+        'bookings': bookings,
+        'total_bookings': total_bookings,
+        'total_revenue': total_revenue,
+        'available_seats': available_seats,
+        'booked_seats': booked_seats,
+        'booking_percentage': round(booking_percentage, 1),
+        'is_sold_out': is_sold_out,
+        'today': date.today(),
+        'page_title': f'Event: {event.name}',
+    }
+    return render(request, 'admin_panel/events/event_detail.html', context)
+
+
+@login_required
+def event_book_add(request):
+    """Handle the event booking form submission"""
+    if request.method == 'POST':
+        try:
+            # Get form data
+            event_id = request.POST.get('event')
+            number_of_tickets = int(request.POST.get('number_of_tickets', 1))
+            status = request.POST.get('status')
+            payment_status = request.POST.get('payment_status') == 'on'
+            customer_name = request.POST.get('customer_name')
+            customer_email = request.POST.get('customer_email')
+            customer_phone = request.POST.get('customer_phone', '')
+            special_request = request.POST.get('special_request', '')
+            
+            # Validate required fields
+            if not event_id or not status or not customer_name or not customer_email:
+                messages.error(request, 'Please fill all required fields.')
+                return redirect('event_book')
+            
+            # Get the event
+            event = get_object_or_404(Event, id=event_id)
+            
+            # Check if enough seats are available
+            if event.available_seats < number_of_tickets:
+                messages.error(request, f'Only {event.available_seats} seats available for this event.')
+                return redirect('event_book')
+            
+            # Calculate total amount
+            total_amount = event.ticket_price * number_of_tickets
+            
+            # Generate unique booking ID
+            booking_id = generate_booking_id()
+            
+            # Create booking WITHOUT user assignment for now
+            booking = BookingsEvent.objects.create(
+                event=event,
+                # user=None,  # Leave it as None for now
+                number_of_tickets=number_of_tickets,
+                total_amount=total_amount,
+                status=status,
+                booking_id=booking_id,
+                customer_name=customer_name,
+                customer_email=customer_email,
+                customer_phone=customer_phone,
+                special_request=special_request,
+                payment_status=payment_status
+            )
+            
+            activity.record(request, 'create', booking, f'Event booking {booking.booking_id} created for {event.name}')
+            messages.success(request, f'Booking {booking.booking_id} created successfully!')
+            
+            # Handle different save actions
+            if 'save_and_add' in request.POST:
+                return redirect('event_book')
+            elif 'save_and_continue' in request.POST:
+                return redirect('event_book')
+            else:
+                return redirect('event_bookings_list')
+                
+        except Event.DoesNotExist:
+            messages.error(request, 'Selected event does not exist.')
+            return redirect('event_book')
+        except ValueError as e:
+            messages.error(request, f'Invalid input: {str(e)}')
+            return redirect('event_book')
+        except Exception as e:
+            messages.error(request, f'Error creating booking: {str(e)}')
+            return redirect('event_book')
+    
+    return redirect('event_book')
+@login_required
+def event_bookings_list(request):
+    """Display list of all event bookings"""
+    archived = request.GET.get('archived') == '1'
+    bookings = archive.bookings(BookingsEvent, archived).select_related('event', 'user')
+    
+    # Filter by status if provided
+    status_filter = request.GET.get('status')
+    if status_filter:
+        bookings = bookings.filter(status=status_filter)
+    
+    # Filter by payment status if provided
+    payment_filter = request.GET.get('payment_status')
+    if payment_filter == 'paid':
+        bookings = bookings.filter(payment_status=True)
+    elif payment_filter == 'unpaid':
+        bookings = bookings.filter(payment_status=False)
+    
+    # Search by booking ID or customer name
+    search_query = request.GET.get('search')
+    if search_query:
+        bookings = bookings.filter(
+            Q(booking_id__icontains=search_query) |
+            Q(customer_name__icontains=search_query) |
+            Q(customer_email__icontains=search_query)
+        )
+    
+    context = {
+        'bookings': bookings,
+        'status_choices': BookingsEvent.STATUS_CHOICES,
+        'archived': archived,
+    }
+    return streaming.render_list(
+        request, 'admin_panel/events/event_book_list.html', context, bookings,
+        'admin_panel/events/event_booking_row.html', 'admin_panel/events/event_booking_row_empty.html',
+    )
+
+@login_required
+def event_booking_detail(request, booking_id):
+    """Display details of a specific booking"""
+    booking = get_object_or_404(BookingsEvent, booking_id=booking_id)
+    
+    context = {
+        'booking': booking,
+    }
+    return render(request, 'event_booking_detail.html', context)
+
+@login_required
+def event_booking_cancel(request, booking_id):
+    """Cancel a booking"""
+    if request.method == 'POST':
+        booking = get_object_or_404(BookingsEvent, booking_id=booking_id)
+        
+        if booking.status == 'cancelled':
+            messages.warning(request, 'Booking is already cancelled.')
+        else:
+            booking.status = 'cancelled'
+            booking.save()
+            activity.record(request, 'cancel', booking, f'Event booking {booking.booking_id} cancelled')
+            messages.success(request, f'Booking {booking.booking_id} has been cancelled.')
+        
+        return redirect('event_bookings_list')
+    
+    return redirect('event_bookings_list')
+
+# ========= OTHER VIEWS =========
+
+@login_required(login_url='/admin-panel/login/')
+def event_report(request):
+    """Event analytics report, run as a background job"""
+    url = reverse('report_request', args=['events'])
+    return redirect(f"{url}?{request.GET.urlencode()}" if request.GET else url)
+
+@login_required(login_url='/admin-panel/login/')
+def create_concert(request):
+    """Quick concert creation"""
+    if request.method == 'POST':
+        form = EventForm(request.POST, request.FILES)
+        if form.is_valid():
+            event = form.save(commit=False)
+            event.type = 'concert'
+            event.save()
+            activity.record(request, 'create', event, f'Concert "{event.name}" created')
+            messages.success(request, 'Concert created successfully!')
+            return redirect('admin_dashboard')
+    else:
+        form = EventForm()
+    return render(request, 'admin_panel/quick_create.html', {'form': form, 'type': 'Concert'})
@@ -0,0 +1,520 @@
+from django.shortcuts import render, get_object_or_404, redirect
+from django.contrib.auth.decorators import login_required, user_passes_test
+from django.contrib import messages
+import uuid
+from datetime import date
+from decimal import Decimal
+from django.db.models import Sum
+from django.utils import timezone
+from django.utils.dateparse import parse_duration
+from django.http import JsonResponse, HttpResponseNotModified
+from django.views.decorators.http import require_POST
+from ..models import Movie, MovieScreen, TheaterSeat, TicketBooking, User
+from ..forms import MovieForm
+from .. import activity
+from .. import archive
+from .. import conditional
+from .. import repricing
+from .. import seatmap
+from .. import streaming
+from ..facets import INDEXES
+from ..seat_holds import holds, HoldConflict
+from ..conditional import conditional_page
+from django.db import transaction
+
+
+# Quoted on the seat selection page and charged on counter bookings
+COUNTER_BOOKING_FEE = Decimal('20.00')
+
+# Movie
+
+@conditional_page(conditional.movie_screen_etag)
+def admin_movie_screen(request):
+    # Fetch data for the list and the form dropdown
+    screens = MovieScreen.objects.select_related('movie').all().order_by('-id')
+
+    if request.method == "POST":
+        try:
+            # 1. Get Form Data
+            movie_id = request.POST.get('movie')
+            screen_name = request.POST.get('screen_name')
+            total_rows = int(request.POST.get('total_rows'))
+            seats_per_row = int(request.POST.get('seats_per_row'))
+            
+            # Pricing Multipliers
+            prem_price = request.POST.get('premium_price')
+            exec_price = request.POST.get('executive_price')
+            norm_price = request.POST.get('normal_price')
+            
+            # Row Boundaries
+            prem_end = int(request.POST.get('premium_rows_end'))
+            exec_end = int(request.POST.get('executive_rows_end'))
+
+            # 2. Create the Movie Screen
+            movie_instance = get_object_or_404(Movie, id=movie_id)
+            
+            new_screen = MovieScreen.objects.create(
+                movie=movie_instance,
+                screen_name=screen_name,
+                total_rows=total_rows,
+                seats_per_row=seats_per_row,
+                premium_price_multiplier=prem_price,
+                executive_price_multiplier=exec_price,
+                normal_price_multiplier=norm_price,
+                premium_rows_end=prem_end,
+                executive_rows_end=exec_end
+            )
+
+            # 3. AUTOMATICALLY GENERATE SEATS
+            # Logic: Row 1 = A, Row 2 = B, etc.; the row boundaries pick type and price
+            seats_to_create = []
+
+            for row_num in range(1, total_rows + 1):
+                row_char = repricing.row_label(row_num)
+                s_type, s_price = repricing.seat_tier(new_screen, row_num)
+
+                # Create Seat Objects for this Row
+                for seat_num in range(1, seats_per_row + 1):
+                    seats_to_create.append(
+                        TheaterSeat(
+                            screen=new_screen,
+                            row=row_char,
+                            number=seat_num,
+                            seat_type=s_type,
+                            price=s_price,
+                            status="Available"
+                        )
+                    )
+            
+            # Bulk create for performance
+            TheaterSeat.objects.bulk_create(seats_to_create)
+            activity.record(request, 'create', new_screen,
+                            f"Screen '{screen_name}' created with {len(seats_to_create)} seats")
+
+            messages.success(request, f"Screen '{screen_name}' created with {len(seats_to_create)} seats generated!")
+            return redirect('admin_movie_screen')
+
+        except Exception as e:
+            messages.error(request, f"Error creating screen: {str(e)}")
+
+    context = {
+        'screens': screens,
+    }
+    return render(request, 'admin_panel/movies/movie_screen.html', context)
+
+
+@conditional_page(conditional.movie_catalog_etag)
+def movie_catalog(request):
+    # Fetch movies matching the selected facets, newest first (reverse ID)
+    index = INDEXES['movies']
+    movies, facets = index.filter(Movie.objects.all().order_by('-id'), index.parse(request.GET))
+
+    context = {
+        'movies': movies,
+        'facets': facets,
+    }
+    return render(request, 'admin_panel/movies/movies.html', context)
+
+
+def admin_movie_list(request):
+    # Fetch all movies, newest first
+    movies = Movie.objects.all().order_by('-id')
+
+    if request.method == "POST":
+        try:
+            # 1. Extract Data
+            title = request.POST.get('title')
+            description = request.POST.get('description')
+            location = request.POST.get('location')
+            language = request.POST.get('language')
+            director = request.POST.get('director')
+            cast = request.POST.get('cast')
+            genre = request.POST.get('genre')
+            popularity = request.POST.get('popularity')
+            
+            # Numeric/Date conversions
+            price = request.POST.get('ticket_price')
+            seats = request.POST.get('available_seats')
+            rating = request.POST.get('rating')
+            date = request.POST.get('date')
+            time = request.POST.get('time')
+            duration = request.POST.get('duration') # Expecting HH:MM:SS format
+            
+            # 2. Handle Image Upload
+            image = request.FILES.get('image')
+
+            # 3. Create Movie Object
+            movie = Movie.objects.create(
+                title=title,
+                description=description,
+                location=location,
+                date=date,
+                time=time,
+                language=language,
+                duration=duration,
+                director=director,
+                cast=cast,
+                genre=genre,
+                ticket_price=price,
+                available_seats=seats,
+                image=image,
+                rating=rating,
+                popularity=popularity
+            )
+
+            activity.record(request, 'create', movie, f"Movie '{title}' added")
+            messages.success(request, f"Movie '{title}' added successfully!")
+            return redirect('admin_movie_list')
+
+        except Exception as e:
+            messages.error(request, f"Error adding movie: {str(e)}")
+
+    return render(request, 'admin_panel/movies/movies.html', {'movies': movies})
+
+
+def movie_bookings_list(request):
+    # Fetch all bookings with related data to avoid N+1 queries; ?archived=1 reads the archive
+    archived = request.GET.get('archived') == '1'
+    bookings = archive.bookings(TicketBooking, archived).select_related('user', 'movie', 'screen').order_by('-booked_at')
+
+    # Calculate some summary stats for the top of the page
+    total_revenue = bookings.aggregate(Sum('grand_total'))['grand_total__sum'] or 0
+    total_bookings = bookings.count()
+    successful_bookings = bookings.filter(payment_status=True).count()
+
+    context = {
+        'bookings': bookings,
+        'total_revenue': total_revenue,
+        'total_bookings': total_bookings,
+        'successful_bookings': successful_bookings,
+        'archived': archived,
+    }
+    
+    return streaming.render_list(
+        request, 'admin_panel/movies/movie_bookings.html', context, bookings,
+        'admin_panel/movies/movie_booking_row.html', 'admin_panel/movies/movie_booking_row_empty.html',
+    )
+
+
+
+def add_movie(request):
+    if request.method == 'POST':
+        try:
+            title = request.POST.get('title')
+            genre = request.POST.get('genre')
+            language = request.POST.get('language')
+            description = request.POST.get('description')
+            director = request.POST.get('director')
+            cast = request.POST.get('cast')
+            release_date = request.POST.get('date')
+            show_time = request.POST.get('time')
+            location = request.POST.get('location')
+            ticket_price = request.POST.get('ticket_price')
+            available_seats = request.POST.get('available_seats')
+            rating = request.POST.get('rating')
+            popularity = request.POST.get('popularity')
+            image = request.FILES.get('image')
+
+            # 2. Get the duration string (e.g., "02:30:00")
+            duration_str = request.POST.get('duration')
+            
+            # 3. Convert string to a timedelta object
+            duration_val = parse_duration(duration_str) 
+            if duration_val is None:
+                raise ValueError("Invalid duration format. Use HH:MM:SS")
+
+            # Create Movie
+            movie = Movie(
+                title=title,
+                genre=genre,
+                language=language,
+                description=description,
+                director=director,
+                cast=cast,
+                date=release_date,
+                time=show_time,
+                duration=duration_val,  
+                location=location,
+                ticket_price=ticket_price,
+                available_seats=available_seats,
+                rating=rating,
+                popularity=popularity,
+                image=image
+            )
+            movie.save()
+            activity.record(request, 'create', movie, f"Movie '{title}' added")
+
+            messages.success(request, f"Movie '{title}' added successfully!")
+            return redirect('movies')
+
+        except Exception as e:
+            print(f"Error: {e}") 
+            messages.error(request, f"Error adding movie: {e}")
+            return redirect('add_movie')
+
+    return render(request, 'admin_panel/movies/add_movies.html')
+
+
+@login_required
+def book_movie(request):
+    movies = Movie.objects.all().order_by('date', 'time')
+    
+    context = {
+        'movies': movies
+    }
+    return render(request, 'admin_panel/movies/book_movie.html', context)
+
+# 2. The Seat Selection Page (When user clicks 'Book Ticket')
+@login_required
+def book_seat_selection(request, movie_id):
+    movie = get_object_or_404(Movie, id=movie_id)
+    screen = MovieScreen.objects.filter(movie=movie).first()
+
+    if request.method == 'POST' and screen:
+        return _book_held_seats(request, movie, screen)
+    
+    # The layout comes from the cached seat map; the page then polls for deltas
+    seat_map = seatmap.get_map(screen.id) if screen else None
+
+    context = {
+        'movie': movie,
+        'screen': screen,
+        'seat_map': seat_map,
+        # Seats are held under this token as they are clicked; the POST books only those
+        'hold_token': uuid.uuid4().hex,
+        'hold_ttl': holds.ttl,
+    }
+    return render(request, 'admin_panel/movies/booking_seat_layout.html', context)
+
+
+def _book_held_seats(request, movie, screen):
+    """Book the seats the page holds under hold_token, then give the hold back"""
+    token = request.POST.get('hold_token', '')
+    try:
+        seat_ids = sorted({int(value) for value in request.POST.get('selected_seat_ids', '').split(',') if value.strip()})
+    except ValueError:
+        seat_ids = []
+
+    try:
+        if not holds.holds_all(screen.id, seat_ids, token):
+            raise ValueError("Your hold on these seats has expired. Please select them again.")
+        customer = User.objects.filter(pk=request.POST.get('user_id') or None).first()
+        if customer is None:
+            raise ValueError("Please select the customer for this booking.")
+
+        with transaction.atomic():
+            seats = list(TheaterSeat.objects.select_for_update()
+                         .filter(screen=screen, pk__in=seat_ids, status='Available'))
+            if len(seats) != len(seat_ids):
+                raise ValueError("Some of the selected seats were sold in the meantime.")
+            # Priced from the seats, not from the posted total
+            subtotal = sum((seat.price for seat in seats), Decimal('0.00'))
+            booking = TicketBooking.objects.create(
+                user=customer, movie=movie, screen=screen, booked_at=timezone.now(),
+                total_price=subtotal, platform_fee=COUNTER_BOOKING_FEE,
+                # The counter page quotes seats plus the booking fee, with no GST on top
+                gst_rate=Decimal('0.00'), gst_amount=Decimal('0.00'),
+                grand_total=subtotal + COUNTER_BOOKING_FEE, payment_status=True,
+            )
+            for seat in seats:
+                seat.status = 'Booked'
+                # save() so the seat map records each change
+                seat.save(update_fields=['status'])
+    except ValueError as e:
+        holds.release(screen.id, seat_ids, token)
+        messages.error(request, str(e))
+        return redirect('book_seat_selection', movie_id=movie.id)
+
+    holds.release(screen.id, seat_ids, token)
+    activity.record(request, 'create', booking,
+                    f"Movie booking #{booking.id}: {len(seats)} seat(s) for {movie.title}")
+    messages.success(request, f"Booked {len(seats)} seat(s) for {movie.title}.")
+    return redirect('movies_booking_view', booking_id=booking.id)
+
+
+@login_required
+def seat_map(request, screen_id):
+    """Packed seat map for a screen, or just the seats changed since ?since=<version>"""
+    since = request.GET.get('since')
+    # Seats held under the asking page's own ?token= are not reported as held
+    token = request.GET.get('token') or None
+    if since is not None:
+        try:
+            since = int(since)
+        except ValueError:
+            return JsonResponse({'error': 'since must be an integer'}, status=400)
+        version, changes = seatmap.get_changes(screen_id, since)
+        if changes is not None:
+            return JsonResponse({
+                'version': version, 'full': False, 'seats': changes, 'held': _held_seat_ids(screen_id, token),
+            })
+
+    seat_map = seatmap.get_map(screen_id)
+    etag = f'"seatmap-{screen_id}-{seat_map["version"]}"'
+    if request.headers.get('If-None-Match') == etag:
+        return HttpResponseNotModified()
+    response = JsonResponse({
+        'version': seat_map['version'], 'full': True, 'map': seat_map, 'held': _held_seat_ids(screen_id, token),
+    })
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def _held_seat_ids(screen_id, exclude_token=None):
+    seat_ids = [seat[0] for _, seats in seatmap.get_map(screen_id)['rows'] for seat in seats]
+    return sorted(holds.held_seats(screen_id, seat_ids, exclude_token))
+
+
+def _posted_seat_ids(request):
+    return [int(value) for value in request.POST.get('seat_ids', '').split(',') if value.strip()]
+
+
+@login_required
+@require_POST
+def hold_seats(request, screen_id):
+    """Hold all of ?seat_ids for this user, or none of them (409 lists the conflicts)"""
+    try:
+        hold = holds.hold(screen_id, _posted_seat_ids(request), holder=request.user.get_username(),
+                          token=request.POST.get('token') or None)
+    except HoldConflict as e:
+        return JsonResponse({'error': str(e), 'seats': e.seat_ids}, status=409)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    return JsonResponse(hold.as_dict())
+
+
+@login_required
+@require_POST
+def release_seats(request, screen_id):
+    """Give back the seats of a hold (a no-op for seats the token no longer holds)"""
+    try:
+        seat_ids = _posted_seat_ids(request)
+    except ValueError:
+        return JsonResponse({'error': 'seat_ids must be integers'}, status=400)
+    holds.release(screen_id, seat_ids, request.POST.get('token', ''))
+    return JsonResponse({'released': seat_ids})
+
+
+def delete_movie_screen(request, screen_id):
+    # Get the specific screen or show 404 if not found
+    screen = get_object_or_404(MovieScreen, id=screen_id)
+    
+    if request.method == 'POST':
+        screen_name = screen.screen_name
+        screen.delete()
+        activity.record(request, 'delete', screen, f"Screen '{screen_name}' deleted", object_id=screen_id)
+        messages.success(request, f"Screen '{screen_name}' deleted successfully!")
+        return redirect('movie_screen') # Redirect back to the main list
+        
+    # Optional: If someone visits the URL directly without POST
+    return redirect('movie_screen')
+
+def edit_movie_screen(request, screen_id):
+    screen = get_object_or_404(MovieScreen, id=screen_id)
+
+    if request.method == 'POST':
+        try:
+            # Update fields
+            movie_id = request.POST.get('movie')
+            screen.movie = get_object_or_404(Movie, id=movie_id)
+            
+            screen.screen_name = request.POST.get('screen_name')
+            screen.total_rows = int(request.POST.get('total_rows'))
+            screen.seats_per_row = int(request.POST.get('seats_per_row'))
+            
+            # Pricing Update
+            screen.premium_price_multiplier = request.POST.get('premium_price')
+            screen.premium_rows_end = int(request.POST.get('premium_rows_end'))
+            
+            screen.executive_price_multiplier = request.POST.get('executive_price')
+            screen.executive_rows_end = int(request.POST.get('executive_rows_end'))
+            
+            screen.normal_price_multiplier = request.POST.get('normal_price')
+
+            if request.POST.get('preview'):
+                # Dry run: show which rows the new pricing would change, save nothing
+                changes, _ = repricing.reprice([screen], dry_run=True)
+                return render(request, 'admin_panel/movies/edit_movie_screen.html', {
+                    'screen': screen,
+                    'changes': changes,
+                    'preview': True,
+                })
+
+            with transaction.atomic():
+                screen.save()
+                changes, repriced = repricing.reprice([screen])
+            activity.record(request, 'edit', screen, f"Screen '{screen.screen_name}' updated")
+            
+            messages.success(request, f"Screen '{screen.screen_name}' updated successfully!"
+                             + (f" {repriced} seats repriced." if repriced else ""))
+            return redirect('movie_screen')
+            
+        except Exception as e:
+            messages.error(request, f"Error updating screen: {e}")
+
+    # Render the edit form with existing data
+    context = {
+        'screen': screen,
+    }
+    return render(request, 'admin_panel/movies/edit_movie_screen.html', context)
+
+
+def is_admin(user):
+    return user.is_authenticated and user.is_staff
+
+
+@user_passes_test(is_admin)
+def movies_booking_view(request, booking_id):
+    booking, archived = archive.get_booking(TicketBooking, id=booking_id)
+    
+    context = {
+        'booking': booking,
+        'archived': archived,
+    }
+    return render(request, 'admin_panel/movies/movies_booking_view.html', context)
+
+@user_passes_test(is_admin)
+def movies_booking_edit(request, booking_id):
+    booking = get_object_or_404(TicketBooking, id=booking_id)
+    
+    if request.method == 'POST':
+        booking.status = request.POST.get('status')
+        booking.payment_status = request.POST.get('payment_status') == 'on'
+        booking.save()
+        activity.record(request, 'edit', booking, f"Movie booking #{booking.id} updated")
+        
+        messages.success(request, f"Booking #{booking.id} updated successfully.")
+        return redirect('movies_bookings') # Redirect back to the list
+    
+    context = {
+        'booking': booking,
+    }
+    return render(request, 'admin_panel/movies/movies_booking_edit.html', context)
+
+@user_passes_test(is_admin)
+def movies_booking_delete(request, booking_id):
+    booking = get_object_or_404(TicketBooking, id=booking_id)
+    
+    if request.method == 'POST':
+        booking.delete()
+        activity.record(request, 'delete', booking, f"Movie booking #{booking_id} deleted", object_id=booking_id)
+        messages.success(request, f"Booking #{booking_id} has been deleted permanently.")
+        return redirect('movies_bookings') # Redirect back to the list
+    
+    messages.warning(request, "Invalid delete attempt.")
+    return redirect('movies_bookings')
+
+@login_required(login_url='/admin-panel/login/')
+def create_movie(request):
+    """Quick movie creation"""
+    if request.method == 'POST':
+        form = MovieForm(request.POST, request.FILES)
+        if form.is_valid():
+            movie = form.save()
+            activity.record(request, 'create', movie, f"Movie '{movie.title}' created")
+            messages.success(request, 'Movie created successfully!')
+            return redirect('admin_dashboard')
+    else:
+        form = MovieForm()
+    return render(request, 'admin_panel/quick_create.html', {'form': form, 'type': 'Movie'})
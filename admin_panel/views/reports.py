@@ -0,0 +1,57 @@
+from django.shortcuts import render, get_object_or_404, redirect
+from django.contrib.auth.decorators import login_required
+from django.contrib import messages
+from django.http import JsonResponse, HttpResponse
+from django.urls import reverse
+from django.utils.http import urlencode
+from ..models import ReportJob
+from .. import jobs
+from .. import reports
+
+
+# ========= REPORT JOBS =========
+
+@login_required(login_url='/admin-panel/login/')
+def report_request(request, name):
+    """Queue a report (or reuse a fresh run with the same parameters) and go to its job page"""
+    params = request.GET.copy()
+    output_format = params.pop('format', ['html'])[0]
+    try:
+        job = jobs.submit(name, params.dict(), output_format, requested_by=request.user.get_username())
+    except ValueError as e:
+        messages.error(request, str(e))
+        return redirect('admin_dashboard')
+    return redirect('report_job', job_id=job.pk)
+
+
+@login_required(login_url='/admin-panel/login/')
+def report_job(request, job_id):
+    """Job page that polls until the result is ready; ?format=json returns the status only"""
+    job = get_object_or_404(ReportJob, pk=job_id)
+    if request.GET.get('format') == 'json':
+        return JsonResponse({
+            'id': job.pk,
+            'status': job.status,
+            'format': job.output_format,
+            'error': job.error,
+            'result_url': reverse('report_result', args=[job.pk]) if job.status == 'done' else None,
+        })
+
+    report = reports.get_report(job.report)
+    context = {
+        'page_title': report.title,
+        'job': job,
+        'query': urlencode(job.params),
+        'other_formats': [fmt for fmt in reports.FORMATS if fmt != job.output_format],
+    }
+    return render(request, 'admin_panel/reports/job.html', context)
+
+
+@login_required(login_url='/admin-panel/login/')
+def report_result(request, job_id):
+    """The stored result of a finished job, in the format it was rendered in"""
+    job = get_object_or_404(ReportJob, pk=job_id, status='done')
+    response = HttpResponse(job.result, content_type=reports.FORMATS[job.output_format])
+    if job.output_format == 'csv':
+        response['Content-Disposition'] = f'attachment; filename="{job.report}-{job.pk}.csv"'
+    return response
@@ -0,0 +1,136 @@
+from django.shortcuts import render, get_object_or_404, redirect
+from django.contrib.auth.decorators import login_required
+from django.contrib import messages
+from django.db.models import Count, F, Min, Max
+from django.http import Http404
+from django.utils.dateparse import parse_date
+from django.views.decorators.http import require_POST
+from ..models import EventSeries
+from .. import activity
+from .. import series as recurrence
+
+
+# ========= RECURRING SERIES =========
+
+def _rule_from_post(post):
+    """The raw rule if given, else one built from the frequency / weekday / end fields"""
+    if post.get('rule'):
+        return post['rule']
+    parts = [f"FREQ={post.get('freq', 'WEEKLY')}"]
+    if post.get('interval') and post['interval'] != '1':
+        parts.append(f"INTERVAL={post['interval']}")
+    if post.getlist('byday'):
+        parts.append(f"BYDAY={','.join(post.getlist('byday'))}")
+    if post.get('count'):
+        parts.append(f"COUNT={post['count']}")
+    if post.get('until'):
+        parts.append(f"UNTIL={post['until'].replace('-', '')}")
+    return ';'.join(parts)
+
+
+def _from_date(post):
+    """The optional 'from' date; raises ValueError when it is given but is not a date"""
+    if not post.get('from_date'):
+        return None
+    # parse_date raises ValueError for impossible dates and returns None for other text
+    from_date = parse_date(post['from_date'])
+    if from_date is None:
+        raise ValueError(f"Invalid date: {post['from_date']}")
+    return from_date
+
+
+@login_required(login_url='/admin-panel/login/')
+def series_list(request):
+    """Every series with its occurrence count and date span"""
+    all_series = EventSeries.objects.annotate(
+        occurrence_count=Count('occurrences'),
+        first_date=Min('occurrences__date'),
+        last_date=Max('occurrences__date'),
+    )
+    return render(request, 'admin_panel/series/series_list.html', {'all_series': all_series})
+
+
+@login_required(login_url='/admin-panel/login/')
+def create_series(request, kind, pk):
+    """Repeat an existing event, comedy show or movie on the dates of a recurrence rule"""
+    if kind not in recurrence.KINDS:
+        raise Http404("Unknown series kind")
+    model = recurrence.KINDS[kind]
+    source = get_object_or_404(model, pk=pk)
+    rule = ''
+
+    if request.method == 'POST':
+        rule = _rule_from_post(request.POST)
+        try:
+            if request.POST.get('preview'):
+                dates = recurrence.expand(recurrence.parse_rule(rule), source.date)
+                return render(request, 'admin_panel/series/create_series.html', {
+                    'kind': kind, 'source': source, 'rule': rule, 'dates': dates,
+                    'weekdays': recurrence.WEEKDAYS,
+                })
+            new_series = recurrence.create_series(kind, source, rule, created_by=request.user.get_username())
+        except ValueError as e:
+            messages.error(request, f"Invalid rule: {e}")
+        else:
+            count = new_series.occurrences.count()
+            activity.record(request, 'create', new_series,
+                            f"Series '{new_series.title}' created with {count} occurrences")
+            messages.success(request, f"Series '{new_series.title}' created with {count} occurrences.")
+            return redirect('series_detail', pk=new_series.pk)
+
+    context = {
+        'kind': kind,
+        'source': source,
+        'rule': rule,
+        'weekdays': recurrence.WEEKDAYS,
+    }
+    return render(request, 'admin_panel/series/create_series.html', context)
+
+
+@login_required(login_url='/admin-panel/login/')
+def series_detail(request, pk):
+    """Occurrences of a series; POST changes the shared fields on all of them (or from a date on)"""
+    series = get_object_or_404(EventSeries, pk=pk)
+    editable = recurrence.EDITABLE_FIELDS[series.kind]
+
+    if request.method == 'POST':
+        values = {name: request.POST[name] for name in editable if request.POST.get(name, '') != ''}
+        try:
+            from_date = _from_date(request.POST)
+            updated = recurrence.update_series(series, values, from_date)
+        except ValueError as e:
+            messages.error(request, str(e))
+        else:
+            activity.record(request, 'edit', series, f"Series '{series.title}': {updated} occurrences updated")
+            messages.success(request, f"{updated} occurrences updated.")
+            return redirect('series_detail', pk=series.pk)
+
+    model = recurrence.KINDS[series.kind]
+    rows = (recurrence.occurrences(series).order_by('date', 'pk')
+            .values('pk', 'date', 'time', 'location', 'ticket_price', label=F(recurrence.title_field(model))))
+    context = {
+        'series': series,
+        'occurrences': rows,
+        'editable': editable,
+    }
+    return render(request, 'admin_panel/series/series_detail.html', context)
+
+
+@login_required(login_url='/admin-panel/login/')
+@require_POST
+def delete_series(request, pk):
+    series = get_object_or_404(EventSeries, pk=pk)
+    try:
+        from_date = _from_date(request.POST)
+    except ValueError as e:
+        messages.error(request, str(e))
+        return redirect('series_detail', pk=pk)
+    deleted, kept = recurrence.delete_series(series, from_date)
+    activity.record(request, 'delete', series, f"Series '{series.title}': {deleted} occurrences deleted",
+                    object_id=pk)
+    messages.success(request, f"{deleted} occurrences of '{series.title}' deleted.")
+    if kept:
+        messages.warning(request, f"{kept} occurrences have bookings and were kept.")
+    if EventSeries.objects.filter(pk=pk).exists():
+        return redirect('series_detail', pk=pk)
+    return redirect('series_list')
@@ -12,7 +12,9 @@ https://docs.djangoproject.com/en/5.0/ref/settings/
 
 from pathlib import Path
 from decouple import config
-import os,sys
+from django.core.exceptions import ImproperlyConfigured
+import os
+from importlib.util import find_spec
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -50,6 +52,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'admin_panel.querylog.SlowQueryMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -67,6 +70,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'admin_panel.staticfiles.assets',
             ],
         },
     },
@@ -84,8 +88,27 @@ LOGOUT_REDIRECT_URL = '/admin-panel/logout/'
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
 
-import pymysql
-pymysql.install_as_MySQLdb()
+# Fall back to PyMySQL only when mysqlclient is not installed; find_spec does not import either
+if find_spec('MySQLdb') is None:
+    import pymysql
+    pymysql.install_as_MySQLdb()
+
+# Seat holds, seat map versions and facet versions must be seen by every worker,
+# so anything beyond a single development process needs a shared cache
+REDIS_URL = config('REDIS_URL', default='')
+if REDIS_URL:
+    CACHES = {
+        'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': REDIS_URL},
+    }
+elif DEBUG:
+    CACHES = {
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    }
+else:
+    raise ImproperlyConfigured("Set REDIS_URL: seat holds, seat maps and facets need a cache shared by all workers")
+
+# 'cache' shares holds through the default cache; 'local' is for a single development process only
+SEAT_HOLD_BACKEND = 'cache'
 
 DATABASES = {
     'default': {
@@ -98,6 +121,14 @@ DATABASES = {
     }
 }
 
+# The booking tables belong to the public site, whose customers see their history
+# in them: archive_bookings only copies old rows into archive_<table> until the
+# site's owners have agreed to the rows being removed from their tables
+BOOKING_ARCHIVE_DELETE = config('BOOKING_ARCHIVE_DELETE', default=False, cast=bool)
+
+# The booking tables are managed=False; the runner creates them in the test database
+TEST_RUNNER = 'admin_panel.test_runner.UnmanagedTablesRunner'
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -139,6 +170,19 @@ STATICFILES_DIRS=[
     STATIC_DIR
 ]
 
+# collectstatic (or `manage.py build_static`) writes hashed, minified, precompressed files here
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'admin_panel.staticfiles.PrecompressedManifestStorage'},
+}
+
+# False when a proxy serves STATIC_ROOT itself; ignored while DEBUG serves from the app directories
+SERVE_STATIC = True
+# Link the compiled Tailwind build instead of the Play CDN (defaults to not DEBUG)
+# USE_BUILT_CSS = True
+
 
 
 # Default primary key field type
@@ -151,9 +195,6 @@ EVENT_PROJECT_MEDIA = 'D:/gitproject/eventproject/media/'
 MEDIA_URL = '/media/'
 # MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 MEDIA_ROOT = EVENT_PROJECT_MEDIA
-print(f"Admin using Event Project Media: {MEDIA_ROOT}")
-
-sys.path.insert(0, r'D:\gitproject\eventproject') 
 
 # Session
 SESSION_COOKIE_AGE = 3600  
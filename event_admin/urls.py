@@ -17,10 +17,12 @@ Including another URLconf
 
 
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.conf import settings
 from django.conf.urls.static import static
 
+from admin_panel import staticfiles
+
 urlpatterns = [
    path('admin/', admin.site.urls),  # Default Django admin
    path('', include('admin_panel.urls')),
@@ -29,3 +31,6 @@ urlpatterns = [
 if settings.DEBUG:
     urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+elif settings.SERVE_STATIC:
+    # Collected, hashed and precompressed files; turn SERVE_STATIC off when a proxy serves STATIC_ROOT
+    urlpatterns += [re_path(r'^static/(?P<path>.*)$', staticfiles.serve)]
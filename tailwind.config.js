@@ -1,9 +1,15 @@
 /** @type {import('tailwindcss').Config} */
+// Theme shared by the compiled build (tailwind/input.css). Keep it in step with the
+// inline tailwind.config blocks base.html and login.html use when pages run on the Play CDN.
 module.exports = {
   darkMode: "class",
-  content: ["./templates/**/*.html", "./admin_panel/templates/**/*.html"],
+  content: ["./templates/**/*.html", "./admin_panel/templates/**/*.html", "./static/js/**/*.js"],
   theme: {
     extend: {
+      fontFamily: {
+        sans: ["Inter", "sans-serif"],
+        mono: ["JetBrains Mono", "monospace"],
+      },
       colors: {
         primary: {
           50: "#eff6ff",
@@ -12,6 +18,48 @@ module.exports = {
           600: "#2563eb",
           700: "#1d4ed8",
         },
+        brand: {
+          50: "#f0f9ff",
+          500: "#0ea5e9",
+          600: "#0284c7",
+          900: "#0c4a6e",
+        },
+      },
+      animation: {
+        "fade-in": "fadeIn 0.5s ease-out",
+        "slide-in": "slideIn 0.4s cubic-bezier(0.16, 1, 0.3, 1)",
+        blob: "blob 10s infinite",
+        float: "float 6s ease-in-out infinite",
+        "pulse-slow": "pulse 8s cubic-bezier(0.4, 0, 0.6, 1) infinite",
+        "spin-slow": "spin 1.5s linear infinite",
+        "bounce-slow": "bounce 2s infinite",
+        "ping-slow": "ping 2s cubic-bezier(0, 0, 0.2, 1) infinite",
+        wave: "wave 1.5s ease-in-out infinite",
+        "pulse-soft": "pulse 2s cubic-bezier(0.4, 0, 0.6, 1) infinite",
+      },
+      keyframes: {
+        fadeIn: {
+          "0%": { opacity: "0" },
+          "100%": { opacity: "1" },
+        },
+        slideIn: {
+          "0%": { transform: "translateY(10px)", opacity: "0" },
+          "100%": { transform: "translateY(0)", opacity: "1" },
+        },
+        blob: {
+          "0%": { transform: "translate(0px, 0px) scale(1)" },
+          "33%": { transform: "translate(30px, -50px) scale(1.1)" },
+          "66%": { transform: "translate(-20px, 20px) scale(0.9)" },
+          "100%": { transform: "translate(0px, 0px) scale(1)" },
+        },
+        float: {
+          "0%, 100%": { transform: "translateY(0)" },
+          "50%": { transform: "translateY(-10px)" },
+        },
+        wave: {
+          "0%, 60%, 100%": { transform: "translateY(0)" },
+          "30%": { transform: "translateY(-10px)" },
+        },
       },
     },
   },